@@ -5,3 +5,4 @@ from .registry import AgentRegistry, AgentFactory
 from .invoker import CapabilityInvoker
 from .policy_guard import PolicyGuard
 from .observe import ObserveStream
+from .realtime import RealtimeBroadcaster
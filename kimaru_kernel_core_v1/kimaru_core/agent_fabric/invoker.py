@@ -1,10 +1,67 @@
 from __future__ import annotations
+import threading, time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 from kimaru_core.decision_tracker.models import TrackEvent
 from kimaru_core.decision_tracker import event_types as ET
 from kimaru_core.utils.ids import new_id
 
+@dataclass
+class Invocation:
+    ctx: Any
+    agent_desc: Any
+    agent_instance: Any
+    capability: str = "run"
+    inputs: Optional[Dict[str, Any]] = None
+    resources: Optional[List[Dict[str, Any]]] = None
+
+@dataclass
+class InvocationResult:
+    ok: bool
+    output: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+_shared_pool: Optional[ThreadPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+def shared_invoke_pool() -> ThreadPoolExecutor:
+    """Process-wide pool for invoke_many calls that bring no executor (created on first use)."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="kimaru-invoke")
+        return _shared_pool
+
 class CapabilityInvoker:
+    def invoke_many(self, calls: List[Invocation], max_workers: int = 8, executor: Optional[Executor] = None) -> List[InvocationResult]:
+        """Invoke every call with at most `max_workers` in flight; results come back in call order.
+
+        A failing call (policy deny, agent error, ...) is reported in its own result and
+        does not affect the others. Calls run on `executor`, or on shared_invoke_pool();
+        `max_workers` caps this batch's share of it.
+        """
+        if not calls:
+            return []
+        executor = executor or shared_invoke_pool()
+        slots = threading.BoundedSemaphore(max(1, max_workers))
+
+        def one(call: Invocation) -> InvocationResult:
+            try:
+                out = self.invoke(call.ctx, call.agent_desc, call.agent_instance, call.capability, call.inputs or {}, call.resources)
+                return InvocationResult(ok=True, output=out)
+            except Exception as e:
+                return InvocationResult(ok=False, error=str(e), error_type=type(e).__name__)
+            finally:
+                slots.release()
+
+        futures = []
+        for call in calls:
+            slots.acquire()
+            futures.append(executor.submit(one, call))
+        return [f.result() for f in futures]
+
     def invoke(self, ctx, agent_desc, agent_instance, capability: str, inputs: Dict[str, Any], resources: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         # 1) Policy
         ok, reasons = ctx.policy.allow(ctx, agent_desc, capability, resources or [])
@@ -54,6 +111,7 @@ class CapabilityInvoker:
         ))
         ctx.observe.emit("AGENT_START", {"agent_type_id": agent_desc.agent_type_id, "run_id": ctx.run.run_id})
 
+        started = time.perf_counter()
         try:
             out = agent_instance.run(ctx, inputs)
             ctx.tracker.append(TrackEvent(
@@ -70,7 +128,7 @@ class CapabilityInvoker:
                 event_type=ET.AGENT_END,
                 message="agent end",
                 refs={"agent_type_id": agent_desc.agent_type_id, "agent_version": agent_desc.version},
-                metadata={},
+                metadata={"duration_ms": round((time.perf_counter() - started) * 1000.0, 3)},
             ))
             ctx.observe.emit("AGENT_END", {"agent_type_id": agent_desc.agent_type_id, "run_id": ctx.run.run_id})
         except Exception as e:
@@ -89,7 +147,7 @@ class CapabilityInvoker:
                 severity="ERROR",
                 message=str(e),
                 refs={"agent_type_id": agent_desc.agent_type_id, "agent_version": agent_desc.version},
-                metadata={},
+                metadata={"duration_ms": round((time.perf_counter() - started) * 1000.0, 3)},
             ))
             ctx.observe.emit("AGENT_FAIL", {"agent_type_id": agent_desc.agent_type_id, "run_id": ctx.run.run_id, "error": str(e)})
             raise
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import asyncio, json, threading
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+from kimaru_core.utils.time import utc_now_iso
+
+class RealtimeBroadcaster:
+    """Fan-out of ObserveStream events to SSE clients.
+
+    Subscribe it to an ObserveStream (`observe.subscribe(b.publish)`). Events land in a
+    ring buffer with monotonic sequence numbers; publish() may be called from any
+    thread and never blocks on clients. Each client keeps its own cursor, is woken on
+    publish (no polling), and resumes from `Last-Event-ID`. A client that falls more
+    than `capacity` events behind skips ahead to the oldest retained event and gets
+    an `event: gap` frame with the number of events it missed.
+    """
+
+    def __init__(self, capacity: int = 2000, heartbeat_s: float = 15.0, max_batch: int = 256):
+        self.capacity = capacity
+        self.heartbeat_s = heartbeat_s
+        self.max_batch = max_batch
+        self._buf: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=capacity)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._subs: Dict[asyncio.AbstractEventLoop, Set[asyncio.Event]] = {}
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(self, event_type: str, payload: Dict[str, Any]) -> int:
+        item = {"ts": utc_now_iso(), "type": event_type, "payload": payload}
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._buf.append((seq, item))
+            loops = list(self._subs.keys())
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._wake, loop)
+            except RuntimeError:
+                # loop closed without unsubscribing
+                with self._lock:
+                    self._subs.pop(loop, None)
+        return seq
+
+    def _wake(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            events = list(self._subs.get(loop, ()))
+        for ev in events:
+            ev.set()
+
+    def _read(self, cursor: int) -> Tuple[List[Tuple[int, Dict[str, Any]]], int, int]:
+        """Return (items after cursor, number of events missed, new cursor)."""
+        with self._lock:
+            if not self._buf or cursor >= self._seq:
+                return [], 0, cursor
+            first = self._buf[0][0]
+            dropped = 0
+            if cursor < first - 1:
+                dropped = first - 1 - cursor
+                cursor = first - 1
+            start = cursor - first + 1
+            items = list(islice(self._buf, start, start + self.max_batch))
+        return items, dropped, items[-1][0] if items else cursor
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        cursor = 0
+        if last_event_id:
+            try:
+                cursor = int(last_event_id)
+            except ValueError:
+                cursor = 0
+            if cursor > self._seq:
+                cursor = 0  # id from before a restart: replay what we have
+        loop = asyncio.get_running_loop()
+        ev = asyncio.Event()
+        with self._lock:
+            self._subs.setdefault(loop, set()).add(ev)
+        try:
+            while True:
+                # clear before reading so a publish racing with the read still wakes us
+                ev.clear()
+                items, dropped, cursor = self._read(cursor)
+                if dropped:
+                    yield f"event: gap\ndata: {json.dumps({'dropped': dropped})}\n\n"
+                if items:
+                    yield "".join(f"id: {seq}\ndata: {json.dumps(item, ensure_ascii=False, default=str)}\n\n" for seq, item in items)
+                    continue
+                try:
+                    await asyncio.wait_for(ev.wait(), timeout=self.heartbeat_s)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            with self._lock:
+                subs = self._subs.get(loop)
+                if subs is not None:
+                    subs.discard(ev)
+                    if not subs:
+                        self._subs.pop(loop, None)
@@ -1,30 +1,41 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from kimaru_core.agent_fabric.base_agent import BaseAgent
 from kimaru_core.agent_fabric.descriptor import AgentDescriptor
-from kimaru_core.templates.script_dsl.validator import validate_script
-from kimaru_core.templates.script_dsl.executor import exec_script
+from kimaru_core.templates.script_dsl.compiler import CompiledScript, ScriptPlanCache, compile_script, plan_cache_for
+from kimaru_core.runtime.lazy import resolve as lazy_resolve
+from kimaru_core.templates.script_dsl.executor import STEP_HANDLERS, exec_compiled
 from kimaru_core.artifacts.artifact_ref import ArtifactRef
 
 class ScriptedAgent(BaseAgent):
-    def __init__(self, desc: AgentDescriptor, script_ref: ArtifactRef):
+    def __init__(self, desc: AgentDescriptor, script_ref: ArtifactRef, plan_cache: Optional[ScriptPlanCache] = None):
         self._desc = desc
         self._script_ref = script_ref
+        self._plans = plan_cache  # None: the cache of the run's artifact store
 
     def describe(self) -> AgentDescriptor:
         return self._desc
 
+    def _plan(self, ctx) -> CompiledScript:
+        # script artifacts are immutable: read, validate and compile once per (store, ref)
+        plans = self._plans or plan_cache_for(lazy_resolve(ctx.artifacts))
+        key = self._script_ref.key()
+        plan = plans.get(key)
+        if plan is None:
+            env = ctx.artifacts.get(self._script_ref)
+            plan = compile_script(env.payload, STEP_HANDLERS)
+            plans.put(key, plan)
+        return plan
+
     def run(self, ctx, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        env = ctx.artifacts.get(self._script_ref)
-        script = env.payload
-        validate_script(script)
-        return exec_script(ctx, self._desc, script, inputs)
+        return exec_compiled(ctx, self._desc, self._plan(ctx), inputs)
 
 class ScriptedAgentFactory:
-    def __init__(self, desc: AgentDescriptor, script_ref: ArtifactRef):
+    def __init__(self, desc: AgentDescriptor, script_ref: ArtifactRef, plan_cache: Optional[ScriptPlanCache] = None):
         self._desc = desc
         self._script_ref = script_ref
+        self._plans = plan_cache
 
     def create(self, instance_config: dict, ctx) -> BaseAgent:
         # instance_config reserved for future per-instance overrides
-        return ScriptedAgent(self._desc, self._script_ref)
+        return ScriptedAgent(self._desc, self._script_ref, self._plans)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Iterable, Iterator, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from kimaru_core.core_context.core_context import CoreContext
@@ -10,3 +10,13 @@ class BaseAlgorithm(ABC):
     def describe(self): ...
     @abstractmethod
     def run(self, ctx: 'CoreContext', inputs: Dict[str, Any]) -> Dict[str, Any]: ...
+
+class StreamingAlgorithm(BaseAlgorithm):
+    """An algorithm that can also process its input as an iterator of chunks.
+
+    Each input chunk has the shape of `run()` inputs (e.g. {"rows": [...]}) and is
+    merged over `params`; each yielded chunk has the shape of `run()` outputs. Only
+    one chunk needs to be in memory at a time.
+    """
+    @abstractmethod
+    def run_stream(self, ctx: 'CoreContext', chunks: Iterable[Dict[str, Any]], params: Dict[str, Any]) -> Iterator[Dict[str, Any]]: ...
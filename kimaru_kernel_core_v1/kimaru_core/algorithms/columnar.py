@@ -0,0 +1,104 @@
+from __future__ import annotations
+from array import array
+from itertools import compress
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:  # optional: arrays are used natively when numpy is installed
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is not a core dependency
+    np = None
+
+# Input/output representations an algorithm may advertise in cost_profile["representations"].
+ROWS = "rows"
+COLUMNS = "columns"
+
+def accepts(descriptor, representation: str) -> bool:
+    """True if the algorithm takes `representation` natively (no conversion needed)."""
+    profile = descriptor.cost_profile or {}
+    return representation in profile.get("representations", (ROWS,))
+
+def _is_ndarray(col: Any) -> bool:
+    return np is not None and isinstance(col, np.ndarray)
+
+def batch_length(columns: Dict[str, Sequence[Any]], valid: Optional[Sequence[bool]] = None) -> int:
+    lengths = {len(c) for c in columns.values()}
+    if valid is not None:
+        lengths.add(len(valid))
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    return lengths.pop() if lengths else 0
+
+def count_false(mask: Sequence[bool]) -> int:
+    if _is_ndarray(mask):
+        return int(mask.size - np.count_nonzero(mask))
+    return len(mask) - sum(map(bool, mask))
+
+def take(col: Sequence[Any], mask: Sequence[bool]) -> Sequence[Any]:
+    """Keep the cells where mask is true; the column keeps its container type."""
+    if _is_ndarray(col):
+        return col[np.asarray(mask, dtype=bool)]
+    if isinstance(col, array):
+        return array(col.typecode, compress(col, mask))
+    return list(compress(col, mask))
+
+def is_all_null(col: Sequence[Any]) -> bool:
+    if _is_ndarray(col):
+        return col.dtype == object and bool(np.equal(col, None).all())
+    if isinstance(col, array):
+        return len(col) == 0  # typed arrays cannot hold None
+    if isinstance(col, list):
+        return col.count(None) == len(col)
+    return all(v is None for v in col)
+
+def rows_to_columns(rows: Sequence[Optional[Dict[str, Any]]]) -> Tuple[Dict[str, List[Any]], List[bool]]:
+    """list-of-dicts -> (columns, valid). A None row becomes valid=False; missing keys become None."""
+    names = dict.fromkeys(k for r in rows if r is not None for k in r)
+    for r in rows:
+        if r is not None and not isinstance(r, dict):
+            raise TypeError(f"Row is not a mapping: {type(r).__name__}")
+    columns = {k: [None if r is None else r.get(k) for r in rows] for k in names}
+    return columns, [r is not None for r in rows]
+
+def columns_to_rows(columns: Dict[str, Sequence[Any]], valid: Optional[Sequence[bool]] = None,
+                    length: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+    """(columns, valid) -> list-of-dicts. Null cells are omitted from the row dicts.
+
+    `length` is only needed when there are no columns (and no mask) to take it from.
+    """
+    n = batch_length(columns, valid) if columns or valid is not None else (length or 0)
+    names = list(columns)
+    cols = [c.tolist() if _is_ndarray(c) else c for c in columns.values()]
+    rows: List[Optional[Dict[str, Any]]] = (
+        [{k: v for k, v in zip(names, cells) if v is not None} for cells in zip(*cols)] if cols else [{} for _ in range(n)]
+    )
+    if valid is not None:
+        flags = valid.tolist() if _is_ndarray(valid) else valid
+        rows = [r if ok else None for r, ok in zip(rows, flags)]
+    return rows
+
+def adapt_inputs(descriptor, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Inputs in a representation the algorithm accepts, plus the caller's representation if they were converted.
+
+    Inputs the algorithm takes natively are passed through untouched (None).
+    """
+    if "columns" in inputs and not accepts(descriptor, COLUMNS):
+        rest = {k: v for k, v in inputs.items() if k not in ("columns", "valid")}
+        return {**rest, "rows": columns_to_rows(inputs["columns"], inputs.get("valid"))}, COLUMNS
+    if "rows" in inputs and not accepts(descriptor, ROWS) and accepts(descriptor, COLUMNS):
+        columns, valid = rows_to_columns(inputs["rows"])
+        rest = {k: v for k, v in inputs.items() if k != "rows"}
+        return {**rest, "columns": columns, "valid": valid}, ROWS
+    return inputs, None
+
+def restore_outputs(outputs: Dict[str, Any], representation: Optional[str]) -> Dict[str, Any]:
+    """Outputs of a run whose inputs adapt_inputs() converted, back in the caller's `representation`."""
+    if not isinstance(outputs, dict):
+        return outputs
+    if representation == COLUMNS and "rows" in outputs and "columns" not in outputs:
+        columns, valid = rows_to_columns(outputs["rows"])
+        rest = {k: v for k, v in outputs.items() if k != "rows"}
+        return {**rest, "columns": columns, **({} if all(valid) else {"valid": valid})}
+    if representation == ROWS and "columns" in outputs and "rows" not in outputs:
+        rest = {k: v for k, v in outputs.items() if k not in ("columns", "valid")}
+        return {**rest, "rows": columns_to_rows(outputs["columns"], outputs.get("valid"))}
+    return outputs
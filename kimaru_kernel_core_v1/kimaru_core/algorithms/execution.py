@@ -0,0 +1,166 @@
+from __future__ import annotations
+import multiprocessing, pickle, threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+from kimaru_core.algorithms.base import BaseAlgorithm
+from kimaru_core.algorithms import columnar as C
+
+# Handles passed through the pool's pipe: ("obj", value) for payloads small enough to run inline,
+# ("pickle", data, [buffer, ...]) for payloads sent through the pipe, or ("shm", block_name, data,
+# [buffer_len, ...]) when the out-of-band buffers sit in a shared memory block.
+Handle = Tuple[Any, ...]
+
+def _pack(obj: Any, min_shm_bytes: int) -> Tuple[Handle, Optional[shared_memory.SharedMemory]]:
+    # protocol 5 hands buffer-protocol data (numpy arrays, PickleBuffer) to buffer_callback instead of
+    # copying it into the pickle. Only those buffers benefit from shared memory: the reader maps them
+    # without another copy. Plain Python objects (e.g. lists of dicts) are all in `data` and must be
+    # unpickled either way, so they go through the pipe.
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+    out_of_band = sum(r.nbytes for r in raws)
+    if len(data) + out_of_band < min_shm_bytes:
+        return ("obj", obj), None
+    if out_of_band < min_shm_bytes:
+        return ("pickle", data, [bytes(r) for r in raws]), None
+    shm = shared_memory.SharedMemory(create=True, size=out_of_band)
+    off = 0
+    for r in raws:
+        shm.buf[off:off + r.nbytes] = r
+        off += r.nbytes
+    return ("shm", shm.name, data, [r.nbytes for r in raws]), shm
+
+def _unpack(handle: Handle, copy: bool) -> Tuple[Any, Optional[shared_memory.SharedMemory]]:
+    if handle[0] == "obj":
+        return handle[1], None
+    if handle[0] == "pickle":
+        return pickle.loads(handle[1], buffers=handle[2]), None
+    _, name, data, sizes = handle
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf
+    bufs = []
+    off = 0
+    for n in sizes:
+        bufs.append(bytes(view[off:off + n]) if copy else view[off:off + n])
+        off += n
+    obj = pickle.loads(data, buffers=bufs)
+    del bufs, view
+    return obj, shm
+
+def _close(shm: Optional[shared_memory.SharedMemory]) -> None:
+    if shm is None:
+        return
+    try:
+        shm.close()
+    except BufferError:
+        pass  # a result still references the mapping; it is released with the object
+
+def _run_in_worker(alg: BaseAlgorithm, handle: Handle, min_shm_bytes: int) -> Handle:
+    # algorithms run out of process have no CoreContext (stores/tracker stay in the parent)
+    inputs, in_shm = _unpack(handle, copy=False)
+    try:
+        result = alg.run(None, inputs)
+        out, out_shm = _pack(result, min_shm_bytes)
+        del result, inputs
+        _close(out_shm)  # the parent attaches, copies and unlinks
+        return out
+    finally:
+        _close(in_shm)
+
+class AlgorithmExecutor:
+    """Runs algorithms inline in the calling thread.
+
+    `rows`/`columns` inputs reach the algorithm unconverted when its
+    cost_profile["representations"] accepts them; otherwise they are converted
+    on the way in and the outputs converted back to the caller's representation.
+    """
+    name = "inline"
+
+    def execute(self, ctx, alg: BaseAlgorithm, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        inputs, converted = C.adapt_inputs(alg.describe(), inputs)
+        return C.restore_outputs(alg.run(ctx, inputs), converted)
+
+    def shutdown(self, wait: bool = True) -> None:
+        return None
+
+class ProcessPoolAlgorithmExecutor(AlgorithmExecutor):
+    """Runs CPU-bound algorithms in a managed process pool, off the GIL.
+
+    Only algorithms whose cost_profile sets `"cpu_bound": true` leave the process;
+    they are called with ctx=None and must be picklable; payloads under `min_shm_bytes`
+    run inline. Out-of-band pickle buffers (numpy arrays, PickleBuffer) totalling at
+    least `min_shm_bytes` travel through shared memory, which the worker reads in place
+    (results are copied out once); everything else is pickled through the pool's pipe.
+    `cost_profile["max_concurrency"]` caps concurrent runs of one algorithm version
+    (inline or pooled); callers beyond the cap wait.
+    """
+    name = "process_pool"
+
+    def __init__(self, max_workers: Optional[int] = None, min_shm_bytes: int = 256 * 1024, mp_context: str = "spawn"):
+        self.max_workers = max_workers
+        self.min_shm_bytes = min_shm_bytes
+        self.mp_context = mp_context
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._limits: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.mp_context))
+            return self._pool
+
+    def _limit(self, key: Tuple[str, str], n: Optional[int]) -> Optional[threading.BoundedSemaphore]:
+        if not n:
+            return None
+        with self._lock:
+            sem = self._limits.get(key)
+            if sem is None:
+                sem = self._limits[key] = threading.BoundedSemaphore(int(n))
+            return sem
+
+    def execute(self, ctx, alg: BaseAlgorithm, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        desc = alg.describe()
+        profile = desc.cost_profile or {}
+        inputs, converted = C.adapt_inputs(desc, inputs)
+        sem = self._limit((desc.algorithm_id, desc.version), profile.get("max_concurrency"))
+        if sem is not None:
+            sem.acquire()
+        try:
+            if not profile.get("cpu_bound"):
+                return C.restore_outputs(alg.run(ctx, inputs), converted)
+            return C.restore_outputs(self._run_pooled(ctx, alg, desc.algorithm_id, inputs), converted)
+        finally:
+            if sem is not None:
+                sem.release()
+
+    def _run_pooled(self, ctx, alg: BaseAlgorithm, alg_id: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        handle, in_shm = _pack(inputs, self.min_shm_bytes)
+        if handle[0] == "obj":
+            return alg.run(ctx, inputs)  # too small to be worth a process hop
+        try:
+            pool = self._get_pool()
+            try:
+                out = pool.submit(_run_in_worker, alg, handle, self.min_shm_bytes).result()
+            except BrokenProcessPool as e:
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None  # recreate on next use
+                raise RuntimeError(f"Algorithm worker process died: {alg_id}") from e
+            result, out_shm = _unpack(out, copy=True)
+            if out_shm is not None:
+                _close(out_shm)
+                out_shm.unlink()
+            return result
+        finally:
+            if in_shm is not None:
+                _close(in_shm)
+                in_shm.unlink()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -1,19 +1,53 @@
 from __future__ import annotations
-from typing import Dict, Any, List
-from kimaru_core.algorithms.base import BaseAlgorithm
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from kimaru_core.algorithms.base import StreamingAlgorithm
 from kimaru_core.algorithms.descriptor import AlgorithmDescriptor
+from kimaru_core.algorithms import columnar as C
+
+class BasicCleaner(StreamingAlgorithm):
+    """Drops null rows and null fields.
+
+    Row input (`rows`: list of dicts) keeps the original per-row contract. Columnar
+    input (`columns`: name -> list/array.array/numpy array, optional `valid` row
+    mask) is cleaned with whole-column masks: null rows are filtered out of every
+    column at once and columns that are entirely null are pruned. `output` selects
+    the result representation ("rows" or "columns"); it defaults to the input's.
+    Chunks are independent, so run_stream() simply cleans one chunk at a time.
+    """
 
-class BasicCleaner(BaseAlgorithm):
     def describe(self):
         return AlgorithmDescriptor(
             algorithm_id="generic.data_cleaning.basic",
             version="1.0.0",
-            inputs_schema={"type":"object","properties":{"rows":{"type":"array"}},"required":["rows"]},
-            outputs_schema={"type":"object","properties":{"rows":{"type":"array"},"stats":{"type":"object"}},"required":["rows","stats"]},
+            inputs_schema={"type":"object","properties":{"rows":{"type":"array"},"columns":{"type":"object"},"valid":{"type":"array"},
+                                                         "output":{"enum":[C.ROWS, C.COLUMNS]}}},
+            outputs_schema={"type":"object","properties":{"rows":{"type":"array"},"columns":{"type":"object"},"stats":{"type":"object"}},"required":["stats"]},
+            cost_profile={"representations": [C.ROWS, C.COLUMNS], "preferred_representation": C.COLUMNS, "streaming": True,
+                          "cpu_bound": True},
         )
 
     def run(self, ctx, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        rows = inputs.get("rows", [])
+        columnar_in = "columns" in inputs
+        output = inputs.get("output", C.COLUMNS if columnar_in else C.ROWS)
+        if output not in (C.ROWS, C.COLUMNS):
+            raise ValueError(f"Unsupported output representation: {output}")
+        if columnar_in:
+            columns, valid = inputs["columns"], inputs.get("valid")
+        elif output == C.ROWS:
+            return self._clean_rows(inputs.get("rows", []))
+        else:
+            columns, valid = C.rows_to_columns(inputs.get("rows", []))
+        cleaned, dropped, kept = self._clean_columns(columns, valid)
+        stats = {"dropped": dropped, "kept": kept}
+        if output == C.ROWS:
+            return {"rows": C.columns_to_rows(cleaned, length=kept), "stats": stats}
+        return {"columns": cleaned, "stats": stats}
+
+    def run_stream(self, ctx, chunks: Iterable[Dict[str, Any]], params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        for chunk in chunks:
+            yield self.run(ctx, {**params, **chunk})
+
+    def _clean_rows(self, rows: List[Any]) -> Dict[str, Any]:
         cleaned = []
         dropped = 0
         for r in rows:
@@ -25,3 +59,11 @@ class BasicCleaner(BaseAlgorithm):
             else:
                 cleaned.append(r)
         return {"rows": cleaned, "stats": {"dropped": dropped, "kept": len(cleaned)}}
+
+    def _clean_columns(self, columns: Dict[str, Sequence[Any]], valid: Optional[Sequence[bool]]) -> Tuple[Dict[str, Sequence[Any]], int, int]:
+        n = C.batch_length(columns, valid)
+        dropped = C.count_false(valid) if valid is not None else 0
+        if dropped:
+            columns = {k: C.take(col, valid) for k, col in columns.items()}
+        # a column that is null in every kept row would be absent from every cleaned row
+        return {k: col for k, col in columns.items() if not C.is_all_null(col)}, dropped, n - dropped
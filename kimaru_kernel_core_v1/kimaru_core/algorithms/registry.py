@@ -7,6 +7,8 @@ class AlgorithmRegistry:
     def __init__(self):
         self._items: Dict[Tuple[str,str], BaseAlgorithm] = {}
         self._desc: Dict[Tuple[str,str], AlgorithmDescriptor] = {}
+        # bumped on every registration so cached resolutions (compiled scripts) can detect changes
+        self.generation = 0
 
     def register(self, alg: BaseAlgorithm):
         desc: AlgorithmDescriptor = alg.describe()
@@ -15,6 +17,7 @@ class AlgorithmRegistry:
             raise ValueError(f"Algorithm already registered: {key}")
         self._items[key] = alg
         self._desc[key] = desc
+        self.generation += 1
 
     def resolve(self, algorithm_id: str, version: Optional[str] = None) -> BaseAlgorithm:
         if version:
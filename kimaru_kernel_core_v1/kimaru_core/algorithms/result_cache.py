@@ -0,0 +1,126 @@
+from __future__ import annotations
+import copy, json, threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_models import ArtifactHeader, ArtifactEnvelope, IntegrityRecord, ProducerRef
+from kimaru_core.artifacts.artifact_store import ArtifactStore
+from kimaru_core.artifacts.integrity import compute_envelope_checksum
+from kimaru_core.utils.hashing import canonical_json_dumps, sha256_bytes
+
+def result_cache_key(algorithm_id: str, version: str, inputs: Dict[str, Any]) -> Optional[str]:
+    """(algorithm_id, version, sha256 of canonical JSON inputs), or None if inputs are not JSON."""
+    try:
+        digest = sha256_bytes(canonical_json_dumps(inputs).encode("utf-8"))
+    except (TypeError, ValueError):
+        return None  # e.g. numpy/array columns: not memoizable
+    return f"{algorithm_id}@{version}:{digest}"
+
+class AlgorithmResultCache:
+    """Memoized results of deterministic algorithms. Hits return a fresh copy with the stored
+    result's key order (results are kept as plain, not canonical, JSON)."""
+    name = "none"
+
+    def get(self, ctx, key: str) -> Optional[Dict[str, Any]]: ...
+    def put(self, ctx, key: str, result: Dict[str, Any]) -> None: ...
+
+class InMemoryResultCache(AlgorithmResultCache):
+    """Byte-bounded LRU of result JSON (decoded per hit, so callers may mutate results)."""
+    name = "memory"
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ctx, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            raw = self._items.get(key)
+            if raw is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+        return json.loads(raw)
+
+    def put(self, ctx, key: str, result: Dict[str, Any]) -> None:
+        try:
+            raw = json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        if len(raw) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = raw
+            self._bytes += len(raw)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+class ArtifactResultCache(AlgorithmResultCache):
+    """Results persisted as immutable `algorithm_result` artifacts; survives restarts and is shared
+    by every process using the same ArtifactStore."""
+    name = "artifacts"
+    KIND = "algorithm_result"
+
+    def __init__(self, store: ArtifactStore):
+        self.store = store
+
+    def _ref(self, key: str) -> ArtifactRef:
+        return ArtifactRef(kind=self.KIND, artifact_id=sha256_bytes(key.encode("utf-8")))
+
+    def get(self, ctx, key: str) -> Optional[Dict[str, Any]]:
+        ref = self._ref(key)
+        if not self.store.exists(ref):
+            return None
+        payload = self.store.get(ref).payload
+        if payload.get("key") != key:
+            return None
+        if "result_json" in payload:
+            # stores write payloads as canonical (key-sorted) JSON; the string keeps the original order
+            return json.loads(payload["result_json"])
+        # the store may hand out a shared cached envelope; never let the caller mutate it
+        return copy.deepcopy(payload["result"])
+
+    def put(self, ctx, key: str, result: Dict[str, Any]) -> None:
+        ref = self._ref(key)
+        if self.store.exists(ref):
+            return
+        algorithm, _, digest = key.partition(":")
+        try:
+            result_json = json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return  # result is not JSON
+        payload = {"key": key, "algorithm": algorithm, "inputs_sha256": digest, "result_json": result_json}
+        header = ArtifactHeader(
+            tenant_id=ctx.tenant.tenant_id,
+            decision_context_id=ctx.decision_context.decision_context_id,
+            session_id=ctx.session.session_id,
+            epoch_id=ctx.epoch.epoch_id,
+            run_id=ctx.run.run_id,
+            zone_id=ctx.run.zone_id,
+            producer=ProducerRef(name=algorithm.rpartition("@")[0], version=algorithm.rpartition("@")[2]),
+        )
+        try:
+            checksum = compute_envelope_checksum(header.model_dump(), payload)
+            self.store.put(ref, ArtifactEnvelope(header=header, payload=payload, integrity=IntegrityRecord(checksum=checksum)))
+        except ValueError:
+            return  # another run stored the same result first
+
+def create_result_cache(kind: str, artifacts: Optional[ArtifactStore] = None, max_bytes: int = 64 * 1024 * 1024) -> Optional[AlgorithmResultCache]:
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return InMemoryResultCache(max_bytes=max_bytes)
+    if kind == "artifacts":
+        if artifacts is None:
+            raise ValueError("artifacts result cache needs an ArtifactStore")
+        return ArtifactResultCache(artifacts)
+    raise ValueError(f"Unknown algorithm result cache: {kind}")
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+class ChunkStream:
+    """One-shot iterator over result chunks that keeps a running summary.
+
+    `summary` is {"chunks": n, "stats": {...}} where numeric stats are summed across
+    chunks; it is final once the stream has been consumed.
+    """
+
+    def __init__(self, chunks: Iterable[Dict[str, Any]]):
+        self._chunks = chunks
+        self._consumed = False
+        self.summary: Dict[str, Any] = {"chunks": 0, "stats": {}}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._consumed:
+            raise RuntimeError("ChunkStream can only be consumed once")
+        self._consumed = True
+        for chunk in self._chunks:
+            self.summary["chunks"] += 1
+            merge_stats(self.summary["stats"], chunk.get("stats"))
+            yield chunk
+
+    @property
+    def consumed(self) -> bool:
+        return self._consumed
+
+def merge_stats(total: Dict[str, Any], stats: Optional[Dict[str, Any]]) -> None:
+    for k, v in (stats or {}).items():
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            total[k] = total.get(k, 0) + v
+        else:
+            total[k] = v
+
+def as_input_chunks(source: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """Normalise a chunk source: bare lists become {"rows": [...]}, result chunks lose their stats."""
+    for chunk in source:
+        if isinstance(chunk, list):
+            yield {"rows": chunk}
+        elif isinstance(chunk, dict):
+            yield {k: v for k, v in chunk.items() if k != "stats"}
+        else:
+            raise TypeError(f"Chunk is not a list or mapping: {type(chunk).__name__}")
+
+def iter_row_chunks(rows: Iterable[Any], chunk_rows: int = 10000) -> Iterator[Dict[str, Any]]:
+    """Group any (possibly unbounded) row iterator into {"rows": [...]} chunks."""
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    buf: List[Any] = []
+    for r in rows:
+        buf.append(r)
+        if len(buf) >= chunk_rows:
+            yield {"rows": buf}
+            buf = []
+    if buf:
+        yield {"rows": buf}
+
+def iter_jsonl_chunks(path: str, chunk_rows: int = 10000) -> Iterator[Dict[str, Any]]:
+    """Read a JSON-lines file lazily; blank lines are skipped and `null` lines are null rows."""
+    def rows() -> Iterator[Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    return iter_row_chunks(rows(), chunk_rows)
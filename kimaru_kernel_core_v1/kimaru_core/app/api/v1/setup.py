@@ -3,7 +3,7 @@
 from fastapi import APIRouter, HTTPException
 
 from kimaru_core.app.schema.setup import SetupReq, SetupResp
-from kimaru_core.app.services.setup_service import setup_session
+from kimaru_core.app.services.setup_service import setup_session, session_lease, release_session
 
 router = APIRouter(prefix="/api/v1/setup", tags=["setup"])
 
@@ -27,6 +27,8 @@ def setup(req: SetupReq):
             state={
                 "zones": list(state.get("zones", {}).keys()),
                 "has_run_coordinator": state.get("run_coordinator") is not None,
+                "boot": state["boot_report"].as_dict(),
+                "runtime_reused": session_lease(session_id).reused,
             }
         )
     except FileNotFoundError as e:
@@ -37,3 +39,12 @@ def setup(req: SetupReq):
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Setup failed: {str(e)}")
+
+
+@router.delete("/{session_id}")
+def teardown(session_id: str):
+    try:
+        release_session(session_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    return {"session_id": session_id, "released": True}
@@ -1,43 +1,79 @@
 from __future__ import annotations
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Optional, List
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from kimaru_core.utils.ids import new_id
 from kimaru_core.utils.time import utc_now_iso
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager
 
 from kimaru_core.identity.models import TenantRef, DecisionContextRef, ActorRef, TraceContext, SessionContext, EpochContext, RunContext, NodeRef, FederationContext
 from kimaru_core.core_context import CoreContext
-from kimaru_core.artifacts.artifact_store import FileSystemArtifactStore
+from kimaru_core.artifacts.artifact_store import create_artifact_store
+from kimaru_core.artifacts.caching_store import CachingArtifactStore
 from kimaru_core.artifacts.active_pointer_store import SQLiteActivePointerStore
-from kimaru_core.decision_tracker import SQLiteDecisionTracker
+from kimaru_core.artifacts.pointer_cache import CachingActivePointerStore
+from kimaru_core.artifacts.delta.delta_log import SQLiteDeltaLogStore
+from kimaru_core.decision_tracker import SQLiteDecisionTracker, WriteBehindDecisionTracker, PartitionedDecisionTracker, EventQuery
 from kimaru_core.agent_fabric import AgentRegistry, PolicyGuard, ObserveStream
-from kimaru_core.agent_fabric.invoker import CapabilityInvoker
+from kimaru_core.agent_fabric.realtime import RealtimeBroadcaster
+from kimaru_core.agent_fabric.invoker import CapabilityInvoker, Invocation
 from kimaru_core.governance import GovernanceGateway
 from kimaru_core.memory import SQLiteAgentMemory
 from kimaru_core.algorithms import AlgorithmRegistry
 from kimaru_core.algorithms.generic.data_cleaning import BasicCleaner
+from kimaru_core.algorithms.execution import ProcessPoolAlgorithmExecutor
+from kimaru_core.algorithms.result_cache import create_result_cache
 from kimaru_core.orchestration import SQLiteLivingStore
 from kimaru_core.templates import TemplateService
 from kimaru_core.artifacts.artifact_ref import ArtifactRef
 from kimaru_core.agent_fabric.descriptor import AgentDescriptor
 from kimaru_core.agent_fabric.security_flag import SecurityFlag
 from kimaru_core.agent_fabric.scripted_agent import ScriptedAgentFactory
+from kimaru_core.runtime.async_stores import StoreExecutor, ExecutorLivingStore, ExecutorDecisionTracker, ExecutorArtifactStore, ExecutorActivePointerStore
 
 BASE_DIR = Path(os.getenv("KIMARU_VAR_DIR", Path.cwd() / "var"))
 ART_DIR = BASE_DIR / "artifacts"
+ARTIFACT_BACKEND = os.getenv("KIMARU_ARTIFACT_BACKEND", "filesystem")
+ARTIFACT_CACHE_BYTES = int(os.getenv("KIMARU_ARTIFACT_CACHE_BYTES", str(64 * 1024 * 1024)))
+TRACKER_MODE = os.getenv("KIMARU_TRACKER_MODE", "sync")
+# materialized event aggregates cost a few upserts per append transaction; "0" turns them off
+TRACKER_AGGREGATES = os.getenv("KIMARU_TRACKER_AGGREGATES", "1") != "0"
 DB_DIR = BASE_DIR / "db"
 DB_DIR.mkdir(parents=True, exist_ok=True)
 ART_DIR.mkdir(parents=True, exist_ok=True)
 
-artifact_store = FileSystemArtifactStore(str(ART_DIR))
-pointer_store = SQLiteActivePointerStore(str(DB_DIR / "pointers.sqlite"))
-tracker = SQLiteDecisionTracker(str(DB_DIR / "tracker.sqlite"))
-memory = SQLiteAgentMemory(str(DB_DIR / "memory.sqlite"))
-living = SQLiteLivingStore(str(DB_DIR / "living.sqlite"))
+connections = SQLiteConnectionManager()
+artifact_store = create_artifact_store(str(ART_DIR), ARTIFACT_BACKEND, connections)
+if ARTIFACT_CACHE_BYTES > 0:
+    artifact_store = CachingArtifactStore(artifact_store, max_bytes=ARTIFACT_CACHE_BYTES)
+pointer_store = CachingActivePointerStore(SQLiteActivePointerStore(str(DB_DIR / "pointers.sqlite"), connections))
+# "day" / "hour" partitions events into time-bucketed segments archived to gzip once sealed
+TRACKER_PARTITION = os.getenv("KIMARU_TRACKER_PARTITION", "none")
+if TRACKER_PARTITION != "none":
+    retention = os.getenv("KIMARU_TRACKER_RETENTION_DAYS")
+    tracker = PartitionedDecisionTracker(str(DB_DIR / "tracker"), bucket=TRACKER_PARTITION,
+                                         retention_days=int(retention) if retention else None,
+                                         aggregates=TRACKER_AGGREGATES)
+    if (DB_DIR / "tracker.sqlite").exists():
+        # history written before partitioning becomes the oldest archived segment
+        tracker.import_legacy(str(DB_DIR / "tracker.sqlite"))
+else:
+    tracker = SQLiteDecisionTracker(str(DB_DIR / "tracker.sqlite"), connections, aggregates=TRACKER_AGGREGATES)
+if TRACKER_MODE == "write_behind":
+    tracker = WriteBehindDecisionTracker(tracker,
+                                         batch_size=int(os.getenv("KIMARU_TRACKER_BATCH_SIZE", "256")),
+                                         max_latency_ms=int(os.getenv("KIMARU_TRACKER_MAX_LATENCY_MS", "50")))
+# expired agent-memory keys are swept in bounded batches on this interval (0 disables the sweeper)
+memory = SQLiteAgentMemory(str(DB_DIR / "memory.sqlite"), connections,
+                           sweep_interval_s=float(os.getenv("KIMARU_MEMORY_SWEEP_INTERVAL_S", "60")))
+living = SQLiteLivingStore(str(DB_DIR / "living.sqlite"), connections)
+deltas = SQLiteDeltaLogStore(str(DB_DIR / "deltas.sqlite"), artifact_store, connections,
+                             compact_every=int(os.getenv("KIMARU_DELTA_COMPACT_EVERY", "32")))
 
 agents = AgentRegistry()
 algorithms = AlgorithmRegistry()
@@ -49,14 +85,30 @@ observe = ObserveStream()
 invoker = CapabilityInvoker()
 templates = TemplateService(artifact_store, pointer_store, tracker)
 
-# Simple in-memory realtime buffer for SSE
-_realtime: List[dict] = []
-def _obs(event_type: str, payload: dict):
-    payload = {"ts": utc_now_iso(), "type": event_type, "payload": payload}
-    _realtime.append(payload)
-    del _realtime[:-2000]  # keep last N
-
-observe.subscribe(_obs)
+# Async views for the request handlers: blocking store I/O runs on a dedicated pool,
+# agent runs on another, so neither starves the server's request threadpool.
+io_executor = StoreExecutor(max_workers=int(os.getenv("KIMARU_IO_WORKERS", "32")), thread_name_prefix="kimaru-io")
+run_executor = StoreExecutor(max_workers=int(os.getenv("KIMARU_RUN_WORKERS", "16")), thread_name_prefix="kimaru-run")
+# Independent KimaruScript steps of one run execute concurrently here (0 = sequential)
+STEP_WORKERS = int(os.getenv("KIMARU_STEP_WORKERS", "8"))
+step_executor = ThreadPoolExecutor(max_workers=STEP_WORKERS, thread_name_prefix="kimaru-step") if STEP_WORKERS > 0 else None
+# cpu_bound algorithms run in a process pool so they do not hold the GIL (0 = inline)
+ALGORITHM_WORKERS = int(os.getenv("KIMARU_ALGORITHM_WORKERS", "0"))
+algorithm_executor = ProcessPoolAlgorithmExecutor(max_workers=ALGORITHM_WORKERS) if ALGORITHM_WORKERS > 0 else None
+# memoized results of deterministic algorithms that opt in: "none" | "memory" | "artifacts"
+algorithm_cache = create_result_cache(os.getenv("KIMARU_ALGORITHM_CACHE", "none"), artifact_store,
+                                      int(os.getenv("KIMARU_ALGORITHM_CACHE_BYTES", str(64 * 1024 * 1024))))
+# Batch runs fan out here; each request is further capped by its own max_parallel
+batch_pool = ThreadPoolExecutor(max_workers=int(os.getenv("KIMARU_BATCH_WORKERS", "16")), thread_name_prefix="kimaru-batch")
+MAX_BATCH_ITEMS = 1000
+a_living = ExecutorLivingStore(living, io_executor)
+a_tracker = ExecutorDecisionTracker(tracker, io_executor)
+a_artifacts = ExecutorArtifactStore(artifact_store, io_executor)
+a_pointers = ExecutorActivePointerStore(pointer_store, io_executor)
+
+# In-memory ring buffer + fan-out for SSE (keeps the last N events for Last-Event-ID resume)
+realtime_broadcaster = RealtimeBroadcaster(capacity=2000)
+observe.subscribe(realtime_broadcaster.publish)
 
 app = FastAPI(title="Kimaru Kernel Common Core Demo", version="0.1.0")
 
@@ -90,6 +142,10 @@ def make_ctx(session: SessionContext, epoch: EpochContext, run: RunContext, acto
         governance=governance,
         observe=observe,
         memory=memory,
+        step_executor=step_executor,
+        algorithm_executor=algorithm_executor,
+        algorithm_cache=algorithm_cache,
+        deltas=deltas,
         allow_external=False,
         debug=True,
     )
@@ -98,36 +154,36 @@ class CreateSessionReq(BaseModel):
     mode: str = "live"
 
 @app.post("/api/sessions")
-def create_session(req: CreateSessionReq):
+async def create_session(req: CreateSessionReq):
     sid = new_id("sess")
     session = SessionContext(session_id=sid, tenant_id=DEFAULT_TENANT.tenant_id, decision_context_id=DEFAULT_DCTX.decision_context_id, mode=req.mode)
-    living.create_session(session)
+    await a_living.create_session(session)
     return session.model_dump()
 
 @app.get("/api/sessions")
-def list_sessions(limit: int = 50):
-    items = living.list_sessions(DEFAULT_TENANT.tenant_id, DEFAULT_DCTX.decision_context_id, limit=limit)
+async def list_sessions(limit: int = 50):
+    items = await a_living.list_sessions(DEFAULT_TENANT.tenant_id, DEFAULT_DCTX.decision_context_id, limit=limit)
     return [s.model_dump() for s in items]
 
 class CreateEpochReq(BaseModel):
     trigger: Dict[str, str] = {}
 
 @app.post("/api/sessions/{session_id}/epochs")
-def create_epoch(session_id: str, req: CreateEpochReq):
-    session = living.get_session(session_id)
-    epochs = living.list_epochs(session_id)
+async def create_epoch(session_id: str, req: CreateEpochReq):
+    session = await a_living.get_session(session_id)
+    epochs = await a_living.list_epochs(session_id)
     seq = (epochs[-1].sequence_no + 1) if epochs else 1
     epoch = EpochContext(epoch_id=new_id("epoch"), session_id=session_id, sequence_no=seq, trigger=req.trigger)
-    living.create_epoch(epoch)
+    await a_living.create_epoch(epoch)
     return epoch.model_dump()
 
 @app.get("/api/sessions/{session_id}/epochs")
-def list_epochs(session_id: str):
-    return [e.model_dump() for e in living.list_epochs(session_id)]
+async def list_epochs(session_id: str):
+    return [e.model_dump() for e in await a_living.list_epochs(session_id)]
 
 @app.get("/api/sessions/{session_id}/runs")
-def list_runs(session_id: str, limit: int = 100):
-    return [r.model_dump() for r in living.list_runs(session_id, limit=limit)]
+async def list_runs(session_id: str, limit: int = 100):
+    return [r.model_dump() for r in await a_living.list_runs(session_id, limit=limit)]
 
 class PutScriptReq(BaseModel):
     script: Dict[str, Any]
@@ -178,58 +234,140 @@ class RunAgentReq(BaseModel):
     actor_id: str = "operator"
 
 @app.post("/api/agents/run")
-def run_agent(req: RunAgentReq):
-    session = living.get_session(req.session_id)
-    epochs = {e.epoch_id: e for e in living.list_epochs(req.session_id)}
-    if req.epoch_id not in epochs:
+async def run_agent(req: RunAgentReq):
+    session = await a_living.get_session(req.session_id)
+    try:
+        epoch = await a_living.get_epoch(req.session_id, req.epoch_id)
+    except KeyError:
         raise HTTPException(404, "epoch not found")
-    epoch = epochs[req.epoch_id]
     run = RunContext(run_id=new_id("run"), session_id=session.session_id, epoch_id=epoch.epoch_id, zone_id="core", trace_id=new_id("trace"))
-    living.create_run(run)
+    await a_living.create_run(run)
     actor = ActorRef(actor_type="human", actor_id=req.actor_id, display_name=req.actor_id)
     ctx = make_ctx(session, epoch, run, actor)
 
     desc, factory = agents.resolve(req.agent_type_id)
     agent = factory.create({}, ctx)
-    out = invoker.invoke(ctx, desc, agent, "run", req.inputs)
+    # agent code is synchronous (algorithms, store writes, audit); run it off the event loop
+    out = await run_executor.run(invoker.invoke, ctx, desc, agent, "run", req.inputs)
     return {"run": run.model_dump(), "output": out}
 
+class BatchItemReq(BaseModel):
+    agent_type_id: str
+    inputs: Dict[str, Any] = {}
+    actor_id: str = "operator"
+
+class RunAgentBatchReq(BaseModel):
+    session_id: str
+    epoch_id: str
+    items: List[BatchItemReq]
+    max_parallel: int = 8
+
+@app.post("/api/agents/run_batch")
+async def run_agent_batch(req: RunAgentBatchReq):
+    if len(req.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(400, f"at most {MAX_BATCH_ITEMS} items per batch")
+    session = await a_living.get_session(req.session_id)
+    try:
+        epoch = await a_living.get_epoch(req.session_id, req.epoch_id)
+    except KeyError:
+        raise HTTPException(404, "epoch not found")
+    results: List[Dict[str, Any]] = [{} for _ in req.items]
+    calls: List[Invocation] = []
+    runs: List[RunContext] = []
+    positions: List[int] = []
+    for i, item in enumerate(req.items):
+        run = RunContext(run_id=new_id("run"), session_id=session.session_id, epoch_id=epoch.epoch_id, zone_id="core", trace_id=new_id("trace"))
+        ctx = make_ctx(session, epoch, run, ActorRef(actor_type="human", actor_id=item.actor_id, display_name=item.actor_id))
+        try:
+            desc, factory = agents.resolve(item.agent_type_id)
+            instance = factory.create({}, ctx)
+        except Exception as e:
+            # an unknown agent or a failing factory fails its own item only
+            error = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+            results[i] = {"index": i, "ok": False, "run": None, "error": error, "error_type": type(e).__name__}
+            continue
+        calls.append(Invocation(ctx=ctx, agent_desc=desc, agent_instance=instance, inputs=item.inputs))
+        runs.append(run)
+        positions.append(i)
+    # all runs are recorded in one transaction before any agent starts
+    await a_living.create_runs(runs)
+    outcomes = await run_executor.run(invoker.invoke_many, calls, max(1, req.max_parallel), batch_pool)
+    for i, run, res in zip(positions, runs, outcomes):
+        results[i] = {"index": i, "ok": res.ok, "run": run.model_dump(),
+                      **({"output": res.output} if res.ok else {"error": res.error, "error_type": res.error_type})}
+    return {"session_id": session.session_id, "epoch_id": epoch.epoch_id, "results": results}
+
 @app.get("/api/agents")
 def list_agents():
     return [a.model_dump() for a in agents.list()]
 
 @app.get("/api/artifacts/{kind}/{artifact_id}")
-def get_artifact(kind: str, artifact_id: str):
+async def get_artifact(kind: str, artifact_id: str):
     ref = ArtifactRef(kind=kind, artifact_id=artifact_id)
-    env = artifact_store.get(ref)
+    env = await a_artifacts.get(ref)
     return env.model_dump()
 
 @app.get("/api/artifacts/{kind}")
-def list_artifacts(kind: str, limit: int = 50):
-    return [r.model_dump() for r in artifact_store.list(kind, limit=limit)]
+async def list_artifacts(kind: str, response: Response, limit: int = 50, cursor: Optional[str] = None,
+                   session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None):
+    try:
+        page = await a_artifacts.list_page(kind, limit=limit, cursor=cursor, session_id=session_id, run_id=run_id, producer=producer)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    # body stays a plain list for existing clients; pass the header back as ?cursor= for the next page
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [r.model_dump() for r in page.items]
 
 @app.get("/api/pointers")
-def list_pointers(prefix: Optional[str] = None):
-    items = pointer_store.list_active(DEFAULT_TENANT.tenant_id, DEFAULT_DCTX.decision_context_id, prefix=prefix)
+async def list_pointers(prefix: Optional[str] = None):
+    items = await a_pointers.list_active(DEFAULT_TENANT.tenant_id, DEFAULT_DCTX.decision_context_id, prefix=prefix)
     return [{"pointer_key": k, "artifact_ref": v.model_dump()} for k,v in items]
 
+MAX_EVENT_PAGE = 1000
+
+def _csv(v: Optional[str]) -> List[str]:
+    return [x for x in (v or "").split(",") if x]
+
+@app.get("/api/events")
+async def query_events(response: Response, session_id: Optional[str] = None, run_id: Optional[str] = None,
+                       epoch_id: Optional[str] = None, zone_id: Optional[str] = None, actor_type: Optional[str] = None,
+                       actor_id: Optional[str] = None, event_type: Optional[str] = None, severity: Optional[str] = None,
+                       since: Optional[str] = None, until: Optional[str] = None, fields: Optional[str] = None,
+                       limit: int = 200, cursor: Optional[str] = None, order: str = "desc"):
+    # event_type, severity and fields take comma-separated lists
+    if not 0 < limit <= MAX_EVENT_PAGE:
+        raise HTTPException(400, f"limit must be between 1 and {MAX_EVENT_PAGE}")
+    query = EventQuery(session_id=session_id, run_id=run_id, epoch_id=epoch_id, zone_id=zone_id, actor_type=actor_type,
+                       actor_id=actor_id, event_types=_csv(event_type), severities=_csv(severity), since=since, until=until)
+    try:
+        page = await a_tracker.query_page(query, limit=limit, cursor=cursor, fields=_csv(fields) or None, order=order)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.model_dump()
+
 @app.get("/api/events/{session_id}")
-def get_events(session_id: str, limit: int = 200):
-    return [e.model_dump() for e in tracker.query(session_id, limit=limit)]
+async def get_events(session_id: str, limit: int = 200):
+    return [e.model_dump() for e in await a_tracker.query(session_id, limit=limit)]
+
+@app.get("/api/aggregates/{scope}/{scope_id}")
+async def get_aggregates(scope: str, scope_id: str):
+    # scope: run | epoch | zone | session; counts and span durations are pre-aggregated on append
+    try:
+        return (await a_tracker.aggregates(scope, scope_id)).model_dump()
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+@app.get("/api/memory/stats")
+async def memory_stats():
+    return memory.stats()
 
 @app.get("/api/realtime")
-def realtime():
-    def gen():
-        # naive SSE from in-memory buffer
-        idx = 0
-        while True:
-            while idx < len(_realtime):
-                item = _realtime[idx]
-                idx += 1
-                yield f"data: {item}\n\n"
-            import time
-            time.sleep(0.4)
-    return StreamingResponse(gen(), media_type="text/event-stream")
+async def realtime(last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")):
+    return StreamingResponse(realtime_broadcaster.stream(last_event_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.get("/ui", response_class=HTMLResponse)
 def ui():
@@ -7,8 +7,12 @@ from typing import Dict, List, Tuple, Any
 
 from kimaru_core.utils.ids import new_id
 from kimaru_core.utils.time import utc_now_iso
-from kimaru_core.runtime.boot_manager import BootManager, BootConfig
+from kimaru_core.runtime.boot_manager import BootConfig
 from kimaru_core.runtime.manifest import KimaruManifest, ZoneKernelRef
+from kimaru_core.runtime.registry import RuntimeLease, default_runtime_registry
+
+# session_id -> lease on the shared runtime it was set up against
+_session_leases: Dict[str, RuntimeLease] = {}
 
 
 def _base_var_dir() -> Path:
@@ -16,6 +20,26 @@ def _base_var_dir() -> Path:
     return Path(os.getenv("KIMARU_VAR_DIR", Path.cwd() / "var"))
 
 
+def _boot_config(var_dir: Path) -> BootConfig:
+    return BootConfig(var_dir=var_dir, warmup=os.getenv("KIMARU_BOOT_WARMUP", "0") == "1")
+
+
+def session_lease(session_id: str) -> RuntimeLease:
+    """The runtime lease of a session created by setup_session (`.state`, `.reused`)."""
+    lease = _session_leases.get(session_id)
+    if lease is None:
+        raise KeyError(f"No runtime for session: {session_id}")
+    return lease
+
+
+def release_session(session_id: str) -> None:
+    """Drop the session's reference to its runtime; idle runtimes are evicted by the registry."""
+    lease = _session_leases.pop(session_id, None)
+    if lease is None:
+        raise KeyError(f"No runtime for session: {session_id}")
+    lease.release()
+
+
 def load_manifest_from_file(manifest_location: str) -> Dict[str, Any]:
   
     path = Path(manifest_location)
@@ -87,15 +111,15 @@ def setup_session(
         federation=manifest_data.get("federation", {})
     )
     
-    # Boot the core with manifest
+    # Boot the core with manifest, or share the runtime already booted for this tenant + manifest
     var_dir = _base_var_dir()
-    boot_config = BootConfig(var_dir=var_dir, manifest=kimaru_manifest)
-    boot_manager = BootManager(boot_config)
     
     try:
-        state = boot_manager.boot()
+        lease = default_runtime_registry().acquire(tenant_id, kimaru_manifest, lambda: _boot_config(var_dir))
     except Exception as e:
         raise RuntimeError(f"Failed to boot core with manifest: {e}")
+    _session_leases[session_id] = lease
+    state = lease.state
     
     # Extract loaded zones
     zones_loaded = list(state.get("zones", {}).keys())
@@ -109,6 +133,7 @@ def setup_session(
         "zones_loaded": zones_loaded,
         "created_at": created_at,
         "run_coordinator": state.get("run_coordinator") is not None,
+        "runtime_reused": lease.reused,
     }
     
     # Optionally store session to db
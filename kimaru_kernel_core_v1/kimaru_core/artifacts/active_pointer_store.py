@@ -1,20 +1,54 @@
 from __future__ import annotations
-import sqlite3
-from typing import Optional, List, Tuple
+import sqlite3, threading
+from typing import Optional, List, Tuple, Dict
 from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
 
 class ActivePointerStore:
     def set_active(self, tenant_id: str, decision_context_id: str, pointer_key: str, artifact_ref: ArtifactRef, updated_at: str) -> None: ...
     def get_active(self, tenant_id: str, decision_context_id: str, pointer_key: str) -> Optional[ArtifactRef]: ...
     def list_active(self, tenant_id: str, decision_context_id: str, prefix: str | None = None) -> List[Tuple[str, ArtifactRef]]: ...
+    def get_active_many(self, tenant_id: str, decision_context_id: str, pointer_keys: List[str]) -> Dict[str, ArtifactRef]:
+        found = {}
+        for k in pointer_keys:
+            ref = self.get_active(tenant_id, decision_context_id, k)
+            if ref is not None:
+                found[k] = ref
+        return found
 
-class SQLiteActivePointerStore(ActivePointerStore):
+class GenerationProbe:
+    """Store-wide pointer generation read over one dedicated connection.
+
+    The generation row is only re-read when PRAGMA data_version on this connection
+    shows that some other connection committed since the last call.
+    """
     def __init__(self, db_path: str):
+        self._c = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._generation = 0
+
+    def generation(self) -> int:
+        with self._lock:
+            dv = self._c.execute("PRAGMA data_version").fetchone()[0]
+            if dv != self._data_version:
+                self._data_version = dv
+                row = self._c.execute("SELECT generation FROM pointer_generation WHERE id=1").fetchone()
+                self._generation = row[0] if row else 0
+            return self._generation
+
+    def close(self) -> None:
+        with self._lock:
+            self._c.close()
+
+class SQLiteActivePointerStore(ActivePointerStore):
+    def __init__(self, db_path: str, connections: Optional[SQLiteConnectionManager] = None):
         self.db_path = db_path
+        self.connections = connections or default_connection_manager()
         self._init()
 
     def _conn(self):
-        return sqlite3.connect(self.db_path)
+        return self.connections.connect(self.db_path)
 
     def _init(self):
         with self._conn() as c:
@@ -27,16 +61,26 @@ class SQLiteActivePointerStore(ActivePointerStore):
                 updated_at TEXT,
                 PRIMARY KEY (tenant_id, decision_context_id, pointer_key)
             )""")
+            # bumped in the same transaction as every pointer write, by every process
+            c.execute("CREATE TABLE IF NOT EXISTS pointer_generation(id INTEGER PRIMARY KEY CHECK (id = 1), generation INTEGER)")
+            c.execute("INSERT OR IGNORE INTO pointer_generation(id, generation) VALUES(1, 0)")
             c.commit()
 
     def set_active(self, tenant_id: str, decision_context_id: str, pointer_key: str, artifact_ref: ArtifactRef, updated_at: str) -> None:
+        self.set_active_versioned(tenant_id, decision_context_id, pointer_key, artifact_ref, updated_at)
+
+    def set_active_versioned(self, tenant_id: str, decision_context_id: str, pointer_key: str, artifact_ref: ArtifactRef,
+                             updated_at: str) -> int:
+        """set_active() that returns the store generation its write produced."""
         with self._conn() as c:
             c.execute("""INSERT INTO pointers(tenant_id, decision_context_id, pointer_key, kind, artifact_id, updated_at)
                          VALUES(?,?,?,?,?,?)
                          ON CONFLICT(tenant_id, decision_context_id, pointer_key)
                          DO UPDATE SET kind=excluded.kind, artifact_id=excluded.artifact_id, updated_at=excluded.updated_at
                       """, (tenant_id, decision_context_id, pointer_key, artifact_ref.kind, artifact_ref.artifact_id, updated_at))
+            generation = c.execute("UPDATE pointer_generation SET generation = generation + 1 WHERE id=1 RETURNING generation").fetchone()[0]
             c.commit()
+        return generation
 
     def get_active(self, tenant_id: str, decision_context_id: str, pointer_key: str) -> Optional[ArtifactRef]:
         with self._conn() as c:
@@ -47,6 +91,18 @@ class SQLiteActivePointerStore(ActivePointerStore):
                 return None
             return ArtifactRef(kind=row[0], artifact_id=row[1])
 
+    def get_active_many(self, tenant_id: str, decision_context_id: str, pointer_keys: List[str]) -> Dict[str, ArtifactRef]:
+        if not pointer_keys:
+            return {}
+        q = ("SELECT pointer_key, kind, artifact_id FROM pointers WHERE tenant_id=? AND decision_context_id=? AND pointer_key IN (%s)"
+             % ",".join("?" * len(pointer_keys)))
+        with self._conn() as c:
+            rows = c.execute(q, [tenant_id, decision_context_id, *pointer_keys]).fetchall()
+        return {r[0]: ArtifactRef(kind=r[1], artifact_id=r[2]) for r in rows}
+
+    def generation_probe(self) -> GenerationProbe:
+        return GenerationProbe(self.db_path)
+
     def list_active(self, tenant_id: str, decision_context_id: str, prefix: str | None = None):
         q = "SELECT pointer_key, kind, artifact_id FROM pointers WHERE tenant_id=? AND decision_context_id=?"
         params = [tenant_id, decision_context_id]
@@ -1,22 +1,48 @@
 from __future__ import annotations
-import os, json
-from typing import Optional, Dict, Any, List
+import os, json, logging
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 from kimaru_core.artifacts.artifact_ref import ArtifactRef
 from kimaru_core.artifacts.artifact_models import ArtifactEnvelope
+from kimaru_core.artifacts.listing_index import ArtifactListingIndex, ArtifactPage
 from kimaru_core.utils.hashing import canonical_json_dumps, sha256_bytes
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager
+
+logger = logging.getLogger(__name__)
 
 class ArtifactStore:
     def put(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None: ...
     def get(self, ref: ArtifactRef) -> ArtifactEnvelope: ...
     def exists(self, ref: ArtifactRef) -> bool: ...
-    def list(self, kind: str, limit: int = 100) -> List[ArtifactRef]: ...
+    def list_page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+                  session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage: ...
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, ArtifactRef]]: ...
+
+    def list(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+             session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> List[ArtifactRef]:
+        return self.list_page(kind, limit, cursor, session_id=session_id, run_id=run_id, producer=producer).items
 
 class FileSystemArtifactStore(ArtifactStore):
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, index_path: Optional[str] = None, connections: Optional[SQLiteConnectionManager] = None):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.index = ArtifactListingIndex(index_path or str(self.base_dir / "listing.sqlite"), connections)
+        if self.index.is_empty():
+            self._backfill_index()
+
+    def _backfill_index(self) -> None:
+        # one-off migration for stores written before the listing index existed
+        files = [f for d in self.base_dir.iterdir() if d.is_dir() for f in d.glob("*.json")]
+        for f in sorted(files, key=lambda x: x.stat().st_mtime):
+            ref = ArtifactRef(kind=f.parent.name, artifact_id=f.stem)
+            try:
+                env = self.get(ref)
+            except (OSError, ValueError) as e:
+                # a corrupt file must not keep the store from opening; it stays unlisted
+                logger.warning("artifact listing backfill skipped %s: %s", f, e)
+                continue
+            self.index.add(ref, env)
 
     def _path(self, ref: ArtifactRef) -> Path:
         d = self.base_dir / ref.kind
@@ -36,8 +62,10 @@ class FileSystemArtifactStore(ArtifactStore):
             existing = p.read_bytes()
             if sha256_bytes(existing) != checksum:
                 raise ValueError(f"Artifact overwrite rejected for {ref.key()}")
-            return
-        p.write_bytes(raw)
+        else:
+            p.write_bytes(raw)
+        # idempotent; also repairs the index if a previous put died before reaching it
+        self.index.add(ref, envelope)
 
     def get(self, ref: ArtifactRef) -> ArtifactEnvelope:
         p = self._path(ref)
@@ -46,11 +74,20 @@ class FileSystemArtifactStore(ArtifactStore):
         data = json.loads(p.read_text(encoding="utf-8"))
         return ArtifactEnvelope.model_validate(data)
 
-    def list(self, kind: str, limit: int = 100) -> List[ArtifactRef]:
-        d = self.base_dir / kind
-        if not d.exists():
-            return []
-        refs = []
-        for f in sorted(d.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)[:limit]:
-            refs.append(ArtifactRef(kind=kind, artifact_id=f.stem))
-        return refs
+    def list_page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+                  session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage:
+        return self.index.page(kind, limit, cursor, session_id=session_id, run_id=run_id, producer=producer)
+
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, ArtifactRef]]:
+        return self.index.changes(after_seq, limit)
+
+ARTIFACT_BACKENDS = ("filesystem", "content_addressed")
+
+def create_artifact_store(base_dir: str, backend: str = "filesystem", connections: Optional[SQLiteConnectionManager] = None) -> ArtifactStore:
+    if backend == "filesystem":
+        return FileSystemArtifactStore(base_dir, connections=connections)
+    if backend == "content_addressed":
+        # imported lazily: the CAS module subclasses ArtifactStore from this module
+        from kimaru_core.artifacts.content_addressed_store import ContentAddressedArtifactStore
+        return ContentAddressedArtifactStore(base_dir, connections=connections)
+    raise ValueError(f"Unknown artifact backend: {backend}. Supported: {list(ARTIFACT_BACKENDS)}")
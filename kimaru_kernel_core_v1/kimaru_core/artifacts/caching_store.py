@@ -0,0 +1,92 @@
+from __future__ import annotations
+import json, threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_models import ArtifactEnvelope
+from kimaru_core.artifacts.artifact_store import ArtifactStore
+from kimaru_core.artifacts.listing_index import ArtifactPage
+from kimaru_core.utils.hashing import canonical_json_dumps
+
+class CachingArtifactStore(ArtifactStore):
+    """Read-through LRU cache in front of another ArtifactStore.
+
+    Artifacts are immutable, so entries never go stale and there is no TTL; the
+    cache is bounded by the canonical JSON size of its entries. With
+    cache_objects=True the validated ArtifactEnvelope itself is cached and returned
+    to every reader (treat it as read-only); otherwise raw bytes are cached and
+    re-validated per hit, which still saves the disk read.
+    """
+
+    def __init__(self, inner: ArtifactStore, max_bytes: int = 64 * 1024 * 1024, cache_objects: bool = True):
+        self.inner = inner
+        self.max_bytes = max_bytes
+        self.cache_objects = cache_objects
+        self._items: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remember(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None:
+        raw = canonical_json_dumps(envelope.model_dump()).encode("utf-8")
+        size = len(raw)
+        if size > self.max_bytes:
+            return  # never let one artifact flush the whole cache
+        value = envelope if self.cache_objects else raw
+        key = ref.key()
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def _lookup(self, ref: ArtifactRef) -> Optional[ArtifactEnvelope]:
+        with self._lock:
+            item = self._items.get(ref.key())
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(ref.key())
+            self.hits += 1
+        value = item[0]
+        if isinstance(value, bytes):
+            return ArtifactEnvelope.model_validate(json.loads(value))
+        return value
+
+    def put(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None:
+        self.inner.put(ref, envelope)
+        # write-through; copy so later mutation of the caller's object cannot leak into the cache
+        self._remember(ref, envelope.model_copy(deep=True) if self.cache_objects else envelope)
+
+    def get(self, ref: ArtifactRef) -> ArtifactEnvelope:
+        env = self._lookup(ref)
+        if env is None:
+            env = self.inner.get(ref)
+            self._remember(ref, env)
+        return env
+
+    def exists(self, ref: ArtifactRef) -> bool:
+        with self._lock:
+            if ref.key() in self._items:
+                return True
+        return self.inner.exists(ref)
+
+    def list_page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+                  session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage:
+        return self.inner.list_page(kind, limit, cursor, session_id=session_id, run_id=run_id, producer=producer)
+
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, ArtifactRef]]:
+        return self.inner.changes(after_seq, limit)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._items), "bytes": self._bytes, "max_bytes": self.max_bytes}
@@ -0,0 +1,23 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_store import ArtifactStore
+
+# A chunked artifact is a manifest envelope whose payload lists immutable part artifacts:
+#   {"format": CHUNKED_FORMAT, "parts": [ArtifactRef, ...], "chunk_count": n, "summary": {...}}
+# Parts live under kind "<kind>.chunk" so they do not show up in listings of the manifest kind.
+CHUNKED_FORMAT = "kimaru.chunked.v1"
+
+def part_ref(ref: ArtifactRef, index: int) -> ArtifactRef:
+    return ArtifactRef(kind=f"{ref.kind}.chunk", artifact_id=f"{ref.artifact_id}--p{index:06d}")
+
+def is_chunked(payload: Any) -> bool:
+    return isinstance(payload, dict) and payload.get("format") == CHUNKED_FORMAT
+
+def iter_chunks(store: ArtifactStore, ref: ArtifactRef) -> Iterator[Dict[str, Any]]:
+    """Yield the part payloads of a chunked artifact, one part in memory at a time."""
+    manifest = store.get(ref).payload
+    if not is_chunked(manifest):
+        raise ValueError(f"Artifact is not chunked: {ref.key()}")
+    for p in manifest["parts"]:
+        yield store.get(ArtifactRef.model_validate(p)).payload
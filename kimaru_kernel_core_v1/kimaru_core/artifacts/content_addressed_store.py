@@ -0,0 +1,130 @@
+from __future__ import annotations
+import os, json, logging, tempfile
+from typing import List, Optional, Tuple
+from pathlib import Path
+
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_models import ArtifactEnvelope
+from kimaru_core.artifacts.artifact_store import ArtifactStore
+from kimaru_core.artifacts.listing_index import ArtifactListingIndex, ArtifactPage
+from kimaru_core.utils.hashing import canonical_json_dumps, sha256_bytes
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
+
+logger = logging.getLogger(__name__)
+
+class ContentAddressedArtifactStore(ArtifactStore):
+    """Artifact store that keeps envelopes as sha256-addressed blobs.
+
+    Layout:
+      base_dir/blobs/<d[0:2]>/<d[2:4]>/<digest>.json  (two-level fan-out)
+      base_dir/index.sqlite                          (kind, artifact_id) -> digest
+
+    Identical envelopes are stored once; lookups are an index seek plus a single
+    blob read, independent of how many artifacts a kind holds.
+    """
+
+    def __init__(self, base_dir: str, index_path: Optional[str] = None, connections: Optional[SQLiteConnectionManager] = None):
+        self.base_dir = Path(base_dir)
+        self.blob_dir = self.base_dir / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = index_path or str(self.base_dir / "index.sqlite")
+        self.connections = connections or default_connection_manager()
+        self._init()
+        self.index = ArtifactListingIndex(self.index_path, self.connections)
+        if self.index.is_empty():
+            self._backfill_index()
+
+    def _conn(self):
+        return self.connections.connect(self.index_path)
+
+    def _init(self):
+        with self._conn() as c:
+            c.execute("""CREATE TABLE IF NOT EXISTS refs(
+                kind TEXT,
+                artifact_id TEXT,
+                digest TEXT,
+                PRIMARY KEY (kind, artifact_id)
+            )""")
+            c.commit()
+
+    def _backfill_index(self) -> None:
+        # one-off migration for stores written before the listing index existed
+        with self._conn() as c:
+            rows = c.execute("SELECT kind, artifact_id FROM refs ORDER BY rowid").fetchall()
+        for kind, artifact_id in rows:
+            ref = ArtifactRef(kind=kind, artifact_id=artifact_id)
+            try:
+                env = self.get(ref)
+            except (OSError, ValueError) as e:
+                logger.warning("artifact listing backfill skipped %s: %s", ref.key(), e)
+                continue
+            self.index.add(ref, env)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[0:2] / digest[2:4] / f"{digest}.json"
+
+    def _digest(self, ref: ArtifactRef) -> Optional[str]:
+        with self._conn() as c:
+            row = c.execute("SELECT digest FROM refs WHERE kind=? AND artifact_id=?",
+                            (ref.kind, ref.artifact_id)).fetchone()
+        return row[0] if row else None
+
+    def _write_blob(self, digest: str, raw: bytes) -> None:
+        p = self._blob_path(digest)
+        if p.exists():
+            return  # dedup: identical payload already stored
+        p.parent.mkdir(parents=True, exist_ok=True)
+        # a private temp file per writer: identical envelopes put concurrently share the digest
+        fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f"{p.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, p)
+        except OSError:
+            if not p.exists():
+                raise
+            # another writer got there first with the same bytes (same digest)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def exists(self, ref: ArtifactRef) -> bool:
+        return self._digest(ref) is not None
+
+    def put(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None:
+        data = envelope.model_dump()
+        raw = canonical_json_dumps(data).encode("utf-8")
+        checksum = sha256_bytes(raw)
+        # immutability: an existing ref must point at the same bytes
+        existing = self._digest(ref)
+        if existing is not None:
+            if existing != checksum:
+                raise ValueError(f"Artifact overwrite rejected for {ref.key()}")
+            self.index.add(ref, envelope)
+            return
+        # blob first, then index: a crash in between leaves an orphan blob, never a dangling ref
+        self._write_blob(checksum, raw)
+        with self._conn() as c:
+            c.execute("INSERT OR IGNORE INTO refs(kind, artifact_id, digest) VALUES(?,?,?)",
+                      (ref.kind, ref.artifact_id, checksum))
+            row = c.execute("SELECT digest FROM refs WHERE kind=? AND artifact_id=?",
+                            (ref.kind, ref.artifact_id)).fetchone()
+            c.commit()
+        # a concurrent writer may have claimed the ref between the check and the insert
+        if row[0] != checksum:
+            raise ValueError(f"Artifact overwrite rejected for {ref.key()}")
+        self.index.add(ref, envelope)
+
+    def get(self, ref: ArtifactRef) -> ArtifactEnvelope:
+        digest = self._digest(ref)
+        if digest is None:
+            raise KeyError(f"Artifact not found: {ref.key()}")
+        data = json.loads(self._blob_path(digest).read_text(encoding="utf-8"))
+        return ArtifactEnvelope.model_validate(data)
+
+    def list_page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+                  session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage:
+        return self.index.page(kind, limit, cursor, session_id=session_id, run_id=run_id, producer=producer)
+
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, ArtifactRef]]:
+        return self.index.changes(after_seq, limit)
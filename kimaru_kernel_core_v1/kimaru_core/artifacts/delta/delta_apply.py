@@ -0,0 +1,176 @@
+from __future__ import annotations
+import copy
+from typing import Any, List, Optional, Tuple
+
+from kimaru_core.artifacts.delta.delta_envelope import DeltaEnvelope, DeltaOperation
+from kimaru_core.utils.hashing import sha256_canonical_json
+
+def delta_hash(delta: DeltaEnvelope) -> str:
+    """Chain hash of a delta: covers every field, including `hash_chain_prev`."""
+    return sha256_canonical_json(delta.model_dump(mode="json"))
+
+# --- JSON pointer (RFC 6901) -------------------------------------------------
+
+def _tokens(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in path[1:].split("/")]
+
+def _index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise ValueError(f"Invalid array index: {token!r}")
+    i = int(token)
+    if i > len(container) or (i == len(container) and not allow_end):
+        raise ValueError(f"Array index out of range: {i}")
+    return i
+
+def _parent(doc: Any, path: str) -> Tuple[Any, Optional[str]]:
+    tokens = _tokens(path)
+    if not tokens:
+        return None, None
+    node = doc
+    for t in tokens[:-1]:
+        if isinstance(node, list):
+            node = node[_index(node, t, allow_end=False)]
+        elif isinstance(node, dict):
+            if t not in node:
+                raise ValueError(f"Path not found: {path}")
+            node = node[t]
+        else:
+            raise ValueError(f"Path not found: {path}")
+    return node, tokens[-1]
+
+def _get(doc: Any, path: str) -> Any:
+    parent, last = _parent(doc, path)
+    if last is None:
+        return doc
+    if isinstance(parent, list):
+        return parent[_index(parent, last, allow_end=False)]
+    if isinstance(parent, dict) and last in parent:
+        return parent[last]
+    raise ValueError(f"Path not found: {path}")
+
+def _add(doc: Any, path: str, value: Any) -> Any:
+    parent, last = _parent(doc, path)
+    if last is None:
+        return value
+    if isinstance(parent, list):
+        parent.insert(_index(parent, last, allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[last] = value
+    else:
+        raise ValueError(f"Path not found: {path}")
+    return doc
+
+def _remove(doc: Any, path: str) -> Tuple[Any, Any]:
+    parent, last = _parent(doc, path)
+    if last is None:
+        raise ValueError("Cannot remove the document root")
+    if isinstance(parent, list):
+        return doc, parent.pop(_index(parent, last, allow_end=False))
+    if isinstance(parent, dict) and last in parent:
+        return doc, parent.pop(last)
+    raise ValueError(f"Path not found: {path}")
+
+def _replace(doc: Any, path: str, value: Any) -> Any:
+    parent, last = _parent(doc, path)
+    if last is None:
+        return value
+    if isinstance(parent, list):
+        parent[_index(parent, last, allow_end=False)] = value
+    elif isinstance(parent, dict) and last in parent:
+        parent[last] = value
+    else:
+        raise ValueError(f"Path not found: {path}")
+    return doc
+
+def _setdefault(doc: Any, path: str, default: Any) -> Any:
+    """The node at `path`, created as `default` (with missing dict parents) if absent."""
+    node = doc
+    tokens = _tokens(path)
+    for i, t in enumerate(tokens):
+        if isinstance(node, list):
+            node = node[_index(node, t, allow_end=False)]
+        elif isinstance(node, dict):
+            if t not in node:
+                node[t] = {} if i < len(tokens) - 1 else copy.deepcopy(default)
+            node = node[t]
+        else:
+            raise ValueError(f"Path not found: {path}")
+    return node
+
+# --- operations --------------------------------------------------------------
+
+def _json_patch(doc: Any, patch: Any) -> Any:
+    if not isinstance(patch, list):
+        raise ValueError("json_patch data must be a list of RFC 6902 operations")
+    for p in patch:
+        op, path = p.get("op"), p.get("path")
+        if path is None:
+            raise ValueError(f"json_patch operation without path: {p}")
+        if op == "add":
+            doc = _add(doc, path, copy.deepcopy(p["value"]))
+        elif op == "remove":
+            doc, _ = _remove(doc, path)
+        elif op == "replace":
+            doc = _replace(doc, path, copy.deepcopy(p["value"]))
+        elif op == "move":
+            doc, value = _remove(doc, p["from"])
+            doc = _add(doc, path, value)
+        elif op == "copy":
+            doc = _add(doc, path, copy.deepcopy(_get(doc, p["from"])))
+        elif op == "test":
+            if _get(doc, path) != p["value"]:
+                raise ValueError(f"json_patch test failed at {path}")
+        else:
+            raise ValueError(f"Unknown json_patch op: {op}")
+    return doc
+
+def _append_events(doc: Any, data: Any) -> Any:
+    # data: [event, ...] (appended to /events) or {"path": "/events", "events": [...]}
+    if isinstance(data, list):
+        path, events = "/events", data
+    else:
+        path, events = data.get("path", "/events"), data.get("events", [])
+    target = _setdefault(doc, path, [])
+    if not isinstance(target, list):
+        raise ValueError(f"append_events target is not a list: {path}")
+    target.extend(copy.deepcopy(events))
+    return doc
+
+def _param_delta(doc: Any, data: Any) -> Any:
+    # data: {"path": "/params", "set": {k: v}, "increment": {k: n}, "unset": [k]}
+    params = _setdefault(doc, data.get("path", "/params"), {})
+    if not isinstance(params, dict):
+        raise ValueError("param_delta target is not an object")
+    for k, v in data.get("set", {}).items():
+        params[k] = copy.deepcopy(v)
+    for k, n in data.get("increment", {}).items():
+        cur = params.get(k, 0)
+        if not isinstance(cur, (int, float)) or isinstance(cur, bool):
+            raise ValueError(f"param_delta cannot increment non-numeric param: {k}")
+        params[k] = cur + n
+    for k in data.get("unset", []):
+        params.pop(k, None)
+    return doc
+
+def apply_operation(doc: Any, op: DeltaOperation) -> Any:
+    if op.op_type == "json_patch":
+        return _json_patch(doc, op.data)
+    if op.op_type == "append_events":
+        return _append_events(doc, op.data)
+    if op.op_type == "param_delta":
+        return _param_delta(doc, op.data)
+    if op.op_type == "replace_section":
+        return _replace(doc, op.data["path"], copy.deepcopy(op.data["value"]))
+    raise ValueError(f"{op.op_type} deltas are applied through the ActivePointerStore, not to artifact state")
+
+def apply_delta(state: Any, delta: DeltaEnvelope) -> Any:
+    """Apply a delta's operations in order. `state` is modified in place where possible; use the return value."""
+    for op in delta.operations:
+        state = apply_operation(state, op)
+    return state
@@ -0,0 +1,354 @@
+from __future__ import annotations
+import json, logging, sqlite3, threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_models import ArtifactHeader, ArtifactEnvelope, IntegrityRecord, ProducerRef
+from kimaru_core.artifacts.artifact_store import ArtifactStore
+from kimaru_core.artifacts.integrity import compute_envelope_checksum
+from kimaru_core.artifacts.delta.delta_envelope import DeltaEnvelope
+from kimaru_core.artifacts.delta.delta_apply import apply_delta, delta_hash
+from kimaru_core.decision_tracker import event_types
+from kimaru_core.decision_tracker.models import TrackEvent
+from kimaru_core.utils.hashing import canonical_json_dumps
+from kimaru_core.utils.ids import new_id
+from kimaru_core.utils.time import utc_now_iso
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
+
+logger = logging.getLogger(__name__)
+
+# ops that commute with concurrent appends; a "merge" delta may be rebased only if it has nothing else
+_MERGEABLE = {"append_events", "param_delta"}
+
+@dataclass
+class DeltaRecord:
+    apply_order: int
+    hash: str
+    delta: DeltaEnvelope
+    created_at: str
+
+@dataclass
+class MaterializedState:
+    base_ref: ArtifactRef
+    apply_order: int  # 0 = the base artifact itself
+    head_hash: Optional[str]
+    state: Any
+    snapshot_ref: Optional[ArtifactRef] = None
+    replayed: int = 0  # deltas applied on top of the snapshot/cached state
+
+class DeltaLogStore:
+    """Append-only, hash-chained deltas per base artifact.
+
+    Delta n of a base has apply_order n and hash_chain_prev = hash of delta n-1
+    (None for n=1). The current state is the base payload (or the latest
+    snapshot) with the remaining deltas replayed in order.
+    """
+    def append(self, ctx, delta: DeltaEnvelope, rebase: bool = True) -> DeltaRecord: ...
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, DeltaRecord]]: ...
+    def head(self, base_ref: ArtifactRef) -> Optional[DeltaRecord]: ...
+    def deltas(self, base_ref: ArtifactRef, after_order: int = 0, limit: Optional[int] = None) -> List[DeltaRecord]: ...
+    def materialize(self, base_ref: ArtifactRef) -> MaterializedState: ...
+    def compact(self, ctx, base_ref: ArtifactRef) -> Optional[ArtifactRef]: ...
+    def verify(self, base_ref: ArtifactRef) -> int: ...
+
+class SQLiteDeltaLogStore(DeltaLogStore):
+    """Deltas in SQLite, snapshots as immutable artifacts of the delta's target_kind.
+
+    Every `compact_every` deltas past the last snapshot, append() writes a new
+    snapshot, so materialize() costs one snapshot read plus a short tail replay.
+    The latest materialized state of up to `cache_states` bases is kept in process
+    and extended from the log, so a reader in the writing process replays nothing.
+    """
+
+    def __init__(self, db_path: str, artifacts: ArtifactStore, connections: Optional[SQLiteConnectionManager] = None,
+                 compact_every: int = 32, cache_states: int = 256):
+        self.db_path = db_path
+        self.artifacts = artifacts
+        self.connections = connections or default_connection_manager()
+        self.compact_every = compact_every
+        self.cache_states = cache_states
+        # base key -> (apply_order, head hash, canonical state JSON)
+        self._states: "OrderedDict[str, Tuple[int, Optional[str], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._append_lock = threading.Lock()
+        # compactions of one base are serialized (striped so the lock table stays bounded)
+        self._compact_locks = [threading.Lock() for _ in range(64)]
+        self._init()
+
+    def _conn(self):
+        return self.connections.connect(self.db_path)
+
+    def _init(self):
+        with self._conn() as c:
+            c.execute("""CREATE TABLE IF NOT EXISTS deltas(
+                base_key TEXT,
+                apply_order INTEGER,
+                delta_id TEXT UNIQUE,
+                hash TEXT,
+                prev_hash TEXT,
+                delta_json TEXT,
+                created_at TEXT,
+                PRIMARY KEY(base_key, apply_order)
+            )""")
+            c.execute("""CREATE TABLE IF NOT EXISTS delta_snapshots(
+                base_key TEXT,
+                apply_order INTEGER,
+                snapshot_kind TEXT,
+                snapshot_id TEXT,
+                head_hash TEXT,
+                created_at TEXT,
+                PRIMARY KEY(base_key, apply_order)
+            )""")
+            c.commit()
+
+    # --- reads ---------------------------------------------------------------
+
+    @staticmethod
+    def _record(r) -> DeltaRecord:
+        return DeltaRecord(apply_order=r[0], hash=r[1], delta=DeltaEnvelope.model_validate_json(r[2]), created_at=r[3])
+
+    def head(self, base_ref: ArtifactRef) -> Optional[DeltaRecord]:
+        with self._conn() as c:
+            r = c.execute("SELECT apply_order,hash,delta_json,created_at FROM deltas WHERE base_key=? ORDER BY apply_order DESC LIMIT 1",
+                          (base_ref.key(),)).fetchone()
+        return self._record(r) if r else None
+
+    def deltas(self, base_ref: ArtifactRef, after_order: int = 0, limit: Optional[int] = None) -> List[DeltaRecord]:
+        with self._conn() as c:
+            rows = c.execute("SELECT apply_order,hash,delta_json,created_at FROM deltas WHERE base_key=? AND apply_order>? "
+                             "ORDER BY apply_order LIMIT ?", (base_ref.key(), after_order, -1 if limit is None else limit)).fetchall()
+        return [self._record(r) for r in rows]
+
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, DeltaRecord]]:
+        """Deltas of every base appended after `after_seq` (rowid), oldest first."""
+        with self._conn() as c:
+            rows = c.execute("SELECT rowid,apply_order,hash,delta_json,created_at FROM deltas WHERE rowid>? ORDER BY rowid LIMIT ?",
+                             (after_seq, limit)).fetchall()
+        return [(r[0], self._record(r[1:])) for r in rows]
+
+    def _by_id(self, delta_id: str) -> Optional[DeltaRecord]:
+        with self._conn() as c:
+            r = c.execute("SELECT apply_order,hash,delta_json,created_at FROM deltas WHERE delta_id=?", (delta_id,)).fetchone()
+        return self._record(r) if r else None
+
+    def _snapshot(self, base_key: str) -> Optional[Tuple[int, ArtifactRef, str]]:
+        with self._conn() as c:
+            r = c.execute("SELECT apply_order,snapshot_kind,snapshot_id,head_hash FROM delta_snapshots WHERE base_key=? "
+                          "ORDER BY apply_order DESC LIMIT 1", (base_key,)).fetchone()
+        return (r[0], ArtifactRef(kind=r[1], artifact_id=r[2]), r[3]) if r else None
+
+    @staticmethod
+    def _replay(base_key: str, state: Any, order: int, prev: Optional[str], tail: List[DeltaRecord]) -> Tuple[Any, int, Optional[str]]:
+        for rec in tail:
+            d = rec.delta
+            if rec.apply_order != order + 1 or d.apply_order != rec.apply_order:
+                raise ValueError(f"Delta chain of {base_key} has a gap before apply_order {rec.apply_order}")
+            if d.hash_chain_prev != prev:
+                raise ValueError(f"Delta chain of {base_key} broken at apply_order {rec.apply_order}: hash_chain_prev mismatch")
+            if delta_hash(d) != rec.hash:
+                raise ValueError(f"Delta {d.delta_id} of {base_key} does not match its recorded hash")
+            state = _apply(state, d)
+            order, prev = rec.apply_order, rec.hash
+        return state, order, prev
+
+    def materialize(self, base_ref: ArtifactRef) -> MaterializedState:
+        """Current state of `base_ref`; the chain links of every replayed delta are verified."""
+        base_key = base_ref.key()
+        with self._lock:
+            cached = self._states.get(base_key)
+        snapshot_ref = None
+        if cached is not None:
+            order, prev, raw = cached
+            state = json.loads(raw)
+        else:
+            snap = self._snapshot(base_key)
+            if snap is not None:
+                order, snapshot_ref, prev = snap
+                state = json.loads(canonical_json_dumps(self.artifacts.get(snapshot_ref).payload["state"]))
+            else:
+                order, prev = 0, None
+                state = json.loads(canonical_json_dumps(self.artifacts.get(base_ref).payload))
+        tail = self.deltas(base_ref, after_order=order)
+        try:
+            state, order, prev = self._replay(base_key, state, order, prev, tail)
+        except ValueError:
+            if cached is None:
+                raise
+            # another process moved the chain under our cached state; start over from storage
+            self._forget(base_key)
+            return self.materialize(base_ref)
+        if cached is None or tail:
+            self._remember(base_key, order, prev, state)
+        return MaterializedState(base_ref=base_ref, apply_order=order, head_hash=prev, state=state,
+                                 snapshot_ref=snapshot_ref, replayed=len(tail))
+
+    def verify(self, base_ref: ArtifactRef) -> int:
+        """Re-check the whole chain and every snapshot's head hash; returns the chain length."""
+        base_key = base_ref.key()
+        order, prev = 0, None
+        hashes = {}
+        for rec in self.deltas(base_ref):
+            d = rec.delta
+            if rec.apply_order != order + 1:
+                raise ValueError(f"Delta chain of {base_key} has a gap before apply_order {rec.apply_order}")
+            if d.hash_chain_prev != prev or delta_hash(d) != rec.hash:
+                raise ValueError(f"Delta chain of {base_key} broken at apply_order {rec.apply_order}")
+            order, prev = rec.apply_order, rec.hash
+            hashes[order] = prev
+        with self._conn() as c:
+            snaps = c.execute("SELECT apply_order,head_hash FROM delta_snapshots WHERE base_key=?", (base_key,)).fetchall()
+        for n, h in snaps:
+            if hashes.get(n) != h:
+                raise ValueError(f"Snapshot of {base_key} at apply_order {n} does not match the delta chain")
+        return order
+
+    # --- writes --------------------------------------------------------------
+
+    def append(self, ctx, delta: DeltaEnvelope, rebase: bool = True) -> DeltaRecord:
+        """Append `delta` to its base's chain.
+
+        A delta that does not extend the current head (stale apply_order or
+        hash_chain_prev) is rejected under conflict_policy "reject", rebased onto
+        the head under "lww", and rebased under "merge" only if all its operations
+        are append_events/param_delta. `rebase=False` rejects regardless of policy
+        (replicated deltas must keep their hashes). Re-appending a stored delta_id is a no-op.
+        """
+        with self._append_lock:
+            existing = self._by_id(delta.delta_id)
+            if existing is not None:
+                if existing.delta.base_ref.key() != delta.base_ref.key():
+                    raise ValueError(f"Delta id already used for another base: {delta.delta_id}")
+                return existing
+            current = self.materialize(delta.base_ref)
+            expected = (current.apply_order + 1, current.head_hash)
+            rebased = (delta.apply_order, delta.hash_chain_prev) != expected
+            if rebased:
+                if not rebase or delta.conflict_policy == "reject" or (
+                        delta.conflict_policy == "merge" and any(op.op_type not in _MERGEABLE for op in delta.operations)):
+                    raise ValueError(f"Delta {delta.delta_id} conflicts with the head of {delta.base_ref.key()}: "
+                                     f"expected apply_order={expected[0]} hash_chain_prev={expected[1]}")
+                delta = delta.model_copy(update={
+                    "apply_order": expected[0], "hash_chain_prev": expected[1],
+                    "extra": {**delta.extra, "rebased_from": {"apply_order": delta.apply_order, "hash_chain_prev": delta.hash_chain_prev}},
+                })
+            state = _apply(current.state, delta)
+            h = delta_hash(delta)
+            rec = DeltaRecord(apply_order=delta.apply_order, hash=h, delta=delta, created_at=utc_now_iso())
+            try:
+                with self._conn() as c:
+                    c.execute("INSERT INTO deltas VALUES(?,?,?,?,?,?,?)",
+                              (delta.base_ref.key(), rec.apply_order, delta.delta_id, h, delta.hash_chain_prev,
+                               delta.model_dump_json(), rec.created_at))
+            except sqlite3.IntegrityError as e:
+                self._forget(delta.base_ref.key())
+                raise ValueError(f"Delta {delta.delta_id} lost a concurrent append to {delta.base_ref.key()}; retry") from e
+            self._remember(delta.base_ref.key(), rec.apply_order, h, state)
+        _emit(ctx, event_types.DELTA_CREATED, f"delta {delta.delta_id} appended to {delta.base_ref.key()} @{rec.apply_order}",
+              refs={"base_ref": delta.base_ref.model_dump(), "delta_id": delta.delta_id},
+              metadata={"apply_order": rec.apply_order, "hash": h, "rebased": rebased,
+                        "op_types": [op.op_type for op in delta.operations]})
+        snap = self._snapshot(delta.base_ref.key())
+        if self.compact_every > 0 and rec.apply_order - (snap[0] if snap else 0) >= self.compact_every:
+            try:
+                self.compact(ctx, delta.base_ref)
+            except Exception:  # the delta is committed; a failed snapshot only costs replay
+                logger.warning("Compaction of %s after delta %s failed", delta.base_ref.key(), delta.delta_id, exc_info=True)
+        return rec
+
+    def compact(self, ctx, base_ref: ArtifactRef) -> Optional[ArtifactRef]:
+        """Write the current state as a snapshot artifact; None if the latest snapshot is already current.
+
+        The snapshot envelope depends only on the chain (its header is copied from
+        the base artifact and stamped with the head delta's time), so every
+        writer of a given apply_order produces the same bytes.
+        """
+        base_key = base_ref.key()
+        with self._compact_locks[hash(base_key) % len(self._compact_locks)]:
+            return self._compact(ctx, base_ref, base_key)
+
+    def _compact(self, ctx, base_ref: ArtifactRef, base_key: str) -> Optional[ArtifactRef]:
+        m = self.materialize(base_ref)
+        snap = self._snapshot(base_key)
+        if m.apply_order == 0 or (snap is not None and snap[0] >= m.apply_order):
+            return None
+        head = self.deltas(base_ref, after_order=m.apply_order - 1, limit=1)[0]
+        ref = ArtifactRef(kind=head.delta.target_kind, artifact_id=f"{base_ref.artifact_id}--s{m.apply_order:08d}")
+        payload = {"base_ref": base_ref.model_dump(), "apply_order": m.apply_order, "head_hash": m.head_hash, "state": m.state}
+        if not self.artifacts.exists(ref):
+            base = self.artifacts.get(base_ref).header
+            header = ArtifactHeader(
+                tenant_id=base.tenant_id,
+                decision_context_id=base.decision_context_id,
+                session_id=base.session_id,
+                epoch_id=base.epoch_id,
+                run_id=base.run_id,
+                zone_id=base.zone_id,
+                created_at=head.created_at,
+                producer=ProducerRef(name="delta_log", version="1"),
+                inputs=[base_ref],
+                logical_version=m.apply_order,
+                tags={"delta_base": base_key},
+            )
+            checksum = compute_envelope_checksum(header.model_dump(), payload)
+            try:
+                self.artifacts.put(ref, ArtifactEnvelope(header=header, payload=payload, integrity=IntegrityRecord(checksum=checksum)))
+            except ValueError:
+                # another process wrote this snapshot first (possibly with an older header); it holds the same state
+                if not self.artifacts.exists(ref):
+                    raise
+        with self._conn() as c:
+            c.execute("INSERT OR IGNORE INTO delta_snapshots VALUES(?,?,?,?,?,?)",
+                      (base_key, m.apply_order, ref.kind, ref.artifact_id, m.head_hash, utc_now_iso()))
+        _emit(ctx, event_types.DELTA_APPLIED, f"{base_key} compacted to {ref.key()}",
+              refs={"base_ref": base_ref.model_dump(), "snapshot_ref": ref.model_dump()},
+              metadata={"apply_order": m.apply_order, "head_hash": m.head_hash,
+                        "deltas_folded": m.apply_order - (snap[0] if snap else 0)})
+        return ref
+
+    # --- state cache ---------------------------------------------------------
+
+    def _remember(self, base_key: str, order: int, head_hash: Optional[str], state: Any) -> None:
+        if self.cache_states <= 0:
+            return
+        raw = canonical_json_dumps(state)
+        with self._lock:
+            cur = self._states.get(base_key)
+            if cur is not None and cur[0] > order:
+                return
+            self._states[base_key] = (order, head_hash, raw)
+            self._states.move_to_end(base_key)
+            while len(self._states) > self.cache_states:
+                self._states.popitem(last=False)
+
+    def _forget(self, base_key: str) -> None:
+        with self._lock:
+            self._states.pop(base_key, None)
+
+def _apply(state: Any, delta: DeltaEnvelope) -> Any:
+    try:
+        return apply_delta(state, delta)
+    except ValueError as e:
+        raise ValueError(f"Delta {delta.delta_id} does not apply: {e}") from e
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ValueError(f"Delta {delta.delta_id} does not apply: {e!r}") from e
+
+def _emit(ctx, event_type: str, message: str, refs: dict, metadata: dict) -> None:
+    ctx.tracker.append(TrackEvent(
+        event_id=new_id("evt"),
+        created_at=utc_now_iso(),
+        tenant_id=ctx.tenant.tenant_id,
+        decision_context_id=ctx.decision_context.decision_context_id,
+        session_id=ctx.session.session_id,
+        epoch_id=ctx.epoch.epoch_id,
+        run_id=ctx.run.run_id,
+        zone_id=ctx.run.zone_id,
+        actor_type=ctx.actor.actor_type,
+        actor_id=ctx.actor.actor_id,
+        event_type=event_type,
+        severity="INFO",
+        message=message,
+        refs=refs,
+        metadata=metadata,
+    ))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_models import ArtifactEnvelope
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
+
+class ArtifactPage(BaseModel):
+    items: List[ArtifactRef] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+class ArtifactListingIndex:
+    """Persistent per-kind listing index for artifact stores.
+
+    Rows are appended on put() with a monotonic seq, so "newest first" is a
+    descending seq scan and a cursor is just the last seq returned. Each filter
+    has a (kind, <filter>, seq) index, keeping a page an index seek.
+    """
+
+    def __init__(self, db_path: str, connections: Optional[SQLiteConnectionManager] = None):
+        self.db_path = db_path
+        self.connections = connections or default_connection_manager()
+        self._init()
+
+    def _conn(self):
+        return self.connections.connect(self.db_path)
+
+    def _init(self):
+        with self._conn() as c:
+            c.execute("""CREATE TABLE IF NOT EXISTS listing(
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT,
+                artifact_id TEXT,
+                created_at TEXT,
+                session_id TEXT,
+                run_id TEXT,
+                producer TEXT,
+                UNIQUE (kind, artifact_id)
+            )""")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_listing_kind ON listing(kind, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_listing_session ON listing(kind, session_id, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_listing_run ON listing(kind, run_id, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_listing_producer ON listing(kind, producer, seq)")
+            c.commit()
+
+    def is_empty(self) -> bool:
+        with self._conn() as c:
+            return c.execute("SELECT 1 FROM listing LIMIT 1").fetchone() is None
+
+    def add(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None:
+        h = envelope.header
+        with self._conn() as c:
+            c.execute("""INSERT OR IGNORE INTO listing(kind, artifact_id, created_at, session_id, run_id, producer)
+                         VALUES(?,?,?,?,?,?)""",
+                      (ref.kind, ref.artifact_id, h.created_at, h.session_id, h.run_id, h.producer.name))
+            c.commit()
+
+    def page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+             session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage:
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1: {limit}")
+        q = "SELECT seq, artifact_id FROM listing WHERE kind=?"
+        params: list = [kind]
+        # at most one equality filter besides kind is served by an index; the rest are residual
+        for col, val in (("session_id", session_id), ("run_id", run_id), ("producer", producer)):
+            if val is not None:
+                q += f" AND {col}=?"
+                params.append(val)
+        if cursor:
+            try:
+                params.append(int(cursor))
+            except ValueError:
+                raise ValueError(f"Invalid artifact listing cursor: {cursor}")
+            q += " AND seq<?"
+        q += " ORDER BY seq DESC LIMIT ?"
+        params.append(limit + 1)
+        with self._conn() as c:
+            rows = c.execute(q, params).fetchall()
+        items = [ArtifactRef(kind=kind, artifact_id=r[1]) for r in rows[:limit]]
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        return ArtifactPage(items=items, next_cursor=next_cursor)
+
+    def changes(self, after_seq: int = 0, limit: int = 500) -> List[Tuple[int, ArtifactRef]]:
+        """Artifacts added after `after_seq`, oldest first (a change feed for replication)."""
+        with self._conn() as c:
+            rows = c.execute("SELECT seq, kind, artifact_id FROM listing WHERE seq>? ORDER BY seq LIMIT ?", (after_seq, limit)).fetchall()
+        return [(r[0], ArtifactRef(kind=r[1], artifact_id=r[2])) for r in rows]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import threading, time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.active_pointer_store import ActivePointerStore
+
+class CachingActivePointerStore(ActivePointerStore):
+    """In-memory pointer map per (tenant, decision_context) in front of an ActivePointerStore.
+
+    Lookups hit a dict; keys not yet known (including known-absent ones) are fetched
+    together in one get_active_many() call. set_active() writes through and updates
+    the map. If the inner store keeps a store-wide generation (generation_probe() /
+    set_active_versioned()), the cache holds the generation its maps reflect: its own
+    writes advance it by exactly one, and a generation seen ahead of it (polled at
+    most every `poll_interval_s`, over the probe's dedicated connection) means another
+    worker or process wrote, so the maps are dropped.
+    """
+
+    def __init__(self, inner: ActivePointerStore, max_contexts: int = 1024, poll_interval_s: float = 0.1):
+        self.inner = inner
+        self.max_contexts = max_contexts
+        self.poll_interval_s = poll_interval_s
+        self._maps: "OrderedDict[Tuple[str, str], Dict[str, Optional[ArtifactRef]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        probe = getattr(inner, "generation_probe", None)
+        self._probe = probe() if probe is not None else None
+        # baseline taken before any map is filled
+        self._generation = self._probe.generation() if self._probe is not None else 0
+        self._next_poll = time.monotonic() + poll_interval_s
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_foreign_writes(self) -> None:
+        if self._probe is None or time.monotonic() < self._next_poll:
+            return
+        self._next_poll = time.monotonic() + self.poll_interval_s
+        g = self._probe.generation()
+        with self._lock:
+            if g > self._generation:
+                self._maps.clear()
+                self._generation = g
+                self.invalidations += 1
+
+    def _context(self, tenant_id: str, decision_context_id: str) -> Dict[str, Optional[ArtifactRef]]:
+        key = (tenant_id, decision_context_id)
+        m = self._maps.get(key)
+        if m is None:
+            m = self._maps[key] = {}
+            while len(self._maps) > self.max_contexts:
+                self._maps.popitem(last=False)
+        else:
+            self._maps.move_to_end(key)
+        return m
+
+    def get_active_many(self, tenant_id: str, decision_context_id: str, pointer_keys: List[str]) -> Dict[str, ArtifactRef]:
+        self._check_foreign_writes()
+        with self._lock:
+            m = self._context(tenant_id, decision_context_id)
+            missing = [k for k in pointer_keys if k not in m]
+            self.hits += len(pointer_keys) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            fetched = self.inner.get_active_many(tenant_id, decision_context_id, missing)
+            with self._lock:
+                m = self._context(tenant_id, decision_context_id)
+                for k in missing:
+                    m.setdefault(k, fetched.get(k))
+        with self._lock:
+            return {k: m[k] for k in pointer_keys if m.get(k) is not None}
+
+    def get_active(self, tenant_id: str, decision_context_id: str, pointer_key: str) -> Optional[ArtifactRef]:
+        return self.get_active_many(tenant_id, decision_context_id, [pointer_key]).get(pointer_key)
+
+    def set_active(self, tenant_id: str, decision_context_id: str, pointer_key: str, artifact_ref: ArtifactRef, updated_at: str) -> None:
+        if self._probe is None:
+            self.inner.set_active(tenant_id, decision_context_id, pointer_key, artifact_ref, updated_at)
+            with self._lock:
+                self._context(tenant_id, decision_context_id)[pointer_key] = artifact_ref
+            return
+        # in-process writes are serialized so each one can tell whether it is the only change since the last
+        with self._write_lock:
+            g = self.inner.set_active_versioned(tenant_id, decision_context_id, pointer_key, artifact_ref, updated_at)
+            with self._lock:
+                if g != self._generation + 1:
+                    self._maps.clear()  # someone else wrote in between
+                    self.invalidations += 1
+                self._generation = max(self._generation, g)
+                self._context(tenant_id, decision_context_id)[pointer_key] = artifact_ref
+
+    def list_active(self, tenant_id: str, decision_context_id: str, prefix: str | None = None) -> List[Tuple[str, ArtifactRef]]:
+        return self.inner.list_active(tenant_id, decision_context_id, prefix=prefix)
+
+    def close(self) -> None:
+        if self._probe is not None:
+            self._probe.close()
+
+    def invalidate(self, tenant_id: Optional[str] = None, decision_context_id: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant_id is None:
+                self._maps.clear()
+            else:
+                self._maps.pop((tenant_id, decision_context_id), None)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from concurrent.futures import Executor
 from typing import Optional
 
 from kimaru_core.identity.models import TenantRef, DecisionContextRef, SessionContext, EpochContext, RunContext, ActorRef, TraceContext, FederationContext
 from kimaru_core.artifacts.artifact_store import ArtifactStore
 from kimaru_core.artifacts.active_pointer_store import ActivePointerStore
+from kimaru_core.artifacts.delta.delta_log import DeltaLogStore
 from kimaru_core.decision_tracker.tracker import DecisionTracker
 from kimaru_core.agent_fabric.registry import AgentRegistry
 from kimaru_core.agent_fabric.policy_guard import PolicyGuard
@@ -12,6 +14,8 @@ from kimaru_core.governance.gateway import GovernanceGateway
 from kimaru_core.agent_fabric.observe import ObserveStream
 from kimaru_core.memory.agent_memory import AgentMemory
 from kimaru_core.algorithms.registry import AlgorithmRegistry
+from kimaru_core.algorithms.execution import AlgorithmExecutor
+from kimaru_core.algorithms.result_cache import AlgorithmResultCache
 
 @dataclass
 class CoreContext:
@@ -34,5 +38,14 @@ class CoreContext:
     observe: ObserveStream
     memory: AgentMemory
 
+    # runs independent KimaruScript steps concurrently; None keeps scripts sequential
+    step_executor: Optional[Executor] = None
+    # runs algorithm steps (e.g. ProcessPoolAlgorithmExecutor); None runs them inline
+    algorithm_executor: Optional[AlgorithmExecutor] = None
+    # memoizes deterministic algorithm results; None disables memoization
+    algorithm_cache: Optional[AlgorithmResultCache] = None
+    # hash-chained deltas over base artifacts (e.g. ddt_state); None when not configured
+    deltas: Optional[DeltaLogStore] = None
+
     allow_external: bool = False
     debug: bool = False
@@ -1,2 +1,4 @@
 from .tracker import DecisionTracker, SQLiteDecisionTracker
-from .models import TrackEvent
+from .write_behind import WriteBehindDecisionTracker
+from .partitioned import PartitionedDecisionTracker
+from .models import TrackEvent, EventQuery, EventPage, EventAggregate, SpanStats
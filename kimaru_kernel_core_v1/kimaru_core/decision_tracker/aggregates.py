@@ -0,0 +1,131 @@
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kimaru_core.decision_tracker import event_types as ET
+from kimaru_core.decision_tracker.models import TrackEvent, EventAggregate, SpanStats
+
+# Materialized event aggregates, maintained in the same transaction as the event insert.
+# Every event counts towards its run, epoch, zone and session; spans pair a start event
+# with its end event within a run (the end event's metadata.duration_ms wins when set,
+# otherwise the created_at difference is used).
+SCOPES = ("run", "epoch", "zone", "session")
+_SPAN_START = {ET.RUN_STARTED: "run", ET.AGENT_START: "agent"}
+_SPAN_END = {ET.RUN_ENDED: "run", ET.RUN_FAILED: "run", ET.AGENT_END: "agent", ET.AGENT_FAIL: "agent"}
+
+def create_tables(c) -> bool:
+    """Create the aggregate tables; True if they did not exist yet (callers then backfill)."""
+    fresh = c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='event_counts'").fetchone() is None
+    c.execute("""CREATE TABLE IF NOT EXISTS event_counts(
+        scope TEXT, scope_id TEXT, event_type TEXT, severity TEXT,
+        n INTEGER, first_at TEXT, last_at TEXT,
+        PRIMARY KEY(scope, scope_id, event_type, severity)
+    ) WITHOUT ROWID""")
+    c.execute("""CREATE TABLE IF NOT EXISTS event_durations(
+        scope TEXT, scope_id TEXT, span TEXT,
+        n INTEGER, total_ms REAL, max_ms REAL,
+        PRIMARY KEY(scope, scope_id, span)
+    ) WITHOUT ROWID""")
+    c.execute("""CREATE TABLE IF NOT EXISTS event_open_spans(
+        run_id TEXT, span TEXT, started_at TEXT,
+        PRIMARY KEY(run_id, span)
+    ) WITHOUT ROWID""")
+    # backfill progress of events stored before the tables existed: seq <= done_seq are folded in,
+    # upto_seq is the last pre-existing event (later inserts are applied as they are written)
+    c.execute("""CREATE TABLE IF NOT EXISTS event_aggregates_backfill(
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        done_seq INTEGER,
+        upto_seq INTEGER
+    )""")
+    return fresh
+
+def _span(event: TrackEvent, kind: str) -> str:
+    return "run" if kind == "run" else f"agent:{event.actor_id}"
+
+def _scope_ids(event: TrackEvent) -> List[Tuple[str, str]]:
+    return [("run", event.run_id), ("epoch", event.epoch_id), ("zone", event.zone_id), ("session", event.session_id)]
+
+def _ms_between(start: str, end: str) -> Optional[float]:
+    try:
+        a = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        b = datetime.fromisoformat(end.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return max(0.0, (b - a).total_seconds() * 1000.0)
+
+def apply(c, events: Iterable[TrackEvent]) -> None:
+    """Fold `events` (in append order) into the aggregate tables; call inside the insert transaction."""
+    counts: Dict[tuple, list] = {}
+    durations: Dict[tuple, list] = {}
+    opened: Dict[tuple, Optional[str]] = {}  # (run_id, span) -> started_at; None = closed in this batch
+    for e in events:
+        for scope, sid in _scope_ids(e):
+            k = (scope, sid, e.event_type, e.severity)
+            cur = counts.get(k)
+            if cur is None:
+                counts[k] = [1, e.created_at, e.created_at]
+            else:
+                cur[0] += 1
+                cur[1] = min(cur[1], e.created_at)
+                cur[2] = max(cur[2], e.created_at)
+        if e.event_type in _SPAN_START:
+            opened[(e.run_id, _span(e, _SPAN_START[e.event_type]))] = e.created_at
+        elif e.event_type in _SPAN_END:
+            key = (e.run_id, _span(e, _SPAN_END[e.event_type]))
+            if key in opened:
+                started = opened[key]
+            else:
+                row = c.execute("SELECT started_at FROM event_open_spans WHERE run_id=? AND span=?", key).fetchone()
+                started = row[0] if row else None
+            opened[key] = None
+            ms = e.metadata.get("duration_ms")
+            if not isinstance(ms, (int, float)) or isinstance(ms, bool):
+                ms = _ms_between(started, e.created_at) if started else None
+            if ms is None:
+                continue
+            for scope, sid in _scope_ids(e):
+                d = durations.setdefault((scope, sid, key[1]), [0, 0.0, 0.0])
+                d[0] += 1
+                d[1] += ms
+                d[2] = max(d[2], ms)
+    if counts:
+        c.executemany("""INSERT INTO event_counts(scope,scope_id,event_type,severity,n,first_at,last_at) VALUES(?,?,?,?,?,?,?)
+            ON CONFLICT(scope,scope_id,event_type,severity) DO UPDATE SET n=n+excluded.n,
+            first_at=min(first_at,excluded.first_at), last_at=max(last_at,excluded.last_at)""",
+            [(*k, *v) for k, v in counts.items()])
+    if durations:
+        c.executemany("""INSERT INTO event_durations(scope,scope_id,span,n,total_ms,max_ms) VALUES(?,?,?,?,?,?)
+            ON CONFLICT(scope,scope_id,span) DO UPDATE SET n=n+excluded.n,
+            total_ms=total_ms+excluded.total_ms, max_ms=max(max_ms,excluded.max_ms)""",
+            [(*k, *v) for k, v in durations.items()])
+    if opened:
+        c.executemany("INSERT OR REPLACE INTO event_open_spans(run_id,span,started_at) VALUES(?,?,?)",
+                      [(*k, v) for k, v in opened.items() if v is not None])
+        c.executemany("DELETE FROM event_open_spans WHERE run_id=? AND span=?", [k for k, v in opened.items() if v is None])
+
+def backfill_pending(c) -> int:
+    """Pre-existing events not yet folded into the aggregates (0 when complete)."""
+    row = c.execute("SELECT done_seq, upto_seq FROM event_aggregates_backfill WHERE id=1").fetchone()
+    return max(0, row[1] - row[0]) if row else 0
+
+def read(c, scope: str, scope_id: str) -> EventAggregate:
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown aggregate scope: {scope}. Supported: {list(SCOPES)}")
+    agg = EventAggregate(scope=scope, scope_id=scope_id)
+    by_type: Dict[str, int] = defaultdict(int)
+    by_sev: Dict[str, int] = defaultdict(int)
+    for event_type, severity, n, first_at, last_at in c.execute(
+            "SELECT event_type,severity,n,first_at,last_at FROM event_counts WHERE scope=? AND scope_id=?", (scope, scope_id)):
+        agg.total += n
+        by_type[event_type] += n
+        by_sev[severity] += n
+        agg.by_type_severity.setdefault(event_type, {})[severity] = n
+        agg.first_at = first_at if agg.first_at is None else min(agg.first_at, first_at)
+        agg.last_at = last_at if agg.last_at is None else max(agg.last_at, last_at)
+    agg.by_type, agg.by_severity = dict(by_type), dict(by_sev)
+    for span, n, total_ms, max_ms in c.execute(
+            "SELECT span,n,total_ms,max_ms FROM event_durations WHERE scope=? AND scope_id=?", (scope, scope_id)):
+        agg.durations[span] = SpanStats(count=n, total_ms=total_ms, max_ms=max_ms, avg_ms=total_ms / n if n else 0.0)
+    agg.complete = backfill_pending(c) == 0
+    return agg
@@ -4,10 +4,13 @@ EPOCH_CREATED="EPOCH_CREATED"
 RUN_STARTED="RUN_STARTED"
 RUN_ENDED="RUN_ENDED"
 RUN_FAILED="RUN_FAILED"
+RUN_SUMMARY="RUN_SUMMARY"
 AGENT_REGISTERED="AGENT_REGISTERED"
 AGENT_START="AGENT_START"
 AGENT_END="AGENT_END"
 AGENT_FAIL="AGENT_FAIL"
+ALGORITHM_SELECTED="ALGORITHM_SELECTED"
+ALGORITHM_FAILED="ALGORITHM_FAILED"
 POLICY_ALLOW="POLICY_ALLOW"
 POLICY_DENY="POLICY_DENY"
 ARTIFACT_STORED="ARTIFACT_STORED"
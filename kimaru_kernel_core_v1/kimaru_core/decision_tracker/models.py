@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from kimaru_core.utils.time import utc_now_iso
 
 class TrackEvent(BaseModel):
@@ -22,3 +22,43 @@ class TrackEvent(BaseModel):
     message: str = ""
     refs: Dict[str, Any] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class EventQuery(BaseModel):
+    """Filters for DecisionTracker.query_page; every set field must match (AND).
+    `since`/`until` bound created_at (ISO-8601, inclusive/exclusive)."""
+    session_id: Optional[str] = None
+    run_id: Optional[str] = None
+    epoch_id: Optional[str] = None
+    zone_id: Optional[str] = None
+    actor_type: Optional[str] = None
+    actor_id: Optional[str] = None
+    event_types: List[str] = Field(default_factory=list)
+    severities: List[str] = Field(default_factory=list)
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+class EventPage(BaseModel):
+    # events as dicts (projected if fields were given), each with its "seq"; pass next_cursor back for the next page
+    items: List[Dict[str, Any]] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+class SpanStats(BaseModel):
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    avg_ms: float = 0.0
+
+class EventAggregate(BaseModel):
+    """Pre-aggregated event counts for one run / epoch / zone / session.
+    `durations` is keyed by span: "run" (RUN_STARTED -> RUN_ENDED/RUN_FAILED) and
+    "agent:<agent_type_id>" (AGENT_START -> AGENT_END/AGENT_FAIL)."""
+    scope: Literal["run", "epoch", "zone", "session"]
+    scope_id: str
+    total: int = 0
+    by_type: Dict[str, int] = Field(default_factory=dict)
+    by_severity: Dict[str, int] = Field(default_factory=dict)
+    by_type_severity: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    first_at: Optional[str] = None
+    last_at: Optional[str] = None
+    durations: Dict[str, SpanStats] = Field(default_factory=dict)
+    complete: bool = True  # False while events stored before aggregation was enabled are still being backfilled
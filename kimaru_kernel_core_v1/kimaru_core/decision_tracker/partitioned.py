@@ -0,0 +1,364 @@
+from __future__ import annotations
+import gzip, os, shutil, sqlite3, tempfile, threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from kimaru_core.decision_tracker.models import TrackEvent, EventQuery, EventPage, EventAggregate
+from kimaru_core.decision_tracker import aggregates as _agg
+from kimaru_core.decision_tracker.tracker import DecisionTracker, SQLiteDecisionTracker, _EVENT_COLUMNS
+from kimaru_core.utils.hashing import sha256_bytes
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, SQLiteSettings
+
+# bucket -> (segment key format, seq span per segment); seq = int(key) * span + local seq
+_BUCKETS = {"day": ("%Y%m%d", 10 ** 10), "hour": ("%Y%m%d%H", 10 ** 8)}
+
+@dataclass
+class Segment:
+    key: str
+    state: str  # "live" | "archived" | "expired"
+    path: str
+    event_count: int = 0
+    min_created: Optional[str] = None
+    max_created: Optional[str] = None
+    archive_bytes: int = 0
+    checksum: Optional[str] = None
+
+class PartitionedDecisionTracker(DecisionTracker):
+    """DecisionTracker split into time-bucketed SQLite segments.
+
+    Events go to the segment of their arrival bucket (one file per day or hour),
+    so index maintenance only ever touches a small file and append latency does
+    not grow with history. Segment seqs are disjoint and increasing
+    (`int(key) * span + n`), so cursors from query_page stay valid across
+    segments. roll() archives each segment whose bucket ended more than
+    `seal_grace_s` ago: VACUUM INTO a compact copy, gzip it, record its sha256,
+    make it read-only and drop the live file; archives older than
+    `retention_days` are deleted. Queries fan out over live and archived segments
+    newest-first; an archive is checksum-verified and decompressed into a small
+    LRU cache on first read. A roller thread calls roll() every `roll_interval_s`
+    until close() (0 disables it). Aggregates live in the segment catalog, so they
+    span segment boundaries and outlive expired segments (`aggregates=False` skips them). import_legacy() adds a
+    pre-partitioning tracker.sqlite as the oldest archived segment, so switching
+    to partitions keeps its history queryable.
+    """
+
+    def __init__(self, base_dir: str, bucket: str = "day", retention_days: Optional[int] = None,
+                 seal_grace_s: int = 3600, roll_interval_s: int = 60, open_archives: int = 4,
+                 settings: Optional[SQLiteSettings] = None, clock: Optional[Callable[[], datetime]] = None,
+                 aggregates: bool = True):
+        if bucket not in _BUCKETS:
+            raise ValueError(f"Unknown tracker bucket: {bucket}. Supported: {list(_BUCKETS)}")
+        self.base_dir = Path(base_dir)
+        self.live_dir = self.base_dir / "live"
+        self.archive_dir = self.base_dir / "archive"
+        for d in (self.live_dir, self.archive_dir):
+            d.mkdir(parents=True, exist_ok=True)
+        # decompressed archive copies are private to this process
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="kimaru-tracker-"))
+        self.bucket = bucket
+        self.key_format, self.span = _BUCKETS[bucket]
+        self.retention_days = retention_days
+        self.seal_grace_s = seal_grace_s
+        self.roll_interval_s = roll_interval_s
+        self.open_archives = open_archives
+        self.settings = settings or SQLiteSettings()
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.with_aggregates = aggregates
+        self.catalog = SQLiteConnectionManager(self.settings)
+        self.catalog_path = str(self.base_dir / "segments.sqlite")
+        self._live: Dict[str, SQLiteDecisionTracker] = {}
+        self._archives: "OrderedDict[str, SQLiteDecisionTracker]" = OrderedDict()
+        # trackers swapped out by roll()/LRU eviction; closed and their files removed on the next roll(),
+        # so a query that picked one up just before the swap can still finish
+        self._retired: List[Tuple[Optional[SQLiteDecisionTracker], List[Path]]] = []
+        self._loads = 0
+        self._lock = threading.RLock()
+        self._roll_lock = threading.Lock()
+        self.roll_errors = 0
+        self._init()
+        self._stop = threading.Event()
+        self._roller: Optional[threading.Thread] = None
+        if roll_interval_s:
+            self._roller = threading.Thread(target=self._roll_loop, name="kimaru-tracker-roll", daemon=True)
+            self._roller.start()
+
+    def _conn(self):
+        return self.catalog.connect(self.catalog_path)
+
+    def _init(self):
+        with self._conn() as c:
+            c.execute("""CREATE TABLE IF NOT EXISTS segments(
+                segment_key TEXT PRIMARY KEY,
+                state TEXT,
+                path TEXT,
+                event_count INTEGER,
+                min_created TEXT,
+                max_created TEXT,
+                archive_bytes INTEGER,
+                checksum TEXT,
+                updated_at TEXT
+            )""")
+            _agg.create_tables(c)
+            c.commit()
+
+    # --- segments ------------------------------------------------------------
+
+    def _key(self, when: datetime) -> str:
+        return when.astimezone(timezone.utc).strftime(self.key_format)
+
+    def segments(self) -> List[Segment]:
+        with self._conn() as c:
+            rows = c.execute("SELECT segment_key,state,path,event_count,min_created,max_created,archive_bytes,checksum "
+                             "FROM segments ORDER BY segment_key").fetchall()
+        return [Segment(*r) for r in rows]
+
+    def _live_tracker(self, key: str) -> SQLiteDecisionTracker:
+        t = self._live.get(key)
+        if t is not None:
+            return t
+        with self._lock:
+            t = self._live.get(key)
+            if t is None:
+                path = str(self.live_dir / f"events-{key}.sqlite")
+                t = SQLiteDecisionTracker(path, SQLiteConnectionManager(self.settings), seq_base=int(key) * self.span,
+                                          aggregates=False)
+                with self._conn() as c:
+                    c.execute("INSERT OR IGNORE INTO segments(segment_key,state,path,event_count,archive_bytes,updated_at) "
+                              "VALUES(?,?,?,0,0,?)", (key, "live", path, self.clock().isoformat()))
+                self._live[key] = t
+            return t
+
+    def _archive_tracker(self, seg: Segment) -> SQLiteDecisionTracker:
+        with self._lock:
+            t = self._archives.get(seg.key)
+            if t is not None:
+                self._archives.move_to_end(seg.key)
+                return t
+            raw = Path(seg.path).read_bytes()
+            if sha256_bytes(raw) != seg.checksum:
+                raise ValueError(f"Tracker archive {seg.key} failed its checksum")
+            # a fresh name per load: an evicted copy of this segment may still be open until it is reaped
+            self._loads += 1
+            copy = self.cache_dir / f"events-{seg.key}-{self._loads}.sqlite"
+            copy.write_bytes(gzip.decompress(raw))
+            t = SQLiteDecisionTracker(str(copy), SQLiteConnectionManager(self.settings), seq_base=int(seg.key) * self.span,
+                                      aggregates=False)
+            self._archives[seg.key] = t
+            while len(self._archives) > self.open_archives:
+                k, old = self._archives.popitem(last=False)
+                self._retired.append((old, _db_files(old.db_path)))
+            return t
+
+    def _segment(self, key: str) -> Optional[Segment]:
+        with self._conn() as c:
+            row = c.execute("SELECT segment_key,state,path,event_count,min_created,max_created,archive_bytes,checksum "
+                            "FROM segments WHERE segment_key=?", (key,)).fetchone()
+        return Segment(*row) if row else None
+
+    def _tracker(self, seg: Segment) -> SQLiteDecisionTracker:
+        if seg.state == "live":
+            with self._lock:
+                t = self._live.get(seg.key)
+            if t is not None:
+                return t
+            # not open: it may have been archived since `seg` was listed; never recreate a sealed segment's file
+            seg = self._segment(seg.key) or seg
+            if seg.state == "live":
+                return self._live_tracker(seg.key)
+        return self._archive_tracker(seg)
+
+    # --- writes --------------------------------------------------------------
+
+    def append(self, event: TrackEvent) -> None:
+        self._live_tracker(self._key(self.clock())).append(event)
+        self._aggregate([event])
+
+    def append_many(self, events: List[TrackEvent]) -> None:
+        self._live_tracker(self._key(self.clock())).append_many(events)
+        self._aggregate(events)
+
+    def _aggregate(self, events: List[TrackEvent]) -> None:
+        # a separate catalog transaction after the segment commit (not atomic across the two files)
+        if not self.with_aggregates:
+            return
+        with self._conn() as c:
+            c.execute("BEGIN IMMEDIATE")  # open-span reads and the upserts must not interleave with another writer
+            _agg.apply(c, events)
+            c.commit()
+
+    def _roll_loop(self) -> None:
+        while not self._stop.wait(self.roll_interval_s):
+            try:
+                self.roll()
+            except Exception:
+                self.roll_errors += 1  # e.g. database busy; retried on the next tick
+
+    def roll(self) -> List[str]:
+        """Archive sealed live segments and expire old archives; returns the archived segment keys."""
+        if not self._roll_lock.acquire(blocking=False):
+            return []
+        try:
+            self._reap()
+            now = self.clock()
+            sealed_before = self._key(now - timedelta(seconds=self.seal_grace_s))
+            archived = []
+            for seg in self.segments():
+                if seg.state == "live" and seg.key < sealed_before:
+                    self._archive(seg)
+                    archived.append(seg.key)
+            if self.retention_days is not None:
+                expire_before = self._key(now - timedelta(days=self.retention_days))
+                for seg in self.segments():
+                    if seg.state == "archived" and seg.key < expire_before:
+                        self._expire(seg)
+            return archived
+        finally:
+            self._roll_lock.release()
+
+    def _reap(self) -> None:
+        with self._lock:
+            retired, self._retired = self._retired, []
+        for t, paths in retired:
+            if t is not None:
+                t.connections.close_all()
+            for p in paths:
+                p.unlink(missing_ok=True)
+
+    def _archive(self, seg: Segment, remove_source: bool = True) -> None:
+        # sealed segments receive no more appends; the copy is taken while readers may still use the live file
+        tmp = self.archive_dir / f"events-{seg.key}.sqlite.tmp"
+        tmp.unlink(missing_ok=True)
+        src = sqlite3.connect(seg.path)
+        try:
+            count, min_c, max_c = src.execute("SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM events").fetchone()
+            src.execute("VACUUM INTO ?", (str(tmp),))
+        finally:
+            src.close()
+        c = sqlite3.connect(str(tmp))
+        c.execute("PRAGMA journal_mode=DELETE")
+        c.close()
+        raw = gzip.compress(tmp.read_bytes(), compresslevel=6)
+        tmp.unlink()
+        path = self.archive_dir / f"events-{seg.key}.sqlite.gz"
+        if path.exists():
+            os.chmod(path, 0o644)
+        path.write_bytes(raw)
+        os.chmod(path, 0o444)
+        with self._conn() as cat:
+            cat.execute("UPDATE segments SET state='archived', path=?, event_count=?, min_created=?, max_created=?, "
+                        "archive_bytes=?, checksum=?, updated_at=? WHERE segment_key=?",
+                        (str(path), count, min_c, max_c, len(raw), sha256_bytes(raw), self.clock().isoformat(), seg.key))
+        with self._lock:
+            live = self._live.pop(seg.key, None)
+            files = _db_files(seg.path) if remove_source else []
+            self._retired.append((live, files))
+
+    def _expire(self, seg: Segment) -> None:
+        with self._lock:
+            t = self._archives.pop(seg.key, None)
+            if t is not None:
+                self._retired.append((t, _db_files(t.db_path)))
+        with self._conn() as c:
+            c.execute("UPDATE segments SET state='expired', updated_at=? WHERE segment_key=?", (self.clock().isoformat(), seg.key))
+        p = Path(seg.path)
+        if p.exists():
+            os.chmod(p, 0o644)
+            p.unlink()
+
+    # --- reads ---------------------------------------------------------------
+
+    def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]:
+        page = self.query_page(EventQuery(session_id=session_id, event_types=[event_type] if event_type else []), limit=limit)
+        return [TrackEvent(**{k: v for k, v in item.items() if k != "seq"}) for item in page.items]
+
+    def query_page(self, query: EventQuery, limit: int = 200, cursor: Optional[str] = None,
+                   fields: Optional[List[str]] = None, order: str = "desc") -> EventPage:
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Invalid order: {order}")
+        try:
+            after = int(cursor) if cursor else None
+        except ValueError:
+            raise ValueError(f"Invalid event cursor: {cursor}")
+        segs = [s for s in self.segments() if s.state != "expired"]
+        if order == "desc":
+            segs.reverse()
+        items: List[dict] = []
+        more = False
+        for i, seg in enumerate(segs):
+            base = int(seg.key) * self.span
+            if after is not None and base and (base >= after if order == "desc" else base + self.span <= after):
+                continue  # wholly on the already-returned side of the cursor
+            if seg.state == "archived" and not _overlaps(seg, query):
+                continue
+            page = self._tracker(seg).query_page(query, limit=limit - len(items), cursor=cursor, fields=fields, order=order)
+            items.extend(page.items)
+            if len(items) >= limit:
+                more = page.next_cursor is not None or i < len(segs) - 1
+                break
+        next_cursor = str(items[-1]["seq"]) if more and items else None
+        return EventPage(items=items, next_cursor=next_cursor)
+
+    def aggregates(self, scope: str, scope_id: str) -> EventAggregate:
+        if not self.with_aggregates:
+            raise ValueError("Aggregates are not maintained by this tracker")
+        with self._conn() as c:
+            return _agg.read(c, scope, scope_id)
+
+    def import_legacy(self, path: str) -> Optional[str]:
+        """Archive a single-file tracker database as the oldest segment (key all zeros, so its seqs
+        sort before every partition's) and fold its events into the aggregates. The source is renamed
+        to `<path>.imported`. Returns the segment key, or None if a legacy segment already exists."""
+        key = "0" * len(self._key(self.clock()))
+        if self._segment(key) is not None:
+            return None
+        # opening it migrates pre-seq schemas
+        legacy = SQLiteDecisionTracker(path, SQLiteConnectionManager(self.settings), aggregates=False)
+        legacy.connections.close_all()
+        with self._conn() as c:
+            c.execute("INSERT INTO segments(segment_key,state,path,event_count,archive_bytes,updated_at) VALUES(?,?,?,0,0,?)",
+                      (key, "live", path, self.clock().isoformat()))
+            c.commit()
+        self._archive(Segment(key=key, state="live", path=path), remove_source=False)
+        src = sqlite3.connect(path)
+        try:
+            rows = src.execute(f"SELECT {_EVENT_COLUMNS} FROM events ORDER BY seq")
+            while True:
+                batch = rows.fetchmany(5000)
+                if not batch:
+                    break
+                self._aggregate([SQLiteDecisionTracker._event(r) for r in batch])
+        finally:
+            src.close()
+        os.replace(path, path + ".imported")
+        for suffix in ("-wal", "-shm"):
+            Path(path + suffix).unlink(missing_ok=True)
+        return key
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._roller is not None and self._roller is not threading.current_thread():
+            self._roller.join()
+        with self._lock:
+            trackers = list(self._live.values()) + list(self._archives.values())
+            self._live.clear()
+            self._archives.clear()
+        for t in trackers:
+            t.connections.close_all()
+        self._reap()
+        self.catalog.close_all()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+def _db_files(path: str) -> List[Path]:
+    return [Path(path + suffix) for suffix in ("", "-wal", "-shm")]
+
+def _overlaps(seg: Segment, query: EventQuery) -> bool:
+    if seg.event_count == 0:
+        return False
+    if query.since is not None and seg.max_created is not None and seg.max_created < query.since:
+        return False
+    if query.until is not None and seg.min_created is not None and seg.min_created >= query.until:
+        return False
+    return True
@@ -1,27 +1,78 @@
 from __future__ import annotations
-import sqlite3, json
+import json, threading
 from typing import List, Optional, Dict, Any
-from kimaru_core.decision_tracker.models import TrackEvent
+from kimaru_core.decision_tracker.models import TrackEvent, EventQuery, EventPage, EventAggregate
+from kimaru_core.decision_tracker import aggregates as _agg
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
 
 class QuerySpec(dict):
     pass
 
 class DecisionTracker:
     def append(self, event: TrackEvent) -> None: ...
+    def append_many(self, events: List[TrackEvent]) -> None:
+        for e in events:
+            self.append(e)
+    def flush(self) -> None:
+        # durability barrier; synchronous trackers are always durable
+        return None
     def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]: ...
+    def query_page(self, query: EventQuery, limit: int = 200, cursor: Optional[str] = None,
+                   fields: Optional[List[str]] = None, order: str = "desc") -> EventPage: ...
+    def aggregates(self, scope: str, scope_id: str) -> EventAggregate: ...
+
+# TrackEvent field -> events column (plus the sequence column itself)
+_COLUMNS = {f: f for f in TrackEvent.model_fields}
+_COLUMNS.update({"refs": "refs_json", "metadata": "metadata_json", "seq": "seq"})
+_INSERT = ("INSERT INTO events(event_id,created_at,tenant_id,decision_context_id,session_id,epoch_id,run_id,zone_id,"
+           "actor_type,actor_id,actor_display_name,event_type,severity,message,refs_json,metadata_json) "
+           "VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)")
+_EVENT_COLUMNS = "event_id,created_at,tenant_id,decision_context_id,session_id,epoch_id,run_id,zone_id,actor_type,actor_id,actor_display_name,event_type,severity,message,refs_json,metadata_json"
 
 class SQLiteDecisionTracker(DecisionTracker):
-    def __init__(self, db_path: str):
+    """Events in one SQLite table ordered by a monotonic `seq` (insertion order).
+
+    Each equality filter of EventQuery has a (<column>, seq) index, so a keyset
+    page (`seq < cursor ORDER BY seq DESC LIMIT n`) is one index seek whatever the
+    depth. The run index also carries event_type/severity/created_at/zone_id, so
+    run timelines projected to those fields never touch the table.
+    Per run/epoch/zone/session counts and span durations are materialized in the
+    same transaction as each insert (see aggregates.py), so aggregates() never
+    scans events; `aggregates=False` skips that write cost. Events stored before
+    aggregation was enabled are folded in by backfill_aggregates() in chunks of
+    `backfill_chunk` events, each its own short transaction, on a background
+    thread unless `backfill_in_background` is False; until it finishes,
+    aggregates() reports `complete=False`.
+    """
+    def __init__(self, db_path: str, connections: Optional[SQLiteConnectionManager] = None, seq_base: int = 0,
+                 aggregates: bool = True, backfill_chunk: int = 5000, backfill_in_background: bool = True):
         self.db_path = db_path
+        self.connections = connections or default_connection_manager()
+        self.seq_base = seq_base  # first seq is seq_base + 1 (partition segments use disjoint ranges)
+        self.with_aggregates = aggregates  # False when the owner (PartitionedDecisionTracker) aggregates itself
+        self.backfill_chunk = backfill_chunk
+        self.backfill_errors = 0
+        self.last_backfill_error: Optional[str] = None
+        self._backfill: Optional[threading.Thread] = None
         self._init()
+        if self.with_aggregates and self.aggregates_pending():
+            if backfill_in_background:
+                self._backfill = threading.Thread(target=self._backfill_loop, name="kimaru-tracker-backfill", daemon=True)
+                self._backfill.start()
+            else:
+                self.backfill_aggregates()
 
     def _conn(self):
-        return sqlite3.connect(self.db_path)
+        return self.connections.connect(self.db_path)
 
     def _init(self):
         with self._conn() as c:
+            cols = [r[1] for r in c.execute("PRAGMA table_info(events)").fetchall()]
+            if cols and "seq" not in cols:
+                self._migrate_seq(c)
             c.execute("""CREATE TABLE IF NOT EXISTS events(
-                event_id TEXT PRIMARY KEY,
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id TEXT UNIQUE,
                 created_at TEXT,
                 tenant_id TEXT,
                 decision_context_id TEXT,
@@ -38,40 +89,171 @@ class SQLiteDecisionTracker(DecisionTracker):
                 refs_json TEXT,
                 metadata_json TEXT
             )""")
-            c.execute("CREATE INDEX IF NOT EXISTS idx_events_session ON events(session_id, created_at)")
-            c.execute("CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type, created_at)")
+            c.execute("DROP INDEX IF EXISTS idx_events_session")
+            c.execute("DROP INDEX IF EXISTS idx_events_type")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_session_seq ON events(session_id, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_run_seq ON events(run_id, seq, event_type, severity, created_at, zone_id)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_epoch_seq ON events(epoch_id, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_zone_seq ON events(zone_id, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_actor_seq ON events(actor_id, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_type_seq ON events(event_type, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_events_created ON events(created_at)")
+            if self.seq_base and c.execute("SELECT 1 FROM sqlite_sequence WHERE name='events'").fetchone() is None:
+                c.execute("INSERT INTO sqlite_sequence(name, seq) VALUES('events', ?)", (self.seq_base,))
+            if self.with_aggregates and _agg.create_tables(c):
+                # first open with aggregates: events stored so far are backfilled in chunks after boot
+                upto = c.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+                c.execute("INSERT OR REPLACE INTO event_aggregates_backfill(id, done_seq, upto_seq) VALUES(1, ?, ?)",
+                          (min(upto, self.seq_base), upto))
             c.commit()
 
+    def aggregates_pending(self) -> int:
+        """Pre-existing events (seq range) not yet folded into the aggregates."""
+        with self._conn() as c:
+            return _agg.backfill_pending(c)
+
+    def backfill_aggregates(self, max_chunks: Optional[int] = None) -> int:
+        """Fold up to `max_chunks` chunks of pre-existing events into the aggregates; returns what is left."""
+        n = 0
+        while max_chunks is None or n < max_chunks:
+            with self._conn() as c:
+                c.execute("BEGIN IMMEDIATE")  # serialize with appends: open-span reads and upserts must not interleave
+                row = c.execute("SELECT done_seq, upto_seq FROM event_aggregates_backfill WHERE id=1").fetchone()
+                if row is None or row[0] >= row[1]:
+                    c.rollback()
+                    return 0
+                end = min(row[0] + self.backfill_chunk, row[1])
+                rows = c.execute(f"SELECT {_EVENT_COLUMNS} FROM events WHERE seq > ? AND seq <= ? ORDER BY seq",
+                                 (row[0], end)).fetchall()
+                _agg.apply(c, [self._event(r) for r in rows])
+                c.execute("UPDATE event_aggregates_backfill SET done_seq=? WHERE id=1", (end,))
+                c.commit()
+            n += 1
+        return self.aggregates_pending()
+
+    def _backfill_loop(self) -> None:
+        try:
+            self.backfill_aggregates()
+        except Exception as e:
+            # progress is committed per chunk; the next open resumes where this stopped
+            self.backfill_errors += 1
+            self.last_backfill_error = repr(e)
+
+    @staticmethod
+    def _migrate_seq(c) -> None:
+        # one-off migration: tables written before `seq` existed are rebuilt in their insertion (rowid) order
+        c.execute("ALTER TABLE events RENAME TO events_pre_seq")
+        c.execute("""CREATE TABLE events(
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT UNIQUE,
+            created_at TEXT, tenant_id TEXT, decision_context_id TEXT, session_id TEXT, epoch_id TEXT, run_id TEXT, zone_id TEXT,
+            actor_type TEXT, actor_id TEXT, actor_display_name TEXT, event_type TEXT, severity TEXT, message TEXT,
+            refs_json TEXT, metadata_json TEXT
+        )""")
+        c.execute(f"INSERT INTO events({_EVENT_COLUMNS}) SELECT {_EVENT_COLUMNS} FROM events_pre_seq ORDER BY rowid")
+        c.execute("DROP TABLE events_pre_seq")
+
+    @staticmethod
+    def _event(r) -> TrackEvent:
+        return TrackEvent(
+            event_id=r[0], created_at=r[1],
+            tenant_id=r[2], decision_context_id=r[3], session_id=r[4], epoch_id=r[5], run_id=r[6], zone_id=r[7],
+            actor_type=r[8], actor_id=r[9], actor_display_name=r[10],
+            event_type=r[11], severity=r[12], message=r[13],
+            refs=json.loads(r[14]) if r[14] else {},
+            metadata=json.loads(r[15]) if r[15] else {},
+        )
+
+    @staticmethod
+    def _row(event: TrackEvent) -> tuple:
+        return (
+            event.event_id, event.created_at,
+            event.tenant_id, event.decision_context_id, event.session_id, event.epoch_id, event.run_id, event.zone_id,
+            event.actor_type, event.actor_id, event.actor_display_name,
+            event.event_type, event.severity, event.message,
+            json.dumps(event.refs, ensure_ascii=False),
+            json.dumps(event.metadata, ensure_ascii=False),
+        )
+
     def append(self, event: TrackEvent) -> None:
         with self._conn() as c:
-            c.execute("""INSERT INTO events VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", (
-                event.event_id, event.created_at,
-                event.tenant_id, event.decision_context_id, event.session_id, event.epoch_id, event.run_id, event.zone_id,
-                event.actor_type, event.actor_id, event.actor_display_name,
-                event.event_type, event.severity, event.message,
-                json.dumps(event.refs, ensure_ascii=False),
-                json.dumps(event.metadata, ensure_ascii=False),
-            ))
+            c.execute(_INSERT, self._row(event))
+            if self.with_aggregates:
+                _agg.apply(c, [event])
+            c.commit()
+
+    def append_many(self, events: List[TrackEvent]) -> None:
+        # group commit: one transaction (one fsync) for the whole batch
+        with self._conn() as c:
+            c.executemany(_INSERT, [self._row(e) for e in events])
+            if self.with_aggregates:
+                _agg.apply(c, events)
             c.commit()
 
     def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]:
-        q = "SELECT * FROM events WHERE session_id=?"
+        q = f"SELECT {_EVENT_COLUMNS} FROM events WHERE session_id=?"
         params = [session_id]
         if event_type:
             q += " AND event_type=?"
             params.append(event_type)
-        q += " ORDER BY created_at DESC LIMIT ?"
+        q += " ORDER BY seq DESC LIMIT ?"
         params.append(limit)
         with self._conn() as c:
             rows = c.execute(q, params).fetchall()
-        events = []
-        for r in rows:
-            events.append(TrackEvent(
-                event_id=r[0], created_at=r[1],
-                tenant_id=r[2], decision_context_id=r[3], session_id=r[4], epoch_id=r[5], run_id=r[6], zone_id=r[7],
-                actor_type=r[8], actor_id=r[9], actor_display_name=r[10],
-                event_type=r[11], severity=r[12], message=r[13],
-                refs=json.loads(r[14]) if r[14] else {},
-                metadata=json.loads(r[15]) if r[15] else {},
-            ))
-        return events
+        return [self._event(r) for r in rows]
+
+    def aggregates(self, scope: str, scope_id: str) -> EventAggregate:
+        """Materialized counts (by type/severity) and span durations for one run, epoch, zone or session."""
+        if not self.with_aggregates:
+            raise ValueError("Aggregates are not maintained by this tracker")
+        with self._conn() as c:
+            return _agg.read(c, scope, scope_id)
+
+    def query_page(self, query: EventQuery, limit: int = 200, cursor: Optional[str] = None,
+                   fields: Optional[List[str]] = None, order: str = "desc") -> EventPage:
+        """Keyset page of events matching `query`, newest first (`order="asc"`: oldest first).
+        `fields` projects each item to those TrackEvent fields; "seq" is always included."""
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Invalid order: {order}")
+        names = ["seq"] + [f for f in (fields or list(TrackEvent.model_fields)) if f != "seq"]
+        unknown = [f for f in names if f not in _COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown event fields: {unknown}")
+        where, params = [], []
+        for col in ("session_id", "run_id", "epoch_id", "zone_id", "actor_type", "actor_id"):
+            val = getattr(query, col)
+            if val is not None:
+                where.append(f"{col}=?")
+                params.append(val)
+        for col, vals in (("event_type", query.event_types), ("severity", query.severities)):
+            if vals:
+                where.append(f"{col} IN ({','.join('?' * len(vals))})")
+                params.extend(vals)
+        if query.since is not None:
+            where.append("created_at>=?")
+            params.append(query.since)
+        if query.until is not None:
+            where.append("created_at<?")
+            params.append(query.until)
+        if cursor:
+            try:
+                params.append(int(cursor))
+            except ValueError:
+                raise ValueError(f"Invalid event cursor: {cursor}")
+            where.append("seq<?" if order == "desc" else "seq>?")
+        q = f"SELECT {','.join(_COLUMNS[f] for f in names)} FROM events"
+        if where:
+            q += " WHERE " + " AND ".join(where)
+        q += f" ORDER BY seq {order.upper()} LIMIT ?"
+        params.append(limit + 1)
+        with self._conn() as c:
+            rows = c.execute(q, params).fetchall()
+        items = []
+        for r in rows[:limit]:
+            item = dict(zip(names, r))
+            for f in ("refs", "metadata"):
+                if f in item:
+                    item[f] = json.loads(item[f]) if item[f] else {}
+            items.append(item)
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit and limit > 0 else None
+        return EventPage(items=items, next_cursor=next_cursor)
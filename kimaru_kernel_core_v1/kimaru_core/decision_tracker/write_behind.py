@@ -0,0 +1,187 @@
+from __future__ import annotations
+import atexit, queue, threading, time, weakref
+from dataclasses import dataclass
+from typing import List, Optional
+from kimaru_core.decision_tracker.models import TrackEvent, EventQuery, EventPage, EventAggregate
+from kimaru_core.decision_tracker.tracker import DecisionTracker
+
+_STOP = object()
+_live: "weakref.WeakSet[WriteBehindDecisionTracker]" = weakref.WeakSet()
+
+@atexit.register
+def _close_live() -> None:
+    # one hook for all instances, so registering does not keep closed trackers alive
+    for t in list(_live):
+        t.close()
+
+@dataclass
+class _FailedBatch:
+    first: int  # ordinal of its first event (events are numbered in append order)
+    events: List[TrackEvent]
+    error: BaseException
+    attempts: int = 1
+
+class WriteBehindDecisionTracker(DecisionTracker):
+    """Buffers TrackEvents in a bounded queue and group-commits them from a writer thread.
+
+    A batch is written when it reaches `batch_size`, when its oldest event has waited
+    `max_latency_ms`, or when flush() is called. append() blocks once `max_queue`
+    events are pending (backpressure rather than unbounded memory).
+    flush() is the durability barrier: it returns once every event appended before
+    the call is committed. A batch that still fails after `retries` quick attempts is
+    split so its good events commit; the failing events are kept and retried before
+    later batches and on every flush, and each flush that covers them raises. Events
+    still failing after `max_attempts` rounds are abandoned (`abandoned_events`) and
+    reported by the next flush. close() drains the queue and closes the inner tracker.
+    """
+
+    def __init__(self, inner: DecisionTracker, batch_size: int = 256, max_latency_ms: int = 50, max_queue: int = 10000,
+                 retries: int = 2, max_attempts: int = 10):
+        self.inner = inner
+        self.batch_size = batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.retries = retries
+        self.max_attempts = max_attempts
+        self.abandoned_events = 0
+        self._q: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._cond = threading.Condition()
+        self._enq_lock = threading.Lock()  # ordinals follow queue order; the writer never takes this lock
+        self._enqueued = 0
+        self._failed: List[_FailedBatch] = []
+        self._abandoned: List[_FailedBatch] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="kimaru-tracker-writer", daemon=True)
+        self._thread.start()
+        _live.add(self)
+
+    def append(self, event: TrackEvent) -> None:
+        with self._enq_lock:
+            if not self._closed:
+                self._q.put((self._enqueued, event))
+                self._enqueued += 1
+                return
+        self.inner.append(event)
+
+    def append_many(self, events: List[TrackEvent]) -> None:
+        for e in events:
+            self.append(e)
+
+    def flush(self) -> None:
+        with self._enq_lock:
+            target = self._enqueued
+            done = None
+            if not self._closed:
+                done = threading.Event()
+                self._q.put(done)
+        if done is not None:
+            done.wait()
+        else:
+            self._retry_failed()
+        with self._cond:
+            failed = [f for f in self._failed if f.first < target] + self._abandoned
+            self._abandoned = []
+        if failed:
+            n = sum(len(f.events) for f in failed)
+            raise RuntimeError(f"DecisionTracker write-behind: {n} events not committed: {failed[0].error}") from failed[0].error
+
+    def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]:
+        # read-your-writes for callers that just appended
+        self.flush()
+        return self.inner.query(session_id, limit=limit, event_type=event_type)
+
+    def query_page(self, query: EventQuery, limit: int = 200, cursor: Optional[str] = None,
+                   fields: Optional[List[str]] = None, order: str = "desc") -> EventPage:
+        self.flush()
+        return self.inner.query_page(query, limit=limit, cursor=cursor, fields=fields, order=order)
+
+    def aggregates(self, scope: str, scope_id: str) -> EventAggregate:
+        self.flush()
+        return self.inner.aggregates(scope, scope_id)
+
+    def close(self) -> None:
+        with self._enq_lock:
+            if self._closed:
+                return
+            # from here on append() writes through, so nothing can land behind the stop marker
+            self._closed = True
+            self._q.put(_STOP)
+        self._thread.join()
+        _live.discard(self)
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            if item is _STOP:
+                return
+            if isinstance(item, threading.Event):
+                self._retry_failed()
+                item.set()
+                continue
+            first, e = item
+            batch = [e]
+            marker = None
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if not isinstance(item, tuple):
+                    marker = item  # flush or stop: write what we have first
+                    break
+                batch.append(item[1])
+            self._retry_failed()
+            self._write(first, batch)
+            if marker is _STOP:
+                return
+            if marker is not None:
+                self._retry_failed()
+                marker.set()
+
+    def _write(self, first: int, batch: List[TrackEvent]) -> None:
+        error: Optional[BaseException] = None
+        for attempt in range(self.retries + 1):
+            try:
+                self.inner.append_many(batch)
+                return
+            except Exception as e:
+                # audit writes must never crash the writer; transient errors (busy db) get a short backoff
+                error = e
+                if attempt < self.retries:
+                    time.sleep(0.05 * (2 ** attempt))
+        if len(batch) == 1:
+            failed = [_FailedBatch(first=first, events=batch, error=error)]
+        else:
+            # isolate the events that cannot be written so the rest of the batch commits
+            failed = []
+            for i, e in enumerate(batch):
+                try:
+                    self.inner.append(e)
+                except Exception as err:
+                    failed.append(_FailedBatch(first=first + i, events=[e], error=err))
+        if failed:
+            with self._cond:
+                self._failed.extend(failed)
+
+    def _retry_failed(self) -> None:
+        with self._cond:
+            pending, self._failed = self._failed, []
+        still, abandoned = [], []
+        for f in pending:
+            try:
+                self.inner.append_many(f.events)
+            except Exception as e:
+                f.error = e
+                f.attempts += 1
+                (abandoned if f.attempts >= self.max_attempts else still).append(f)
+        if still or abandoned:
+            with self._cond:
+                self._failed = still + self._failed
+                self._abandoned.extend(abandoned)
+                self.abandoned_events += sum(len(f.events) for f in abandoned)
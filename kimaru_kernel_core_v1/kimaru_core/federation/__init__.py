@@ -0,0 +1,2 @@
+from .frames import ReplicationFrame, encode_frame, decode_frame
+from .replication import ReplicationEngine, ReplicationReceiver, ReplicationPeer, LocalPeer, SQLiteReplicationMarkStore
@@ -0,0 +1,38 @@
+from __future__ import annotations
+import zlib
+from typing import Any, Dict, List, Literal
+from pydantic import BaseModel, Field
+
+from kimaru_core.utils.hashing import canonical_json_dumps, sha256_bytes
+
+# Wire layout: MAGIC | sha256 hex of the compressed body (64 bytes) | zlib(canonical JSON of the frame)
+MAGIC = b"KRF1"
+
+class ReplicationFrame(BaseModel):
+    """One batch of a replication stream.
+
+    `records` are {"ref", "envelope"} for the artifacts stream and {"hash", "delta"}
+    for the deltas stream; `first_seq`..`last_seq` is their range in the sender's
+    change feed, and `last_seq` becomes the peer's high-water mark once acked.
+    """
+    frame_id: str
+    source_node: str
+    stream: Literal["artifacts", "deltas"]
+    first_seq: int
+    last_seq: int
+    records: List[Dict[str, Any]] = Field(default_factory=list)
+
+def encode_frame(frame: ReplicationFrame, level: int = 6) -> bytes:
+    body = zlib.compress(canonical_json_dumps(frame.model_dump(mode="json")).encode("utf-8"), level)
+    return MAGIC + sha256_bytes(body).encode("ascii") + body
+
+def decode_frame(raw: bytes) -> ReplicationFrame:
+    if raw[:4] != MAGIC:
+        raise ValueError("Not a replication frame")
+    digest, body = raw[4:68].decode("ascii", "replace"), raw[68:]
+    if sha256_bytes(body) != digest:
+        raise ValueError("Replication frame checksum mismatch")
+    try:
+        return ReplicationFrame.model_validate_json(zlib.decompress(body))
+    except zlib.error as e:
+        raise ValueError(f"Corrupt replication frame: {e}") from e
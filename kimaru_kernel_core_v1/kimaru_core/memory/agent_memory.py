@@ -1,6 +1,14 @@
 from __future__ import annotations
-import sqlite3, json
-from typing import Any, Optional, Dict, List
+import atexit, json, threading, time, weakref
+from typing import Any, Callable, Optional, Dict, List
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
+
+_sweeping: "weakref.WeakSet[SQLiteAgentMemory]" = weakref.WeakSet()
+
+@atexit.register
+def _stop_sweepers() -> None:
+    for m in list(_sweeping):
+        m.close()
 
 class AgentMemory:
     def read(self, namespace: str, key: str) -> Optional[Any]: ...
@@ -8,23 +16,61 @@ class AgentMemory:
     def append_log(self, namespace: str, record: Dict[str, Any]) -> None: ...
 
 class SQLiteAgentMemory(AgentMemory):
-    def __init__(self, db_path: str):
+    """KV + log memory in SQLite.
+
+    A write with `ttl` (seconds) stores an absolute `expires_at` (unix time, partially
+    indexed); reads treat an expired key as a miss. Expired rows are deleted by sweep()
+    in batches of `sweep_batch` rows, each its own short transaction, at most
+    `sweep_max_batches` per call, so the write lock is never held for long. With
+    `sweep_interval_s` a daemon thread calls sweep() on that interval until close().
+    """
+
+    def __init__(self, db_path: str, connections: Optional[SQLiteConnectionManager] = None,
+                 sweep_interval_s: Optional[float] = None, sweep_batch: int = 1000, sweep_max_batches: int = 50,
+                 clock: Optional[Callable[[], float]] = None):
         self.db_path = db_path
+        self.connections = connections or default_connection_manager()
+        self.sweep_batch = sweep_batch
+        self.sweep_max_batches = sweep_max_batches
+        self.clock = clock or time.time
+        self._lock = threading.Lock()
+        self.keys_expired = 0   # rows deleted by sweep()
+        self.expired_reads = 0  # reads that found an expired, not yet swept key
+        self.sweeps = 0
+        self.last_sweep_ms = 0.0
+        self.sweep_errors = 0
+        self.consecutive_sweep_errors = 0  # >0 while the background sweeper keeps failing
+        self.last_sweep_error: Optional[str] = None
         self._init()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval_s:
+            self._sweeper = threading.Thread(target=self._sweep_loop, args=(sweep_interval_s,),
+                                             name="kimaru-memory-sweeper", daemon=True)
+            self._sweeper.start()
+            _sweeping.add(self)
 
     def _conn(self):
-        return sqlite3.connect(self.db_path)
+        return self.connections.connect(self.db_path)
 
     def _init(self):
         with self._conn() as c:
+            cols = [r[1] for r in c.execute("PRAGMA table_info(kv)").fetchall()]
             c.execute("""CREATE TABLE IF NOT EXISTS kv(
                 namespace TEXT,
                 k TEXT,
                 v_json TEXT,
                 updated_at TEXT,
                 ttl_seconds INTEGER,
+                expires_at REAL,
                 PRIMARY KEY(namespace, k)
             )""")
+            if cols and "expires_at" not in cols:
+                # one-off migration: derive expiry of existing TTL'd keys from their last write
+                c.execute("ALTER TABLE kv ADD COLUMN expires_at REAL")
+                c.execute("UPDATE kv SET expires_at = CAST(strftime('%s', updated_at) AS REAL) + ttl_seconds "
+                          "WHERE ttl_seconds IS NOT NULL")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_kv_expires ON kv(expires_at) WHERE expires_at IS NOT NULL")
             c.execute("""CREATE TABLE IF NOT EXISTS logs(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 namespace TEXT,
@@ -35,17 +81,23 @@ class SQLiteAgentMemory(AgentMemory):
 
     def read(self, namespace: str, key: str):
         with self._conn() as c:
-            row = c.execute("SELECT v_json FROM kv WHERE namespace=? AND k=?", (namespace, key)).fetchone()
-            if not row:
-                return None
-            return json.loads(row[0])
+            row = c.execute("SELECT v_json, expires_at FROM kv WHERE namespace=? AND k=?", (namespace, key)).fetchone()
+        if not row:
+            return None
+        if row[1] is not None and row[1] <= self.clock():
+            with self._lock:
+                self.expired_reads += 1
+            return None
+        return json.loads(row[0])
 
     def write(self, namespace: str, key: str, value, ttl: int | None = None):
         from kimaru_core.utils.time import utc_now_iso
+        expires_at = self.clock() + ttl if ttl is not None else None
         with self._conn() as c:
-            c.execute("""INSERT INTO kv(namespace,k,v_json,updated_at,ttl_seconds) VALUES(?,?,?,?,?)
-                         ON CONFLICT(namespace,k) DO UPDATE SET v_json=excluded.v_json, updated_at=excluded.updated_at, ttl_seconds=excluded.ttl_seconds""",
-                      (namespace, key, json.dumps(value, ensure_ascii=False), utc_now_iso(), ttl))
+            c.execute("""INSERT INTO kv(namespace,k,v_json,updated_at,ttl_seconds,expires_at) VALUES(?,?,?,?,?,?)
+                         ON CONFLICT(namespace,k) DO UPDATE SET v_json=excluded.v_json, updated_at=excluded.updated_at,
+                         ttl_seconds=excluded.ttl_seconds, expires_at=excluded.expires_at""",
+                      (namespace, key, json.dumps(value, ensure_ascii=False), utc_now_iso(), ttl, expires_at))
             c.commit()
 
     def append_log(self, namespace: str, record):
@@ -54,3 +106,51 @@ class SQLiteAgentMemory(AgentMemory):
             c.execute("INSERT INTO logs(namespace, record_json, created_at) VALUES(?,?,?)",
                       (namespace, json.dumps(record, ensure_ascii=False), utc_now_iso()))
             c.commit()
+
+    def sweep(self, max_batches: Optional[int] = None) -> int:
+        """Delete expired keys (bounded); returns how many were deleted."""
+        started = time.perf_counter()
+        now = self.clock()
+        deleted = 0
+        for _ in range(max_batches or self.sweep_max_batches):
+            with self._conn() as c:
+                n = c.execute("DELETE FROM kv WHERE rowid IN "
+                              "(SELECT rowid FROM kv WHERE expires_at <= ? LIMIT ?)", (now, self.sweep_batch)).rowcount
+                c.commit()
+            deleted += n
+            if n < self.sweep_batch:
+                break
+            time.sleep(0)  # let waiting writers take the lock between batches
+        with self._lock:
+            self.keys_expired += deleted
+            self.sweeps += 1
+            self.last_sweep_ms = (time.perf_counter() - started) * 1000.0
+        return deleted
+
+    def _sweep_loop(self, interval_s: float) -> None:
+        while not self._stop.wait(interval_s):
+            try:
+                self.sweep()
+            except Exception as e:
+                # e.g. database busy; the next tick retries, stats() shows it
+                with self._lock:
+                    self.sweep_errors += 1
+                    self.consecutive_sweep_errors += 1
+                    self.last_sweep_error = repr(e)
+            else:
+                with self._lock:
+                    self.consecutive_sweep_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"keys_expired": self.keys_expired, "expired_reads": self.expired_reads,
+                    "sweeps": self.sweeps, "last_sweep_ms": round(self.last_sweep_ms, 3),
+                    "sweep_errors": self.sweep_errors, "consecutive_sweep_errors": self.consecutive_sweep_errors,
+                    "last_sweep_error": self.last_sweep_error,
+                    "sweeper_running": self._sweeper is not None and self._sweeper.is_alive()}
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._sweeper is not None and self._sweeper is not threading.current_thread():
+            self._sweeper.join()
+        _sweeping.discard(self)
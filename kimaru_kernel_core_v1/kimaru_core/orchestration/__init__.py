@@ -1,6 +1,7 @@
 from .living_store import SQLiteLivingStore
 from .zone_kernel_interface import ZoneKernel
-from .zone_models import ZoneRequest, ZoneResult, PointerUpdate
+from .zone_models import ZoneRequest, ZoneResult, PointerUpdate, ZoneRunSpec, MultiZoneRunSummary
 from .execution_plan import ExecutionPlan
 from .zone_loader import ZoneKernelLoader
 from .run_coordinator import RunCoordinator
+from .zone_result_store import SQLiteZoneResultStore
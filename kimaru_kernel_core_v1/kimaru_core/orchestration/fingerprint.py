@@ -0,0 +1,37 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from kimaru_core.utils.hashing import sha256_canonical_json
+from kimaru_core.orchestration.zone_models import ZoneRequest
+
+@dataclass
+class RunFingerprint:
+    """Hash of everything a zone run reads, plus one hash per component.
+
+    Components: "kernel_version", "inputs.<key>", "intent_ref", "scenario_ref",
+    "requested_outputs" and "pointer.<key>" for each pointer the kernel declares.
+    """
+    digest: str
+    parts: Dict[str, str] = field(default_factory=dict)
+
+    def changed_since(self, previous_parts: Dict[str, str]) -> List[str]:
+        keys = set(self.parts) | set(previous_parts)
+        return sorted(k for k in keys if self.parts.get(k) != previous_parts.get(k))
+
+def compute_fingerprint(ctx, kernel, request: ZoneRequest) -> RunFingerprint:
+    parts: Dict[str, str] = {"kernel_version": sha256_canonical_json(kernel.kernel_version())}
+    for k, v in request.inputs.items():
+        parts[f"inputs.{k}"] = sha256_canonical_json(v)
+    # referenced artifacts are immutable, so the ref identifies the content
+    for name in ("intent_ref", "scenario_ref"):
+        ref = getattr(request, name)
+        parts[name] = sha256_canonical_json(ref.key() if ref is not None else None)
+    parts["requested_outputs"] = sha256_canonical_json(request.requested_outputs)
+    keys = kernel.input_pointer_keys(request) or []
+    if keys:
+        active = ctx.pointers.get_active_many(ctx.tenant.tenant_id, ctx.decision_context.decision_context_id, keys)
+        for k in keys:
+            ref = active.get(k)
+            parts[f"pointer.{k}"] = sha256_canonical_json(ref.key() if ref is not None else None)
+    return RunFingerprint(digest=sha256_canonical_json(parts), parts=parts)
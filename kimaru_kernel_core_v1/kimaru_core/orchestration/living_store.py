@@ -1,8 +1,8 @@
 from __future__ import annotations
-import sqlite3
 from typing import Optional, List
 from kimaru_core.identity.models import SessionContext, EpochContext, RunContext
 from kimaru_core.utils.time import utc_now_iso
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
 
 class LivingStore:
     def create_session(self, session: SessionContext) -> None: ...
@@ -10,15 +10,24 @@ class LivingStore:
     def list_sessions(self, tenant_id: str, decision_context_id: str, limit: int=50) -> List[SessionContext]: ...
     def create_epoch(self, epoch: EpochContext) -> None: ...
     def list_epochs(self, session_id: str) -> List[EpochContext]: ...
+    def get_epoch(self, session_id: str, epoch_id: str) -> EpochContext:
+        for e in self.list_epochs(session_id):
+            if e.epoch_id == epoch_id:
+                return e
+        raise KeyError("epoch not found")
     def create_run(self, run: RunContext) -> None: ...
+    def create_runs(self, runs: List[RunContext]) -> None:
+        for r in runs:
+            self.create_run(r)
     def list_runs(self, session_id: str, limit: int=100) -> List[RunContext]: ...
 
 class SQLiteLivingStore(LivingStore):
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, connections: Optional[SQLiteConnectionManager]=None):
         self.db_path=db_path
+        self.connections=connections or default_connection_manager()
         self._init()
     def _conn(self):
-        return sqlite3.connect(self.db_path)
+        return self.connections.connect(self.db_path)
     def _init(self):
         with self._conn() as c:
             c.execute("""CREATE TABLE IF NOT EXISTS sessions(
@@ -75,10 +84,19 @@ class SQLiteLivingStore(LivingStore):
         with self._conn() as c:
             rows=c.execute("SELECT epoch_id,session_id,sequence_no,trigger_json,created_at,derived_from_epoch_id FROM epochs WHERE session_id=? ORDER BY sequence_no ASC",(session_id,)).fetchall()
         return [EpochContext(epoch_id=r[0], session_id=r[1], sequence_no=r[2], trigger=json.loads(r[3]) if r[3] else {}, created_at=r[4], derived_from_epoch_id=r[5]) for r in rows]
+    def get_epoch(self, session_id: str, epoch_id: str) -> EpochContext:
+        import json
+        with self._conn() as c:
+            r=c.execute("SELECT epoch_id,session_id,sequence_no,trigger_json,created_at,derived_from_epoch_id FROM epochs WHERE epoch_id=? AND session_id=?",(epoch_id, session_id)).fetchone()
+        if not r: raise KeyError("epoch not found")
+        return EpochContext(epoch_id=r[0], session_id=r[1], sequence_no=r[2], trigger=json.loads(r[3]) if r[3] else {}, created_at=r[4], derived_from_epoch_id=r[5])
     def create_run(self, run: RunContext) -> None:
+        self.create_runs([run])
+    def create_runs(self, runs: List[RunContext]) -> None:
+        # one transaction for the whole batch
         with self._conn() as c:
-            c.execute("INSERT INTO runs VALUES(?,?,?,?,?,?,?,?,?)",
-                      (run.run_id, run.session_id, run.epoch_id, run.zone_id, run.run_mode, run.created_at, run.kernel_version, run.trace_id, run.correlation_id))
+            c.executemany("INSERT INTO runs VALUES(?,?,?,?,?,?,?,?,?)",
+                          [(r.run_id, r.session_id, r.epoch_id, r.zone_id, r.run_mode, r.created_at, r.kernel_version, r.trace_id, r.correlation_id) for r in runs])
             c.commit()
     def list_runs(self, session_id: str, limit: int=100):
         with self._conn() as c:
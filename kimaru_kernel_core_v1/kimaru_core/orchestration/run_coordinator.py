@@ -1,19 +1,56 @@
 from __future__ import annotations
-from typing import Dict, Optional
+import dataclasses, threading, time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from kimaru_core.core_context import CoreContext
 from kimaru_core.decision_tracker import event_types
 from kimaru_core.decision_tracker.models import TrackEvent
 from kimaru_core.utils.time import utc_now_iso
 from kimaru_core.utils.ids import new_id
-from kimaru_core.orchestration.zone_models import ZoneRequest, ZoneResult
+from kimaru_core.orchestration.zone_models import ZoneRequest, ZoneResult, ZoneRunSpec, ZoneRunOutcome, MultiZoneRunSummary
 from kimaru_core.orchestration.zone_kernel_interface import ZoneKernel
+from kimaru_core.orchestration.zone_result_store import ZoneResultStore, ZoneResultRecord
+from kimaru_core.orchestration.fingerprint import RunFingerprint, compute_fingerprint
+from kimaru_core.orchestration.living_store import LivingStore
 
 class RunCoordinator:
-    """Core-owned router that executes a ZoneKernel with standard lifecycle events."""
+    """Core-owned router that executes a ZoneKernel with standard lifecycle events.
 
-    def __init__(self, zones: Dict[str, ZoneKernel]):
+    With a ZoneResultStore, successful incremental runs of kernels that declare their
+    pointer inputs (input_pointer_keys() is not None) are recorded under the
+    fingerprint of their inputs. An incremental run whose fingerprint matches a
+    recorded run reuses that result (artifacts are immutable; its pointer updates
+    are re-applied if they have since moved); otherwise the kernel's
+    execute_incremental() gets the last result and the changed input components.
+    Full runs, undeclared kernels and inputs that cannot be hashed as canonical JSON
+    just execute.
+
+    run_zones() executes zones on a coordinator-owned pool of `zone_workers` threads
+    (created on first use, released by close()) and, with a LivingStore, records each
+    zone's derived run before it starts.
+    """
+
+    def __init__(self, zones: Mapping[str, ZoneKernel], results: Optional[ZoneResultStore] = None,
+                 living: Optional[LivingStore] = None, zone_workers: int = 8):
         self.zones = zones
+        self.results = results
+        self.living = living
+        self.zone_workers = zone_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, self.zone_workers), thread_name_prefix="kimaru-zone")
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
 
     def run_zone(self, ctx: CoreContext, zone_id: str, request: ZoneRequest) -> ZoneResult:
         if zone_id not in self.zones:
@@ -42,8 +79,9 @@ class RunCoordinator:
         ))
         ctx.observe.emit(event_types.RUN_STARTED, {"zone_id": zone_id, "session_id": ctx.session.session_id, "epoch_id": ctx.epoch.epoch_id, "run_id": ctx.run.run_id})
 
+        started = time.perf_counter()
         try:
-            result = self.zones[zone_id].execute(ctx, request)
+            result, fp, incremental = self._execute(ctx, zone_id, request)
             ctx.tracker.append(TrackEvent(
                 event_id=new_id("evt"),
                 created_at=utc_now_iso(),
@@ -59,8 +97,12 @@ class RunCoordinator:
                 severity="INFO" if result.status == "success" else "ERROR",
                 message=f"Run ended for {zone_id} with status={result.status}",
                 refs={"zone_id": zone_id},
-                metadata={"status": result.status, "produced_artifacts": [r.model_dump() for r in result.produced_artifacts]},
+                metadata={"status": result.status, "produced_artifacts": [r.model_dump() for r in result.produced_artifacts],
+                          "duration_ms": _elapsed_ms(started), **({"fingerprint": fp.digest} if fp else {}), **incremental},
             ))
+            # durability barrier: a run only reports back once its audit trail is committed
+            ctx.tracker.flush()
+            result = self._with_events_summary(ctx, result)
             ctx.observe.emit(event_types.RUN_ENDED, {"zone_id": zone_id, "status": result.status, "run_id": ctx.run.run_id})
             return result
         except Exception as e:
@@ -79,7 +121,206 @@ class RunCoordinator:
                 severity="CRITICAL",
                 message=f"Run failed for {zone_id}: {e}",
                 refs={"zone_id": zone_id},
-                metadata={"exception": repr(e)},
+                metadata={"exception": repr(e), "duration_ms": _elapsed_ms(started)},
             ))
+            try:
+                ctx.tracker.flush()
+            except Exception:
+                pass  # surface the run failure, not a secondary audit write error
             ctx.observe.emit(event_types.RUN_FAILED, {"zone_id": zone_id, "error": str(e), "run_id": ctx.run.run_id})
             raise
+
+    def run_zones(self, ctx: CoreContext, specs: List[ZoneRunSpec], max_parallel: Optional[int] = None) -> MultiZoneRunSummary:
+        """Run several zones concurrently, each once all of its `depends_on` zones succeeded.
+
+        Every zone goes through run_zone() (same RUN_STARTED/RUN_ENDED/RUN_FAILED events)
+        under its own run_id, correlated to ctx.run; at most `max_parallel` (default: all)
+        of this call's zones run at once on the shared zone pool. A zone that fails, errors or does
+        not reach status "success" causes its dependents (transitively) to be skipped;
+        independent zones keep running. One RUN_SUMMARY event closes the batch.
+        """
+        by_zone: Dict[str, ZoneRunSpec] = {}
+        for spec in specs:
+            if spec.zone_id in by_zone:
+                raise ValueError(f"Zone '{spec.zone_id}' requested twice")
+            if spec.zone_id not in self.zones:
+                raise ValueError(f"ZoneKernel '{spec.zone_id}' not loaded")
+            by_zone[spec.zone_id] = spec
+        for spec in specs:
+            for dep in spec.depends_on:
+                if dep not in by_zone:
+                    raise ValueError(f"Zone '{spec.zone_id}' depends on '{dep}', which is not part of this run")
+        _check_acyclic(by_zone)
+
+        started = time.perf_counter()
+        waiting = set(by_zone)
+        outcomes: Dict[str, ZoneRunOutcome] = {}
+        order: List[str] = []
+        running: Dict[Future, str] = {}
+        limit = max(1, max_parallel or len(by_zone))
+        pool = self._get_pool()
+
+        def schedule() -> None:
+            progress = True
+            while progress:  # skipping a zone may unblock (skip) its dependents too
+                progress = False
+                for z in sorted(waiting):
+                    deps = by_zone[z].depends_on
+                    bad = next((d for d in deps if d in outcomes and outcomes[d].status != "success"), None)
+                    if bad is not None:
+                        waiting.discard(z)
+                        outcomes[z] = ZoneRunOutcome(zone_id=z, status="skipped", error=f"dependency '{bad}' ended with status {outcomes[bad].status}")
+                        order.append(z)
+                        progress = True
+                    elif all(d in outcomes for d in deps) and len(running) < limit:
+                        waiting.discard(z)
+                        running[pool.submit(self._run_one, ctx, by_zone[z])] = z
+
+        schedule()
+        while running:
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                z = running.pop(fut)
+                outcomes[z] = fut.result()
+                order.append(z)
+            schedule()
+
+        ok = sum(1 for o in outcomes.values() if o.status == "success")
+        summary = MultiZoneRunSummary(
+            status="success" if ok == len(outcomes) else ("failed" if ok == 0 else "partial"),
+            zones={z: outcomes[z] for z in by_zone},
+            order=order,
+            duration_ms=(time.perf_counter() - started) * 1000,
+        )
+        ctx.tracker.append(TrackEvent(
+            event_id=new_id("evt"),
+            created_at=utc_now_iso(),
+            tenant_id=ctx.tenant.tenant_id,
+            decision_context_id=ctx.decision_context.decision_context_id,
+            session_id=ctx.session.session_id,
+            epoch_id=ctx.epoch.epoch_id,
+            run_id=ctx.run.run_id,
+            zone_id=ctx.run.zone_id,
+            actor_type=ctx.actor.actor_type,
+            actor_id=ctx.actor.actor_id,
+            event_type=event_types.RUN_SUMMARY,
+            severity="INFO" if summary.status == "success" else "ERROR",
+            message=f"{ok}/{len(outcomes)} zones succeeded",
+            refs={"zone_ids": list(by_zone)},
+            metadata={"status": summary.status, "duration_ms": round(summary.duration_ms, 3), "order": order,
+                      "zones": {z: {"status": o.status, "run_id": o.run_id, "duration_ms": round(o.duration_ms, 3), "error": o.error}
+                                for z, o in summary.zones.items()}},
+        ))
+        ctx.tracker.flush()
+        ctx.observe.emit(event_types.RUN_SUMMARY, {"status": summary.status, "run_id": ctx.run.run_id,
+                                                   "zones": {z: o.status for z, o in summary.zones.items()}})
+        return summary
+
+    def _run_one(self, ctx: CoreContext, spec: ZoneRunSpec) -> ZoneRunOutcome:
+        # each zone gets its own run identity, correlated to the batch's run
+        run = ctx.run.model_copy(update={"run_id": new_id("run"), "zone_id": spec.zone_id,
+                                         "correlation_id": ctx.run.correlation_id or ctx.run.run_id})
+        zone_ctx = dataclasses.replace(ctx, run=run)
+        t0 = time.perf_counter()
+        try:
+            if self.living is not None:
+                self.living.create_run(run)
+            result = self.run_zone(zone_ctx, spec.zone_id, spec.request)
+            return ZoneRunOutcome(zone_id=spec.zone_id, status=result.status, run_id=run.run_id, result=result,
+                                  duration_ms=(time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            return ZoneRunOutcome(zone_id=spec.zone_id, status="error", run_id=run.run_id, error=str(e),
+                                  duration_ms=(time.perf_counter() - t0) * 1000)
+
+    def _execute(self, ctx: CoreContext, zone_id: str, request: ZoneRequest) -> Tuple[ZoneResult, Optional[RunFingerprint], Dict[str, Any]]:
+        kernel = self.zones[zone_id]
+        if self.results is None or request.run_mode != "incremental":
+            return kernel.execute(ctx, request), None, {}
+        if kernel.input_pointer_keys(request) is None:
+            return kernel.execute(ctx, request), None, {"incremental": "unsupported"}
+        tenant_id, dctx_id = ctx.tenant.tenant_id, ctx.decision_context.decision_context_id
+        try:
+            fp = compute_fingerprint(ctx, kernel, request)
+        except (TypeError, ValueError):
+            return kernel.execute(ctx, request), None, {"incremental": "unhashable_inputs"}
+        info: Dict[str, Any] = {}
+        result = None
+        hit = self.results.find(tenant_id, dctx_id, zone_id, fp.digest)
+        if hit is not None:
+            result = self._reuse(ctx, zone_id, hit.result)
+            if result is not None:
+                return result, fp, {"incremental": "reused", "reused_run_id": hit.run_id}
+        last = self.results.latest(tenant_id, dctx_id, zone_id)
+        if last is not None:
+            changed = fp.changed_since(last.parts)
+            result = kernel.execute_incremental(ctx, request, last.result, changed)
+            info = {"incremental": "partial", "base_run_id": last.run_id, "changed": changed}
+        if result is None:
+            result = kernel.execute(ctx, request)
+        if result.status == "success":
+            self.results.put(ZoneResultRecord(tenant_id=tenant_id, decision_context_id=dctx_id, zone_id=zone_id,
+                                              fingerprint=fp.digest, parts=fp.parts, result=result, run_id=ctx.run.run_id))
+        return result, fp, info
+
+    def _reuse(self, ctx: CoreContext, zone_id: str, previous: ZoneResult) -> Optional[ZoneResult]:
+        if not all(ctx.artifacts.exists(r) for r in previous.produced_artifacts):
+            return None
+        tenant_id, dctx_id = ctx.tenant.tenant_id, ctx.decision_context.decision_context_id
+        current = ctx.pointers.get_active_many(tenant_id, dctx_id, [u.pointer_key for u in previous.updated_pointers])
+        for u in previous.updated_pointers:
+            cur = current.get(u.pointer_key)
+            if cur is not None and cur.key() == u.artifact_ref.key():
+                continue
+            ctx.governance.before_pointer_set(ctx, u.pointer_key, u.artifact_ref)
+            ctx.pointers.set_active(tenant_id, dctx_id, u.pointer_key, u.artifact_ref, utc_now_iso())
+            ctx.tracker.append(TrackEvent(
+                event_id=new_id("evt"),
+                created_at=utc_now_iso(),
+                tenant_id=tenant_id,
+                decision_context_id=dctx_id,
+                session_id=ctx.session.session_id,
+                epoch_id=ctx.epoch.epoch_id,
+                run_id=ctx.run.run_id,
+                zone_id=zone_id,
+                actor_type=ctx.actor.actor_type,
+                actor_id=ctx.actor.actor_id,
+                event_type=event_types.POINTER_SET,
+                severity="INFO",
+                message=f"pointer set {u.pointer_key} -> {u.artifact_ref.key()} (reused result)",
+                refs={"pointer_key": u.pointer_key, "artifact_ref": u.artifact_ref.model_dump()},
+                metadata={},
+            ))
+        return previous.model_copy(deep=True)
+
+    @staticmethod
+    def _with_events_summary(ctx: CoreContext, result: ZoneResult) -> ZoneResult:
+        # per event_type counts of this run, read from the tracker's materialized aggregates;
+        # counts a kernel reported itself take precedence
+        try:
+            agg = ctx.tracker.aggregates("run", ctx.run.run_id)
+        except (NotImplementedError, ValueError):
+            return result
+        if agg is None:
+            return result
+        return result.model_copy(update={"events_summary": {**agg.by_type, **result.events_summary}})
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
+
+def _check_acyclic(by_zone: Dict[str, ZoneRunSpec]) -> None:
+    indegree = {z: len(set(s.depends_on)) for z, s in by_zone.items()}
+    dependents: Dict[str, List[str]] = {z: [] for z in by_zone}
+    for z, s in by_zone.items():
+        for d in set(s.depends_on):
+            dependents[d].append(z)
+    ready = [z for z, n in indegree.items() if n == 0]
+    seen = 0
+    while ready:
+        z = ready.pop()
+        seen += 1
+        for nxt in dependents[z]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                ready.append(nxt)
+    if seen != len(by_zone):
+        raise ValueError("Zone dependencies contain a cycle: " + ", ".join(sorted(z for z, n in indegree.items() if n > 0)))
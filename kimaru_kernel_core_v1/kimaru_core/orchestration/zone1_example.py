@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, List
 
 from kimaru_core.orchestration.zone_kernel_interface import ZoneKernel
 from kimaru_core.orchestration.zone_models import ZoneRequest, ZoneResult
@@ -24,5 +24,8 @@ class Zone1Kernel(ZoneKernel):
     def capability_catalog(self) -> Dict[str, str]:
         return {"noop": "No-op capability for example zone"}
 
+    def input_pointer_keys(self, request: ZoneRequest) -> List[str]:
+        return []  # reads no pointers: results are reusable by input fingerprint
+
     def execute(self, ctx: CoreContext, request: ZoneRequest) -> ZoneResult:
         return ZoneResult(status="success", explain="Zone1 executed (example)")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Optional
 
 from kimaru_core.agent_fabric.registry import AgentRegistry
 from kimaru_core.algorithms.registry import AlgorithmRegistry
@@ -37,3 +37,21 @@ class ZoneKernel(ABC):
     def execute(self, ctx: CoreContext, request: ZoneRequest) -> ZoneResult:
         """Execute a zone run. Must use core invoker for any agent execution."""
         raise NotImplementedError
+
+    def input_pointer_keys(self, request: ZoneRequest) -> Optional[List[str]]:
+        """Pointers this run reads; their current targets are part of the run's input fingerprint.
+
+        None (the default) means undeclared: incremental runs of this kernel then always
+        execute in full, since a recorded result could depend on pointers that moved.
+        Return a list (possibly empty) to opt in to result reuse.
+        """
+        return None
+
+    def execute_incremental(self, ctx: CoreContext, request: ZoneRequest, previous: ZoneResult, changed: List[str]) -> ZoneResult:
+        """Incremental run when the inputs differ from the last successful run.
+
+        `changed` lists the fingerprint components that differ (e.g. "inputs.rows",
+        "pointer.core/latest"). Override to recompute only what depends on them; the
+        default recomputes everything.
+        """
+        return self.execute(ctx, request)
@@ -1,6 +1,6 @@
 from __future__ import annotations
-import importlib
-from typing import Dict, List, Optional
+import importlib, threading, time
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
 
 from kimaru_core.orchestration.zone_kernel_interface import ZoneKernel
 from kimaru_core.runtime.manifest import KimaruManifest, ZoneKernelRef
@@ -16,6 +16,7 @@ class ZoneKernelLoader:
     def __init__(self, manifest: KimaruManifest):
         self.manifest = manifest
         self._loaded: Dict[str, ZoneKernel] = {}
+        self._lock = threading.RLock()
 
     def discover(self) -> List[ZoneKernelRef]:
         return [z for z in self.manifest.zones if z.enabled]
@@ -23,6 +24,12 @@ class ZoneKernelLoader:
     def load(self, zone_id: str) -> ZoneKernel:
         if zone_id in self._loaded:
             return self._loaded[zone_id]
+        with self._lock:
+            if zone_id in self._loaded:
+                return self._loaded[zone_id]
+            return self._load(zone_id)
+
+    def _load(self, zone_id: str) -> ZoneKernel:
 
         ref = next((z for z in self.discover() if z.zone_id == zone_id), None)
         if ref is None:
@@ -50,3 +57,49 @@ class ZoneKernelLoader:
         for z in self.discover():
             self.load(z.zone_id)
         return dict(self._loaded)
+
+    def lazy(self, on_load: Optional[Callable[[ZoneKernel, float], None]] = None) -> "LazyZoneMap":
+        return LazyZoneMap(self, on_load)
+
+class LazyZoneMap(Mapping[str, ZoneKernel]):
+    """zone_id -> ZoneKernel over the enabled manifest zones; a kernel is imported and
+    constructed the first time it is looked up. `on_load(kernel, ms)` runs once per zone,
+    before the kernel is handed out (e.g. to register its agents/algorithms)."""
+
+    def __init__(self, loader: ZoneKernelLoader, on_load: Optional[Callable[[ZoneKernel, float], None]] = None):
+        self.loader = loader
+        self.on_load = on_load
+        self._ids = [z.zone_id for z in loader.discover()]
+        self._ready: Dict[str, ZoneKernel] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, zone_id: str) -> ZoneKernel:
+        kernel = self._ready.get(zone_id)
+        if kernel is not None:
+            return kernel
+        if zone_id not in self._ids:
+            raise KeyError(zone_id)
+        with self._lock:
+            kernel = self._ready.get(zone_id)
+            if kernel is None:
+                t0 = time.perf_counter()
+                kernel = self.loader.load(zone_id)
+                if self.on_load is not None:
+                    self.on_load(kernel, (time.perf_counter() - t0) * 1000.0)
+                self._ready[zone_id] = kernel
+            return kernel
+
+    def __contains__(self, zone_id: object) -> bool:
+        return zone_id in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def loaded(self) -> List[str]:
+        return [z for z in self._ids if z in self._ready]
+
+    def load_all(self) -> Dict[str, ZoneKernel]:
+        return {z: self[z] for z in self._ids}
@@ -33,3 +33,22 @@ class ZoneResult(BaseModel):
     events_summary: Dict[str, int] = Field(default_factory=dict)
     explain: str = ""
     errors: List[str] = Field(default_factory=list)
+
+class ZoneRunSpec(BaseModel):
+    zone_id: str
+    request: ZoneRequest
+    depends_on: List[str] = Field(default_factory=list)
+
+class ZoneRunOutcome(BaseModel):
+    zone_id: str
+    status: Literal["success", "blocked", "requires_approval", "failed", "error", "skipped"]
+    run_id: Optional[str] = None
+    result: Optional[ZoneResult] = None
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+class MultiZoneRunSummary(BaseModel):
+    status: Literal["success", "partial", "failed"]
+    zones: Dict[str, ZoneRunOutcome] = Field(default_factory=dict)
+    order: List[str] = Field(default_factory=list)  # completion order
+    duration_ms: float = 0.0
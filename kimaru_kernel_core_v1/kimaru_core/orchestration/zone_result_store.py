@@ -0,0 +1,82 @@
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from kimaru_core.orchestration.zone_models import ZoneResult
+from kimaru_core.utils.time import utc_now_iso
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, default_connection_manager
+
+@dataclass
+class ZoneResultRecord:
+    tenant_id: str
+    decision_context_id: str
+    zone_id: str
+    fingerprint: str
+    parts: Dict[str, str]
+    result: ZoneResult
+    run_id: str
+    created_at: str = field(default_factory=utc_now_iso)
+
+class ZoneResultStore:
+    """Successful ZoneResults by input fingerprint, for incremental runs.
+    Only the latest record per (zone, fingerprint) is kept."""
+    def put(self, record: ZoneResultRecord) -> None: ...
+    def find(self, tenant_id: str, decision_context_id: str, zone_id: str, fingerprint: str) -> Optional[ZoneResultRecord]: ...
+    def latest(self, tenant_id: str, decision_context_id: str, zone_id: str) -> Optional[ZoneResultRecord]: ...
+
+class SQLiteZoneResultStore(ZoneResultStore):
+    def __init__(self, db_path: str, connections: Optional[SQLiteConnectionManager] = None, max_per_zone: int = 64):
+        self.db_path = db_path
+        self.connections = connections or default_connection_manager()
+        self.max_per_zone = max_per_zone  # distinct fingerprints kept per zone, oldest pruned first
+        self._init()
+
+    def _conn(self):
+        return self.connections.connect(self.db_path)
+
+    def _init(self):
+        with self._conn() as c:
+            c.execute("""CREATE TABLE IF NOT EXISTS zone_results(
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                tenant_id TEXT,
+                decision_context_id TEXT,
+                zone_id TEXT,
+                fingerprint TEXT,
+                parts_json TEXT,
+                result_json TEXT,
+                run_id TEXT,
+                created_at TEXT
+            )""")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_zone_results_fp ON zone_results(tenant_id, decision_context_id, zone_id, fingerprint, seq)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_zone_results_zone ON zone_results(tenant_id, decision_context_id, zone_id, seq)")
+            c.commit()
+
+    def put(self, record: ZoneResultRecord) -> None:
+        with self._conn() as c:
+            c.execute("INSERT INTO zone_results(tenant_id,decision_context_id,zone_id,fingerprint,parts_json,result_json,run_id,created_at) VALUES(?,?,?,?,?,?,?,?)",
+                      (record.tenant_id, record.decision_context_id, record.zone_id, record.fingerprint,
+                       json.dumps(record.parts), record.result.model_dump_json(), record.run_id, record.created_at))
+            key = (record.tenant_id, record.decision_context_id, record.zone_id)
+            c.execute("DELETE FROM zone_results WHERE tenant_id=? AND decision_context_id=? AND zone_id=? AND fingerprint=? "
+                      "AND seq < (SELECT MAX(seq) FROM zone_results WHERE tenant_id=? AND decision_context_id=? AND zone_id=? AND fingerprint=?)",
+                      (*key, record.fingerprint, *key, record.fingerprint))
+            c.execute("DELETE FROM zone_results WHERE tenant_id=? AND decision_context_id=? AND zone_id=? AND seq NOT IN "
+                      "(SELECT seq FROM zone_results WHERE tenant_id=? AND decision_context_id=? AND zone_id=? ORDER BY seq DESC LIMIT ?)",
+                      (*key, *key, self.max_per_zone))
+            c.commit()
+
+    def _one(self, where: str, params: tuple) -> Optional[ZoneResultRecord]:
+        with self._conn() as c:
+            r = c.execute("SELECT tenant_id,decision_context_id,zone_id,fingerprint,parts_json,result_json,run_id,created_at FROM zone_results "
+                          f"WHERE {where} ORDER BY seq DESC LIMIT 1", params).fetchone()
+        if not r:
+            return None
+        return ZoneResultRecord(tenant_id=r[0], decision_context_id=r[1], zone_id=r[2], fingerprint=r[3], parts=json.loads(r[4]),
+                                result=ZoneResult.model_validate_json(r[5]), run_id=r[6], created_at=r[7])
+
+    def find(self, tenant_id: str, decision_context_id: str, zone_id: str, fingerprint: str) -> Optional[ZoneResultRecord]:
+        return self._one("tenant_id=? AND decision_context_id=? AND zone_id=? AND fingerprint=?", (tenant_id, decision_context_id, zone_id, fingerprint))
+
+    def latest(self, tenant_id: str, decision_context_id: str, zone_id: str) -> Optional[ZoneResultRecord]:
+        return self._one("tenant_id=? AND decision_context_id=? AND zone_id=?", (tenant_id, decision_context_id, zone_id))
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import asyncio, functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kimaru_core.identity.models import SessionContext, EpochContext, RunContext
+from kimaru_core.orchestration.living_store import LivingStore
+from kimaru_core.decision_tracker.models import TrackEvent, EventQuery, EventPage, EventAggregate
+from kimaru_core.decision_tracker.tracker import DecisionTracker
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.artifact_models import ArtifactEnvelope
+from kimaru_core.artifacts.artifact_store import ArtifactStore
+from kimaru_core.artifacts.listing_index import ArtifactPage
+from kimaru_core.artifacts.active_pointer_store import ActivePointerStore
+
+class StoreExecutor:
+    """Dedicated bounded thread pool for blocking store I/O.
+
+    Async handlers await store calls here instead of occupying the web server's
+    request threadpool; waiting requests cost a coroutine, not a thread. Each worker
+    thread keeps its own pooled SQLite connections (see utils.sqlite_pool).
+    """
+
+    def __init__(self, max_workers: int = 32, thread_name_prefix: str = "kimaru-io"):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+class AsyncLivingStore:
+    async def create_session(self, session: SessionContext) -> None: ...
+    async def get_session(self, session_id: str) -> SessionContext: ...
+    async def list_sessions(self, tenant_id: str, decision_context_id: str, limit: int=50) -> List[SessionContext]: ...
+    async def create_epoch(self, epoch: EpochContext) -> None: ...
+    async def list_epochs(self, session_id: str) -> List[EpochContext]: ...
+    async def get_epoch(self, session_id: str, epoch_id: str) -> EpochContext: ...
+    async def create_run(self, run: RunContext) -> None: ...
+    async def create_runs(self, runs: List[RunContext]) -> None: ...
+    async def list_runs(self, session_id: str, limit: int=100) -> List[RunContext]: ...
+
+class AsyncDecisionTracker:
+    async def append(self, event: TrackEvent) -> None: ...
+    async def append_many(self, events: List[TrackEvent]) -> None: ...
+    async def flush(self) -> None: ...
+    async def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]: ...
+    async def query_page(self, query: EventQuery, limit: int = 200, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None, order: str = "desc") -> EventPage: ...
+    async def aggregates(self, scope: str, scope_id: str) -> EventAggregate: ...
+
+class AsyncArtifactStore:
+    async def put(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None: ...
+    async def get(self, ref: ArtifactRef) -> ArtifactEnvelope: ...
+    async def exists(self, ref: ArtifactRef) -> bool: ...
+    async def list_page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+                        session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage: ...
+
+class AsyncActivePointerStore:
+    async def set_active(self, tenant_id: str, decision_context_id: str, pointer_key: str, artifact_ref: ArtifactRef, updated_at: str) -> None: ...
+    async def get_active(self, tenant_id: str, decision_context_id: str, pointer_key: str) -> Optional[ArtifactRef]: ...
+    async def get_active_many(self, tenant_id: str, decision_context_id: str, pointer_keys: List[str]) -> Dict[str, ArtifactRef]: ...
+    async def list_active(self, tenant_id: str, decision_context_id: str, prefix: str | None = None) -> List[Tuple[str, ArtifactRef]]: ...
+
+class ExecutorLivingStore(AsyncLivingStore):
+    def __init__(self, inner: LivingStore, executor: StoreExecutor):
+        self.inner = inner
+        self.executor = executor
+
+    async def create_session(self, session: SessionContext) -> None:
+        return await self.executor.run(self.inner.create_session, session)
+
+    async def get_session(self, session_id: str) -> SessionContext:
+        return await self.executor.run(self.inner.get_session, session_id)
+
+    async def list_sessions(self, tenant_id: str, decision_context_id: str, limit: int=50) -> List[SessionContext]:
+        return await self.executor.run(self.inner.list_sessions, tenant_id, decision_context_id, limit=limit)
+
+    async def create_epoch(self, epoch: EpochContext) -> None:
+        return await self.executor.run(self.inner.create_epoch, epoch)
+
+    async def list_epochs(self, session_id: str) -> List[EpochContext]:
+        return await self.executor.run(self.inner.list_epochs, session_id)
+
+    async def get_epoch(self, session_id: str, epoch_id: str) -> EpochContext:
+        return await self.executor.run(self.inner.get_epoch, session_id, epoch_id)
+
+    async def create_run(self, run: RunContext) -> None:
+        return await self.executor.run(self.inner.create_run, run)
+
+    async def create_runs(self, runs: List[RunContext]) -> None:
+        return await self.executor.run(self.inner.create_runs, runs)
+
+    async def list_runs(self, session_id: str, limit: int=100) -> List[RunContext]:
+        return await self.executor.run(self.inner.list_runs, session_id, limit=limit)
+
+class ExecutorDecisionTracker(AsyncDecisionTracker):
+    def __init__(self, inner: DecisionTracker, executor: StoreExecutor):
+        self.inner = inner
+        self.executor = executor
+
+    async def append(self, event: TrackEvent) -> None:
+        return await self.executor.run(self.inner.append, event)
+
+    async def append_many(self, events: List[TrackEvent]) -> None:
+        return await self.executor.run(self.inner.append_many, events)
+
+    async def flush(self) -> None:
+        return await self.executor.run(self.inner.flush)
+
+    async def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]:
+        return await self.executor.run(self.inner.query, session_id, limit=limit, event_type=event_type)
+
+    async def query_page(self, query: EventQuery, limit: int = 200, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None, order: str = "desc") -> EventPage:
+        return await self.executor.run(self.inner.query_page, query, limit=limit, cursor=cursor, fields=fields, order=order)
+
+    async def aggregates(self, scope: str, scope_id: str) -> EventAggregate:
+        return await self.executor.run(self.inner.aggregates, scope, scope_id)
+
+class ExecutorArtifactStore(AsyncArtifactStore):
+    def __init__(self, inner: ArtifactStore, executor: StoreExecutor):
+        self.inner = inner
+        self.executor = executor
+
+    async def put(self, ref: ArtifactRef, envelope: ArtifactEnvelope) -> None:
+        return await self.executor.run(self.inner.put, ref, envelope)
+
+    async def get(self, ref: ArtifactRef) -> ArtifactEnvelope:
+        return await self.executor.run(self.inner.get, ref)
+
+    async def exists(self, ref: ArtifactRef) -> bool:
+        return await self.executor.run(self.inner.exists, ref)
+
+    async def list_page(self, kind: str, limit: int = 100, cursor: Optional[str] = None,
+                        session_id: Optional[str] = None, run_id: Optional[str] = None, producer: Optional[str] = None) -> ArtifactPage:
+        return await self.executor.run(self.inner.list_page, kind, limit, cursor, session_id=session_id, run_id=run_id, producer=producer)
+
+class ExecutorActivePointerStore(AsyncActivePointerStore):
+    def __init__(self, inner: ActivePointerStore, executor: StoreExecutor):
+        self.inner = inner
+        self.executor = executor
+
+    async def set_active(self, tenant_id: str, decision_context_id: str, pointer_key: str, artifact_ref: ArtifactRef, updated_at: str) -> None:
+        return await self.executor.run(self.inner.set_active, tenant_id, decision_context_id, pointer_key, artifact_ref, updated_at)
+
+    async def get_active(self, tenant_id: str, decision_context_id: str, pointer_key: str) -> Optional[ArtifactRef]:
+        return await self.executor.run(self.inner.get_active, tenant_id, decision_context_id, pointer_key)
+
+    async def get_active_many(self, tenant_id: str, decision_context_id: str, pointer_keys: List[str]) -> Dict[str, ArtifactRef]:
+        return await self.executor.run(self.inner.get_active_many, tenant_id, decision_context_id, pointer_keys)
+
+    async def list_active(self, tenant_id: str, decision_context_id: str, prefix: str | None = None) -> List[Tuple[str, ArtifactRef]]:
+        return await self.executor.run(self.inner.list_active, tenant_id, decision_context_id, prefix=prefix)
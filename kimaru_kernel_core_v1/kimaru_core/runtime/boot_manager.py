@@ -1,48 +1,125 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+import time
+from typing import Any, Dict, Mapping, Optional
 
-from kimaru_core.artifacts.artifact_store import FileSystemArtifactStore
+from kimaru_core.artifacts.artifact_store import create_artifact_store
+from kimaru_core.artifacts.caching_store import CachingArtifactStore
 from kimaru_core.artifacts.active_pointer_store import SQLiteActivePointerStore
-from kimaru_core.decision_tracker import SQLiteDecisionTracker
+from kimaru_core.artifacts.pointer_cache import CachingActivePointerStore
+from kimaru_core.artifacts.delta.delta_log import SQLiteDeltaLogStore
+from kimaru_core.federation.replication import ReplicationEngine, SQLiteReplicationMarkStore
+from kimaru_core.decision_tracker import SQLiteDecisionTracker, WriteBehindDecisionTracker, PartitionedDecisionTracker
 from kimaru_core.memory.agent_memory import SQLiteAgentMemory
 from kimaru_core.agent_fabric.registry import AgentRegistry
 from kimaru_core.algorithms.registry import AlgorithmRegistry
+from kimaru_core.algorithms.execution import ProcessPoolAlgorithmExecutor
+from kimaru_core.algorithms.result_cache import create_result_cache
+from kimaru_core.templates.script_dsl.compiler import plan_cache_for
 from kimaru_core.agent_fabric.policy_guard import PolicyGuard
 from kimaru_core.governance.gateway import GovernanceGateway
 from kimaru_core.agent_fabric.observe import ObserveStream
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager, SQLiteSettings
 
 from kimaru_core.runtime.manifest import KimaruManifest
-from kimaru_core.orchestration.zone_loader import ZoneKernelLoader
+from kimaru_core.runtime.lazy import BootReport, LazyStore, resolve as lazy_resolve
+from kimaru_core.orchestration.zone_kernel_interface import ZoneKernel
+from kimaru_core.orchestration.zone_loader import ZoneKernelLoader, LazyZoneMap
 from kimaru_core.orchestration.run_coordinator import RunCoordinator
+from kimaru_core.orchestration.zone_result_store import SQLiteZoneResultStore
+from kimaru_core.orchestration.living_store import SQLiteLivingStore
 
 @dataclass
 class BootConfig:
     var_dir: Path
     manifest: Optional[KimaruManifest] = None
+    artifact_backend: str = "filesystem"  # "filesystem" | "content_addressed"
+    artifact_cache_bytes: int = 0  # 0 disables the in-process envelope cache
+    artifact_cache_objects: bool = True
+    pointer_cache: bool = True
+    tracker_mode: str = "sync"  # "sync" | "write_behind"
+    tracker_batch_size: int = 256
+    tracker_max_latency_ms: int = 50
+    tracker_partition: str = "none"  # "none" | "day" | "hour": time-bucketed segments under db/tracker/
+    tracker_retention_days: Optional[int] = None  # archived segments older than this are deleted
+    tracker_aggregates: bool = True  # materialize per run/epoch/zone/session counts on every append
+    step_workers: int = 0  # >0 runs independent KimaruScript steps on a shared pool
+    zone_workers: int = 8  # RunCoordinator.run_zones pool size
+    algorithm_workers: int = 0  # >0 runs cpu_bound algorithms in a process pool
+    algorithm_cache: str = "none"  # "none" | "memory" | "artifacts"
+    algorithm_cache_bytes: int = 64 * 1024 * 1024
+    memory_sweep_interval_s: float = 60.0  # expired agent-memory keys are deleted on this interval; 0 disables
+    delta_compact_every: int = 32  # deltas past the last snapshot before a new snapshot is written
+    warmup: bool = False  # build stores and load zone kernels during boot instead of on first use
+    sqlite: SQLiteSettings = field(default_factory=SQLiteSettings)
 
 @dataclass
 class BootManager:
     """Deterministic boot sequence for on-prem Kimaru core runtime.
 
     This sets up stores/registries and loads enabled ZoneKernels from manifest.
+    SQLite/artifact stores and zone kernels are built on first use unless
+    `config.warmup` is set; `state["boot_report"]` records how long each part took.
     """
 
     config: BootConfig
 
     def boot(self):
-        var_dir = self.config.var_dir
+        t_boot = time.perf_counter()
+        report = BootReport()
+        cfg = self.config
+        var_dir = cfg.var_dir
         art_dir = var_dir / "artifacts"
         db_dir = var_dir / "db"
-        art_dir.mkdir(parents=True, exist_ok=True)
-        db_dir.mkdir(parents=True, exist_ok=True)
 
-        artifacts = FileSystemArtifactStore(str(art_dir))
-        pointers = SQLiteActivePointerStore(str(db_dir / "pointers.sqlite"))
-        tracker = SQLiteDecisionTracker(str(db_dir / "tracker.sqlite"))
-        memory = SQLiteAgentMemory(str(db_dir / "memory.sqlite"))
+        def dirs():
+            art_dir.mkdir(parents=True, exist_ok=True)
+            db_dir.mkdir(parents=True, exist_ok=True)
+        report.timed("dirs", dirs)
 
+        # one connection manager (thread-local connections, WAL, pragmas) shared by every SQLite store
+        connections = SQLiteConnectionManager(cfg.sqlite)
+
+        def make_artifacts():
+            store = create_artifact_store(str(art_dir), cfg.artifact_backend, connections)
+            if cfg.artifact_cache_bytes > 0:
+                store = CachingArtifactStore(store, max_bytes=cfg.artifact_cache_bytes, cache_objects=cfg.artifact_cache_objects)
+            return store
+
+        def make_pointers():
+            store = SQLiteActivePointerStore(str(db_dir / "pointers.sqlite"), connections)
+            return CachingActivePointerStore(store) if cfg.pointer_cache else store
+
+        def make_tracker():
+            if cfg.tracker_partition != "none":
+                tracker = PartitionedDecisionTracker(str(db_dir / "tracker"), bucket=cfg.tracker_partition,
+                                                     retention_days=cfg.tracker_retention_days, settings=cfg.sqlite,
+                                                     aggregates=cfg.tracker_aggregates)
+                if (db_dir / "tracker.sqlite").exists():
+                    tracker.import_legacy(str(db_dir / "tracker.sqlite"))
+            else:
+                tracker = SQLiteDecisionTracker(str(db_dir / "tracker.sqlite"), connections, aggregates=cfg.tracker_aggregates)
+            if cfg.tracker_mode == "write_behind":
+                tracker = WriteBehindDecisionTracker(tracker, batch_size=cfg.tracker_batch_size, max_latency_ms=cfg.tracker_max_latency_ms)
+            return tracker
+
+        artifacts = LazyStore("store.artifacts", make_artifacts, report)
+        pointers = LazyStore("store.pointers", make_pointers, report)
+        tracker = LazyStore("store.tracker", make_tracker, report)
+        memory = LazyStore("store.memory", lambda: SQLiteAgentMemory(str(db_dir / "memory.sqlite"), connections,
+                                                                     sweep_interval_s=cfg.memory_sweep_interval_s), report)
+        deltas = LazyStore("store.deltas", lambda: SQLiteDeltaLogStore(str(db_dir / "deltas.sqlite"), artifacts, connections,
+                                                                        compact_every=cfg.delta_compact_every), report)
+
+        replication = None
+        federation = cfg.manifest.federation if cfg.manifest is not None else None
+        if federation is not None and federation.enabled:
+            replication = LazyStore("store.replication", lambda: ReplicationEngine(
+                federation.node_id or "local", artifacts, deltas, SQLiteReplicationMarkStore(str(db_dir / "replication.sqlite"), connections)), report)
+
+        t0 = time.perf_counter()
         algorithms = AlgorithmRegistry()
         agents = AgentRegistry()
 
@@ -50,27 +127,79 @@ class BootManager:
         governance = GovernanceGateway()
 
         observe = ObserveStream()
+        algorithm_executor = ProcessPoolAlgorithmExecutor(max_workers=cfg.algorithm_workers) if cfg.algorithm_workers > 0 else None
+        algorithm_cache = create_result_cache(cfg.algorithm_cache, artifacts, cfg.algorithm_cache_bytes)
+        step_executor = ThreadPoolExecutor(max_workers=cfg.step_workers, thread_name_prefix="kimaru-step") if cfg.step_workers > 0 else None
+        report.record("registries", (time.perf_counter() - t0) * 1000.0)
 
-        zones = {}
+        zones: Mapping[str, ZoneKernel] = {}
         run_coordinator = None
-        if self.config.manifest is not None and self.config.manifest.zones:
-            loader = ZoneKernelLoader(self.config.manifest)
-            zones = loader.bootstrap_all()
-            # register zone agents/algorithms
-            for z in zones.values():
-                z.register(agents, algorithms)
-            run_coordinator = RunCoordinator(zones)
-
-        return {
+        if cfg.manifest is not None and cfg.manifest.zones:
+            def register(kernel: ZoneKernel, ms: float):
+                # register zone agents/algorithms
+                t_reg = time.perf_counter()
+                kernel.register(agents, algorithms)
+                report.record(f"zone.{kernel.zone_id()}", ms + (time.perf_counter() - t_reg) * 1000.0)
+
+            loader = ZoneKernelLoader(cfg.manifest)
+            zones = loader.lazy(on_load=register)
+            for zone_id in zones:
+                report.defer(f"zone.{zone_id}")
+            results = LazyStore("store.zone_results", lambda: SQLiteZoneResultStore(str(db_dir / "zone_results.sqlite"), connections), report)
+            living = LazyStore("store.living", lambda: SQLiteLivingStore(str(db_dir / "living.sqlite"), connections), report)
+            run_coordinator = RunCoordinator(zones, results, living=living, zone_workers=cfg.zone_workers)
+
+        state = {
+            "connections": connections,
             "artifacts": artifacts,
             "pointers": pointers,
             "tracker": tracker,
             "memory": memory,
+            "deltas": deltas,
+            "replication": replication,
             "algorithms": algorithms,
             "agents": agents,
             "policy": policy,
             "governance": governance,
             "observe": observe,
+            "step_executor": step_executor,
+            "algorithm_executor": algorithm_executor,
+            "algorithm_cache": algorithm_cache,
             "zones": zones,
             "run_coordinator": run_coordinator,
+            "boot_report": report,
         }
+        if cfg.warmup:
+            warmup(state)
+        report.boot_ms = round((time.perf_counter() - t_boot) * 1000.0, 3)
+        return state
+
+def warmup(state: Dict[str, Any]) -> None:
+    """Build every lazy store and load every zone kernel of a booted runtime now."""
+    for key in ("artifacts", "pointers", "tracker", "memory", "deltas"):
+        lazy_resolve(state[key])
+    zones = state.get("zones")
+    if isinstance(zones, LazyZoneMap):
+        zones.load_all()
+    coordinator = state.get("run_coordinator")
+    if coordinator is not None:
+        lazy_resolve(coordinator.results)
+
+def shutdown(state: Dict[str, Any]) -> None:
+    """Release what a booted runtime holds: tracker writer, memory sweeper, pointer probe, worker pools,
+    compiled script plans (and their algorithm pins) and every thread's SQLite connections.
+    Stores that were never used are not built just to be closed."""
+    for key in ("tracker", "memory", "pointers"):
+        store = state.get(key)
+        if not isinstance(store, LazyStore) or store.resolved:
+            close = getattr(lazy_resolve(store), "close", None)
+            if close is not None:
+                close()
+    for key in ("step_executor", "algorithm_executor"):
+        if state.get(key) is not None:
+            state[key].shutdown(wait=True)
+    if state.get("run_coordinator") is not None:
+        state["run_coordinator"].close()
+    if state["artifacts"].resolved:
+        plan_cache_for(lazy_resolve(state["artifacts"])).clear()
+    state["connections"].close_all()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import threading, time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+@dataclass
+class BootReport:
+    """Wall time (ms) of each boot phase.
+
+    Lazily built components are listed under `pending` until first use, then
+    their construction time is recorded as a phase like any other.
+    """
+    phases: Dict[str, float] = field(default_factory=dict)
+    pending: List[str] = field(default_factory=list)
+    boot_ms: float = 0.0
+    reuses: int = 0  # times the booted runtime was handed out again instead of rebooting
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, name: str, ms: float) -> None:
+        with self._lock:
+            self.phases[name] = round(self.phases.get(name, 0.0) + ms, 3)
+            if name in self.pending:
+                self.pending.remove(name)
+
+    def defer(self, name: str) -> None:
+        with self._lock:
+            if name not in self.phases and name not in self.pending:
+                self.pending.append(name)
+
+    def timed(self, name: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"boot_ms": self.boot_ms, "phases": dict(self.phases), "pending": list(self.pending), "reuses": self.reuses}
+
+    def reused(self) -> None:
+        with self._lock:
+            self.reuses += 1
+
+class LazyStore:
+    """Stand-in for a store that is built on first attribute access.
+
+    Construction (schema DDL, index backfills, writer threads) is deferred until a
+    caller actually touches the store; every later access goes to the same instance.
+    """
+    __slots__ = ("_lazy_name", "_lazy_factory", "_lazy_target", "_lazy_lock", "_lazy_report")
+
+    def __init__(self, name: str, factory: Callable[[], Any], report: Optional[BootReport] = None):
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_target", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+        object.__setattr__(self, "_lazy_report", report)
+        if report is not None:
+            report.defer(name)
+
+    def resolve(self) -> Any:
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is not None:
+            return target
+        with object.__getattribute__(self, "_lazy_lock"):
+            target = object.__getattribute__(self, "_lazy_target")
+            if target is None:
+                factory = object.__getattribute__(self, "_lazy_factory")
+                report = object.__getattribute__(self, "_lazy_report")
+                target = report.timed(self._lazy_name, factory) if report is not None else factory()
+                object.__setattr__(self, "_lazy_target", target)
+            return target
+
+    @property
+    def resolved(self) -> bool:
+        return object.__getattribute__(self, "_lazy_target") is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "resolved" if self.resolved else "pending"
+        return f"<LazyStore {object.__getattribute__(self, '_lazy_name')} ({state})>"
+
+def resolve(obj: Any) -> Any:
+    """The real object behind a LazyStore (building it if needed), or `obj` itself."""
+    return obj.resolve() if isinstance(obj, LazyStore) else obj
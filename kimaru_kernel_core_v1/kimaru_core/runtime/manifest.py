@@ -2,6 +2,8 @@ from __future__ import annotations
 from pydantic import BaseModel, Field
 from typing import List, Optional, Literal, Dict
 
+from kimaru_core.utils.hashing import sha256_canonical_json
+
 class ZoneKernelRef(BaseModel):
     zone_id: str
     package: str
@@ -19,3 +21,7 @@ class KimaruManifest(BaseModel):
     core_version: Optional[str] = None
     zones: List[ZoneKernelRef] = Field(default_factory=list)
     federation: FederationConfig = Field(default_factory=FederationConfig)
+
+def manifest_hash(manifest: KimaruManifest) -> str:
+    """Content hash of a manifest: equal manifests boot identical runtimes."""
+    return sha256_canonical_json(manifest.model_dump(mode="json"))
@@ -18,10 +18,11 @@ class PrecedenceResolver:
     pointers: ActivePointerStore
 
     def resolve(self, tenant_id: str, decision_context_id: str, pointer_candidates: List[str]) -> Optional[ArtifactRef]:
+        # one batched lookup for all candidates, then pick by precedence
+        found = self.pointers.get_active_many(tenant_id, decision_context_id, pointer_candidates)
         for key in pointer_candidates:
-            ref = self.pointers.get_active(tenant_id, decision_context_id, key)
-            if ref is not None:
-                return ref
+            if key in found:
+                return found[key]
         return None
 
     @staticmethod
@@ -0,0 +1,145 @@
+from __future__ import annotations
+import os, threading, time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kimaru_core.runtime.boot_manager import BootConfig, BootManager, shutdown
+from kimaru_core.runtime.manifest import KimaruManifest, manifest_hash
+
+RuntimeKey = Tuple[str, str, str]  # (tenant_id, manifest hash, var dir)
+
+@dataclass
+class _Entry:
+    key: RuntimeKey
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    state: Optional[Dict[str, Any]] = None
+    refs: int = 0
+    idle_since: Optional[float] = None
+    acquisitions: int = 0
+
+class RuntimeLease:
+    """One holder's reference to a shared booted runtime; `release()` is idempotent and drops `state`."""
+
+    def __init__(self, registry: "RuntimeRegistry", entry: _Entry, reused: bool):
+        self.key = entry.key
+        self.state = entry.state
+        self.reused = reused
+        self._registry = registry
+        self._entry = entry
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.state = None
+            self._registry._release(self._entry)
+
+    def __enter__(self) -> "RuntimeLease":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+class RuntimeRegistry:
+    """Process-wide booted cores keyed by (tenant, manifest hash, var dir).
+
+    Holders of the same key share one runtime (stores, registries, loaded zones).
+    Each `acquire` takes a reference; a runtime with no references is idle and is
+    shut down once idle for `idle_ttl_s`, or earliest-idle first when more than
+    `max_idle` runtimes are idle. Eviction runs on every acquire/release and on
+    `evict_idle()`.
+    """
+
+    def __init__(self, idle_ttl_s: float = 600.0, max_idle: int = 8, clock: Callable[[], float] = time.monotonic):
+        self.idle_ttl_s = idle_ttl_s
+        self.max_idle = max_idle
+        self.clock = clock
+        self._entries: Dict[RuntimeKey, _Entry] = {}
+        self._lock = threading.Lock()
+        self.boots = 0
+        self.evictions = 0
+
+    def acquire(self, tenant_id: str, manifest: KimaruManifest, config: Callable[[], BootConfig]) -> RuntimeLease:
+        """Lease the runtime for (tenant, manifest), booting it with `config()` if needed."""
+        cfg = config()
+        key = (tenant_id, manifest_hash(manifest), str(cfg.var_dir.resolve()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(key=key)
+            entry.refs += 1
+            entry.idle_since = None
+        # boot outside the registry lock so other keys are not held up
+        try:
+            with entry.lock:
+                reused = entry.state is not None
+                if not reused:
+                    cfg.manifest = manifest
+                    entry.state = BootManager(cfg).boot()
+                    with self._lock:
+                        self.boots += 1
+                else:
+                    entry.state["boot_report"].reused()
+                entry.acquisitions += 1
+        except BaseException:
+            self._release(entry)
+            raise
+        self.evict_idle()
+        return RuntimeLease(self, entry, reused)
+
+    def _release(self, entry: _Entry) -> None:
+        with self._lock:
+            entry.refs -= 1
+            if entry.refs <= 0:
+                entry.refs = 0
+                entry.idle_since = self.clock()
+                if entry.state is None and self._entries.get(entry.key) is entry:
+                    del self._entries[entry.key]  # boot failed
+        self.evict_idle()
+
+    def evict_idle(self, now: Optional[float] = None) -> List[RuntimeKey]:
+        now = self.clock() if now is None else now
+        with self._lock:
+            idle = sorted((e for e in self._entries.values() if e.refs == 0 and e.idle_since is not None),
+                          key=lambda e: e.idle_since)
+            victims = [e for e in idle if now - e.idle_since >= self.idle_ttl_s]
+            rest = [e for e in idle if e not in victims]
+            victims += rest[:max(0, len(rest) - self.max_idle)]
+            for e in victims:
+                del self._entries[e.key]
+            self.evictions += len(victims)
+        for e in victims:
+            with e.lock:
+                if e.state is not None:
+                    shutdown(e.state)
+                    e.state = None
+        return [e.key for e in victims]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "boots": self.boots,
+                "evictions": self.evictions,
+                "runtimes": [{"tenant_id": k[0], "manifest_hash": k[1], "var_dir": k[2], "refs": e.refs,
+                              "acquisitions": e.acquisitions, "idle": e.refs == 0} for k, e in self._entries.items()],
+            }
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for e in entries:
+            with e.lock:
+                if e.state is not None:
+                    shutdown(e.state)
+                    e.state = None
+
+_default: Optional[RuntimeRegistry] = None
+_default_lock = threading.Lock()
+
+def default_runtime_registry() -> RuntimeRegistry:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RuntimeRegistry(idle_ttl_s=float(os.getenv("KIMARU_RUNTIME_IDLE_TTL_S", "600")),
+                                       max_idle=int(os.getenv("KIMARU_RUNTIME_MAX_IDLE", "8")))
+        return _default
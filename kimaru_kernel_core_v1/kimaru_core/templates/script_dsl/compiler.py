@@ -0,0 +1,205 @@
+from __future__ import annotations
+import threading, weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from kimaru_core.templates.script_dsl.validator import validate_script
+
+class ScriptRef:
+    """A pre-split `${a.b.c}` reference; resolving it is a tuple walk, not a string parse."""
+    __slots__ = ("path", "parts")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parts = tuple(path.split("."))
+
+    def resolve(self, state: Dict[str, Any]) -> Any:
+        cur: Any = state
+        for p in self.parts:
+            if p not in cur:
+                raise KeyError(f"Script reference missing: {self.path}")
+            cur = cur[p]
+        return cur
+
+def compile_template(v: Any, deep: bool = True) -> Any:
+    # deep=False mirrors the executor's single-value resolution (only a top-level reference is resolved)
+    if isinstance(v, str) and v.startswith("${") and v.endswith("}"):
+        return ScriptRef(v[2:-1].strip())
+    if deep and isinstance(v, dict):
+        return {k: compile_template(x) for k, x in v.items()}
+    if deep and isinstance(v, list):
+        return [compile_template(x) for x in v]
+    return v
+
+def iter_refs(t: Any) -> Iterator[ScriptRef]:
+    if isinstance(t, ScriptRef):
+        yield t
+    elif isinstance(t, dict):
+        for v in t.values():
+            yield from iter_refs(v)
+    elif isinstance(t, list):
+        for v in t:
+            yield from iter_refs(v)
+
+def render(t: Any, state: Dict[str, Any]) -> Any:
+    if isinstance(t, ScriptRef):
+        return t.resolve(state)
+    if isinstance(t, dict):
+        return {k: render(v, state) for k, v in t.items()}
+    if isinstance(t, list):
+        return [render(x, state) for x in t]
+    return t
+
+@dataclass
+class CompiledStep:
+    index: int
+    type: str
+    raw: Dict[str, Any]
+    handler: Callable[..., None]
+    args: Dict[str, Any] = field(default_factory=dict)
+    # per-registry pinned resolutions, {id(registry): (weakref to registry, generation, algorithm, descriptor)};
+    # weak so a cached plan never keeps a shut-down runtime's registry alive
+    pins: Dict[int, Any] = field(default_factory=dict)
+    # indexes of earlier steps this one must wait for (data and side-effect dependencies)
+    deps: Tuple[int, ...] = ()
+
+@dataclass
+class CompiledScript:
+    script_id: str
+    steps: List[CompiledStep]
+    parallel: bool = True  # script-level opt-out: {"parallel": false}
+
+    @property
+    def has_independent_steps(self) -> bool:
+        return any(i > 0 and (i - 1) not in s.deps for i, s in enumerate(self.steps))
+
+# Which step fields are templates, and whether they resolve deeply (maps) or as a single value.
+_TEMPLATE_FIELDS: Dict[str, Dict[str, bool]] = {
+    "algorithm": {"inputs": True, "stream": False},
+    "store_artifact": {"payload": True, "chunks": False},
+    "set_pointer": {"artifact_ref": False},
+    "memory_write": {"value": False},
+    "memory_read": {},
+}
+
+# Default save_as names per step type (mirrors the executor handlers).
+_DEFAULT_VAR = {"store_artifact": "artifact_ref", "set_pointer": "pointer_set", "memory_write": "memory_write", "memory_read": "memory_read"}
+_ALL = ("*",)
+
+def _effects(stype: str, step: Dict[str, Any], args: Dict[str, Any]) -> Tuple[Set[tuple], Set[tuple]]:
+    """Resources a step reads and writes: ("var", name), ("out", key), ("mem", ns, key), ("ptr", key)."""
+    reads: Set[tuple] = set()
+    writes: Set[tuple] = set()
+    for t in args.values():
+        for ref in iter_refs(t):
+            root = ref.parts[0]
+            if root in ("vars", "outputs"):
+                kind = "var" if root == "vars" else "out"
+                # a reference to the whole namespace reads everything written so far
+                reads.add((kind, ref.parts[1]) if len(ref.parts) > 1 else (kind,) + _ALL)
+            elif root != "inputs":
+                reads.add(_ALL)
+    if stype == "algorithm":
+        if step.get("save_as"):
+            writes.add(("var", step["save_as"]))
+        writes.add(("out", step.get("output_key", "last_algorithm")))
+    else:
+        writes.add(("var", step.get("save_as", _DEFAULT_VAR.get(stype, stype))))
+    if stype == "set_pointer":
+        writes.add(("ptr", step.get("pointer_key")))
+    elif stype == "memory_write":
+        writes.add(("mem", step.get("namespace"), step.get("key")))
+    elif stype == "memory_read":
+        reads.add(("mem", step.get("namespace"), step.get("key")))
+    elif stype not in _TEMPLATE_FIELDS:
+        reads.add(_ALL)  # unknown side effects: order against everything
+    return reads, writes
+
+def _overlaps(a: tuple, b: tuple) -> bool:
+    if a == _ALL or b == _ALL or a == b:
+        return True
+    # ("var", "*") covers every ("var", name)
+    return a[0] == b[0] and len(a) == 2 and len(b) == 2 and "*" in (a[1], b[1])
+
+def _conflicts(a: Set[tuple], b: Set[tuple]) -> bool:
+    return any(_overlaps(x, y) for x in a for y in b)
+
+def compile_script(script: Dict[str, Any], handlers: Dict[str, Callable[..., None]]) -> CompiledScript:
+    """Validate a kimaruscript.v1 document and bind each step to its handler once.
+
+    Unsupported step types and streams no later step consumes are rejected here,
+    before any step has side effects.
+    """
+    validate_script(script)
+    steps: List[CompiledStep] = []
+    for i, step in enumerate(script["steps"]):
+        stype = step["type"]
+        if stype not in handlers:
+            raise ValueError(f"Unsupported step type: {stype}")
+        args = {}
+        for name, deep in _TEMPLATE_FIELDS.get(stype, {}).items():
+            if name in step:
+                args[name] = compile_template(step[name], deep=deep)
+        steps.append(CompiledStep(index=i, type=stype, raw=step, handler=handlers[stype], args=args))
+    # dependency graph: read-after-write, write-after-read and write-after-write on any resource
+    effects = [_effects(st.type, st.raw, st.args) for st in steps]
+    for i, (reads, writes) in enumerate(effects):
+        st = steps[i]
+        st.deps = tuple(j for j in range(i)
+                        if _conflicts(reads, effects[j][1]) or _conflicts(writes, effects[j][0] | effects[j][1]))
+    # a stream is lazy: it only runs as a later step pulls it, so one nobody reads would never run
+    for i, st in enumerate(steps):
+        if st.type == "algorithm" and "stream" in st.args:
+            var = ("var", st.raw.get("save_as"))
+            if not st.raw.get("save_as") or not any(_conflicts({var}, effects[j][0]) for j in range(i + 1, len(steps))):
+                raise ValueError(f"Streaming step {i} must set save_as and be consumed by a later step "
+                                 "(e.g. store_artifact chunks)")
+    return CompiledScript(script_id=script["script_id"], steps=steps, parallel=script.get("parallel", True) is not False)
+
+class ScriptPlanCache:
+    """Bounded LRU of compiled plans keyed by script artifact ref, for one artifact store.
+
+    Artifacts in a store are immutable and their ids unique, so a ref key always names the
+    same script bytes and entries never need invalidating; eviction is purely for size.
+    Another store may hold different bytes under the same ref: see plan_cache_for().
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, CompiledScript]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CompiledScript]:
+        with self._lock:
+            plan = self._items.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key: str, plan: CompiledScript) -> None:
+        with self._lock:
+            self._items[key] = plan
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+# one plan cache per artifact store, dropped together with the store (e.g. an evicted runtime)
+_store_caches: "weakref.WeakKeyDictionary[Any, ScriptPlanCache]" = weakref.WeakKeyDictionary()
+_store_caches_lock = threading.Lock()
+
+def plan_cache_for(store: Any) -> ScriptPlanCache:
+    """The plan cache for scripts read from `store` (the built store, not a LazyStore)."""
+    with _store_caches_lock:
+        cache = _store_caches.get(store)
+        if cache is None:
+            cache = _store_caches[store] = ScriptPlanCache()
+        return cache
@@ -1,141 +1,307 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+import dataclasses, weakref
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Dict, List, Optional
 from kimaru_core.utils.ids import new_id
 from kimaru_core.decision_tracker.models import TrackEvent
+from kimaru_core.decision_tracker.tracker import DecisionTracker
 from kimaru_core.decision_tracker import event_types as ET
 from kimaru_core.artifacts.artifact_ref import ArtifactRef
 from kimaru_core.artifacts.artifact_models import ArtifactHeader, ArtifactEnvelope, IntegrityRecord, ProducerRef
 from kimaru_core.artifacts.integrity import compute_envelope_checksum
+from kimaru_core.artifacts.chunked import CHUNKED_FORMAT, iter_chunks, part_ref
+from kimaru_core.algorithms.base import StreamingAlgorithm
+from kimaru_core.algorithms.execution import AlgorithmExecutor
+from kimaru_core.algorithms.result_cache import result_cache_key
+from kimaru_core.algorithms.streaming import ChunkStream, as_input_chunks
 from kimaru_core.utils.time import utc_now_iso
+from kimaru_core.templates.script_dsl.compiler import CompiledScript, CompiledStep, compile_script, render
 
 def exec_script(ctx, agent_desc, script: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return exec_compiled(ctx, agent_desc, compile_script(script, STEP_HANDLERS), inputs)
+
+def exec_compiled(ctx, agent_desc, plan: CompiledScript, inputs: Dict[str, Any]) -> Dict[str, Any]:
     state: Dict[str, Any] = {"inputs": inputs, "vars": {}, "outputs": {}}
-    for step in script["steps"]:
-        stype = step["type"]
-
-        if stype == "algorithm":
-            alg_id = step["algorithm_id"]
-            version = step.get("version")
-            alg = ctx.algorithms.resolve(alg_id, version)
-            alg_inputs = _resolve_map(step.get("inputs", {}), state)
-            # audit selection
-            ctx.tracker.append(TrackEvent(
-                event_id=new_id("ev"),
-                tenant_id=ctx.tenant.tenant_id,
-                decision_context_id=ctx.decision_context.decision_context_id,
-                session_id=ctx.session.session_id,
-                epoch_id=ctx.epoch.epoch_id,
-                run_id=ctx.run.run_id,
-                zone_id=ctx.run.zone_id,
-                actor_type="agent",
-                actor_id=agent_desc.agent_type_id,
-                actor_display_name=agent_desc.agent_type_id,
-                event_type="ALGORITHM_SELECTED",
-                message=f"selected {alg_id}",
-                refs={"algorithm_id": alg_id, "algorithm_version": getattr(alg.describe(), "version", None)},
-                metadata={},
-            ))
-            result = alg.run(ctx, alg_inputs)
-            var = step.get("save_as")
-            if var:
-                state["vars"][var] = result
-            state["outputs"][step.get("output_key","last_algorithm")] = result
-
-        elif stype == "store_artifact":
-            kind = step["kind"]
-            payload = _resolve_map(step.get("payload", {}), state)
-            artifact_id = step.get("artifact_id") or new_id("a")
-            ref = ArtifactRef(kind=kind, artifact_id=artifact_id)
-            header = ArtifactHeader(
-                tenant_id=ctx.tenant.tenant_id,
-                decision_context_id=ctx.decision_context.decision_context_id,
-                session_id=ctx.session.session_id,
-                epoch_id=ctx.epoch.epoch_id,
-                run_id=ctx.run.run_id,
-                zone_id=ctx.run.zone_id,
-                producer=ProducerRef(name=agent_desc.agent_type_id, version=agent_desc.version),
-                inputs=[ArtifactRef.model_validate(x) for x in step.get("inputs", [])],
-                logical_version=ctx.epoch.sequence_no,
-                tags={"security_flag": str(agent_desc.security_flag)},
-            )
-            checksum = compute_envelope_checksum(header.model_dump(), payload)
-            env = ArtifactEnvelope(header=header, payload=payload, integrity=IntegrityRecord(checksum=checksum))
-            ctx.artifacts.put(ref, env)
-            ctx.tracker.append(TrackEvent(
-                event_id=new_id("ev"),
-                tenant_id=ctx.tenant.tenant_id,
-                decision_context_id=ctx.decision_context.decision_context_id,
-                session_id=ctx.session.session_id,
-                epoch_id=ctx.epoch.epoch_id,
-                run_id=ctx.run.run_id,
-                zone_id=ctx.run.zone_id,
-                actor_type="agent",
-                actor_id=agent_desc.agent_type_id,
-                event_type=ET.ARTIFACT_STORED,
-                message=f"stored artifact {ref.key()}",
-                refs={"artifact_ref": ref.model_dump()},
-                metadata={},
-            ))
-            state["vars"][step.get("save_as","artifact_ref")] = ref.model_dump()
-
-        elif stype == "set_pointer":
-            pointer_key = step["pointer_key"]
-            aref = _resolve_value(step["artifact_ref"], state)
-            ref = ArtifactRef.model_validate(aref)
-            # governance gate for approved/active pointers is handled by GovernanceGateway
-            ctx.governance.before_pointer_set(ctx, pointer_key, ref)
-            ctx.pointers.set_active(ctx.tenant.tenant_id, ctx.decision_context.decision_context_id, pointer_key, ref, utc_now_iso())
-            ctx.tracker.append(TrackEvent(
-                event_id=new_id("ev"),
-                tenant_id=ctx.tenant.tenant_id,
-                decision_context_id=ctx.decision_context.decision_context_id,
-                session_id=ctx.session.session_id,
-                epoch_id=ctx.epoch.epoch_id,
-                run_id=ctx.run.run_id,
-                zone_id=ctx.run.zone_id,
-                actor_type="agent",
-                actor_id=agent_desc.agent_type_id,
-                event_type=ET.POINTER_SET,
-                message=f"pointer set {pointer_key} -> {ref.key()}",
-                refs={"pointer_key": pointer_key, "artifact_ref": ref.model_dump()},
-                metadata={},
-            ))
-            state["vars"][step.get("save_as","pointer_set")] = {"pointer_key": pointer_key, "artifact_ref": ref.model_dump()}
-
-        elif stype == "memory_write":
-            ns = step["namespace"]
-            key = step["key"]
-            val = _resolve_value(step["value"], state)
-            ctx.memory.write(ns, key, val, ttl=step.get("ttl"))
-            state["vars"][step.get("save_as","memory_write")] = {"namespace": ns, "key": key}
-
-        elif stype == "memory_read":
-            ns = step["namespace"]
-            key = step["key"]
-            val = ctx.memory.read(ns, key)
-            state["vars"][step.get("save_as","memory_read")] = val
+    pool = getattr(ctx, "step_executor", None)
+    if pool is not None and plan.parallel and plan.has_independent_steps:
+        _exec_dag(ctx, agent_desc, plan, state, pool)
+    else:
+        for step in plan.steps:
+            step.handler(ctx, agent_desc, step, state)
+    # streams are not serialisable; callers get their (final, once consumed) summaries
+    result_vars = {k: v.summary if isinstance(v, ChunkStream) else v for k, v in state["vars"].items()}
+    return {"vars": result_vars, "outputs": state["outputs"]}
+
+class _StepEvents(DecisionTracker):
+    """Holds one step's audit events until every earlier step has been recorded.
+
+    After release() events pass straight through (e.g. from a lazily consumed stream).
+    """
 
+    def __init__(self, inner: DecisionTracker):
+        self.inner = inner
+        self.events: List[TrackEvent] = []
+        self.released = False
+
+    def append(self, event: TrackEvent) -> None:
+        if self.released:
+            self.inner.append(event)
         else:
-            raise ValueError(f"Unsupported step type: {stype}")
-
-    return {"vars": state["vars"], "outputs": state["outputs"]}
-
-def _resolve_value(v: Any, state: Dict[str, Any]) -> Any:
-    # Supports references like ${vars.x} or ${inputs.rows}
-    if isinstance(v, str) and v.startswith("${") and v.endswith("}"):
-        path = v[2:-1].strip()
-        parts = path.split(".")
-        cur: Any = state
-        for p in parts:
-            if p not in cur:
-                raise KeyError(f"Script reference missing: {path}")
-            cur = cur[p]
-        return cur
-    return v
-
-def _resolve_map(m: Any, state: Dict[str, Any]) -> Any:
-    if isinstance(m, dict):
-        return {k: _resolve_map(v, state) for k,v in m.items()}
-    if isinstance(m, list):
-        return [_resolve_map(x, state) for x in m]
-    return _resolve_value(m, state)
+            self.events.append(event)
+
+    def release(self) -> None:
+        self.released = True
+        if self.events:
+            self.inner.append_many(self.events)
+            self.events = []
+
+    def query(self, session_id: str, limit: int = 200, event_type: str | None = None) -> List[TrackEvent]:
+        return self.inner.query(session_id, limit=limit, event_type=event_type)
+
+def _exec_dag(ctx, agent_desc, plan: CompiledScript, state: Dict[str, Any], pool) -> None:
+    """Run steps as soon as their dependencies finish.
+
+    Steps that touch the same var, output, pointer or memory key are ordered by the
+    compiler, so concurrent steps never race on state. Audit events are appended in
+    step index order, exactly as a sequential run would write them. On failure no
+    new steps start; in-flight steps finish, completed steps are recorded, and the
+    error of the lowest failing step is raised.
+    """
+    steps = plan.steps
+    buffers = [_StepEvents(ctx.tracker) for _ in steps]
+    remaining = {s.index: set(s.deps) for s in steps}
+    running: Dict[Future, int] = {}
+    done: Dict[int, Optional[BaseException]] = {}
+    emitted = 0
+    failed = False
+
+    def start_ready() -> None:
+        for i in sorted(remaining):
+            if not remaining[i]:
+                del remaining[i]
+                step = steps[i]
+                step_ctx = dataclasses.replace(ctx, tracker=buffers[i])
+                running[pool.submit(step.handler, step_ctx, agent_desc, step, state)] = i
+
+    start_ready()
+    while running:
+        finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+        for fut in finished:
+            i = running.pop(fut)
+            done[i] = fut.exception()
+            if done[i] is not None:
+                failed = True
+            for deps in remaining.values():
+                deps.discard(i)
+        while emitted in done:
+            buffers[emitted].release()
+            emitted += 1
+        if not failed:
+            start_ready()
+    # after a failure, record whatever completed beyond the gap left by unstarted steps
+    for i in sorted(done):
+        if i >= emitted:
+            buffers[i].release()
+    errors = [done[i] for i in sorted(done) if done[i] is not None]
+    if errors:
+        raise errors[0]
+
+def _pinned_algorithm(ctx, step: CompiledStep):
+    # pin the resolution per registry; re-resolve only if that registry has changed since
+    registry = ctx.algorithms
+    pin = step.pins.get(id(registry))
+    if pin is not None and pin[0]() is registry and pin[1] == registry.generation:
+        return pin[2], pin[3]
+    alg = registry.resolve(step.raw["algorithm_id"], step.raw.get("version"))
+    desc = alg.describe()
+    step.pins[id(registry)] = (weakref.ref(registry), registry.generation, alg, desc)
+    return alg, desc
+
+def _memo_key(ctx, step: CompiledStep, desc, inputs: Dict[str, Any]):
+    # opt-in: the algorithm declares cost_profile["memoize"] = true or the step sets "cache": true
+    cache = getattr(ctx, "algorithm_cache", None)
+    if cache is None or "stream" in step.args or desc.determinism_level != "deterministic":
+        return None, None
+    opted_in = step.raw.get("cache", (desc.cost_profile or {}).get("memoize") is True)
+    if opted_in is not True:
+        return None, None
+    return cache, result_cache_key(desc.algorithm_id, desc.version, inputs)
+
+_INLINE = AlgorithmExecutor()
+
+def _step_algorithm(ctx, agent_desc, step: CompiledStep, state: Dict[str, Any]) -> None:
+    alg_id = step.raw["algorithm_id"]
+    alg, alg_desc = _pinned_algorithm(ctx, step)
+    alg_version = alg_desc.version
+    alg_inputs = render(step.args.get("inputs", {}), state)
+    executor = getattr(ctx, "algorithm_executor", None) or _INLINE
+    cache, memo_key = _memo_key(ctx, step, alg_desc, alg_inputs)
+    result = cache.get(ctx, memo_key) if memo_key else None
+    metadata: Dict[str, Any] = {"executor": executor.name}
+    if memo_key:
+        # deterministic + same inputs: the cached result is the result; the hit is audited here
+        metadata.update({"cache": "hit" if result is not None else "miss", "inputs_sha256": memo_key.rpartition(":")[2]})
+    # audit selection
+    ctx.tracker.append(TrackEvent(
+        event_id=new_id("ev"),
+        tenant_id=ctx.tenant.tenant_id,
+        decision_context_id=ctx.decision_context.decision_context_id,
+        session_id=ctx.session.session_id,
+        epoch_id=ctx.epoch.epoch_id,
+        run_id=ctx.run.run_id,
+        zone_id=ctx.run.zone_id,
+        actor_type="agent",
+        actor_id=agent_desc.agent_type_id,
+        actor_display_name=agent_desc.agent_type_id,
+        event_type=ET.ALGORITHM_SELECTED,
+        message=f"selected {alg_id}",
+        refs={"algorithm_id": alg_id, "algorithm_version": alg_version},
+        metadata=metadata,
+    ))
+    if "stream" in step.args:
+        # lazy: chunks are cleaned as the consumer (e.g. a chunked store_artifact) pulls them
+        if not isinstance(alg, StreamingAlgorithm):
+            raise ValueError(f"Algorithm does not support streaming: {alg_id}")
+        source = _stream_source(ctx, render(step.args["stream"], state))
+        stream = ChunkStream(alg.run_stream(ctx, source, alg_inputs))
+        if step.raw.get("save_as"):
+            state["vars"][step.raw["save_as"]] = stream
+        state["outputs"][step.raw.get("output_key","last_algorithm")] = stream.summary
+        return
+    if result is None:
+        result = _run_algorithm(ctx, agent_desc, executor, alg, alg_id, alg_version, alg_inputs)
+        if memo_key:
+            cache.put(ctx, memo_key, result)
+    var = step.raw.get("save_as")
+    if var:
+        state["vars"][var] = result
+    state["outputs"][step.raw.get("output_key","last_algorithm")] = result
+
+def _run_algorithm(ctx, agent_desc, executor: AlgorithmExecutor, alg, alg_id: str, alg_version: str, alg_inputs: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return executor.execute(ctx, alg, alg_inputs)
+    except Exception as e:
+        ctx.tracker.append(TrackEvent(
+            event_id=new_id("ev"),
+            tenant_id=ctx.tenant.tenant_id,
+            decision_context_id=ctx.decision_context.decision_context_id,
+            session_id=ctx.session.session_id,
+            epoch_id=ctx.epoch.epoch_id,
+            run_id=ctx.run.run_id,
+            zone_id=ctx.run.zone_id,
+            actor_type="agent",
+            actor_id=agent_desc.agent_type_id,
+            actor_display_name=agent_desc.agent_type_id,
+            event_type=ET.ALGORITHM_FAILED,
+            severity="ERROR",
+            message=str(e),
+            refs={"algorithm_id": alg_id, "algorithm_version": alg_version},
+            metadata={"executor": executor.name, "error_type": type(e).__name__},
+        ))
+        raise
+
+def _stream_source(ctx, source: Any):
+    if isinstance(source, dict) and "artifact_id" in source:
+        return as_input_chunks(iter_chunks(ctx.artifacts, ArtifactRef.model_validate(source)))
+    if isinstance(source, (dict, str, bytes)) or not hasattr(source, "__iter__"):
+        raise ValueError("stream source must be a chunked artifact ref or an iterable of chunks")
+    return as_input_chunks(source)
+
+def _step_store_artifact(ctx, agent_desc, step: CompiledStep, state: Dict[str, Any]) -> None:
+    kind = step.raw["kind"]
+    artifact_id = step.raw.get("artifact_id") or new_id("a")
+    ref = ArtifactRef(kind=kind, artifact_id=artifact_id)
+    header = ArtifactHeader(
+        tenant_id=ctx.tenant.tenant_id,
+        decision_context_id=ctx.decision_context.decision_context_id,
+        session_id=ctx.session.session_id,
+        epoch_id=ctx.epoch.epoch_id,
+        run_id=ctx.run.run_id,
+        zone_id=ctx.run.zone_id,
+        producer=ProducerRef(name=agent_desc.agent_type_id, version=agent_desc.version),
+        inputs=[ArtifactRef.model_validate(x) for x in step.raw.get("inputs", [])],
+        logical_version=ctx.epoch.sequence_no,
+        tags={"security_flag": str(agent_desc.security_flag)},
+    )
+    metadata: Dict[str, Any] = {}
+    if "chunks" in step.args:
+        payload = _store_chunks(ctx, ref, header, render(step.args["chunks"], state))
+        metadata["chunk_count"] = payload["chunk_count"]
+    else:
+        payload = render(step.args.get("payload", {}), state)
+    checksum = compute_envelope_checksum(header.model_dump(), payload)
+    env = ArtifactEnvelope(header=header, payload=payload, integrity=IntegrityRecord(checksum=checksum))
+    ctx.artifacts.put(ref, env)
+    ctx.tracker.append(TrackEvent(
+        event_id=new_id("ev"),
+        tenant_id=ctx.tenant.tenant_id,
+        decision_context_id=ctx.decision_context.decision_context_id,
+        session_id=ctx.session.session_id,
+        epoch_id=ctx.epoch.epoch_id,
+        run_id=ctx.run.run_id,
+        zone_id=ctx.run.zone_id,
+        actor_type="agent",
+        actor_id=agent_desc.agent_type_id,
+        event_type=ET.ARTIFACT_STORED,
+        message=f"stored artifact {ref.key()}",
+        refs={"artifact_ref": ref.model_dump()},
+        metadata=metadata,
+    ))
+    state["vars"][step.raw.get("save_as","artifact_ref")] = ref.model_dump()
+
+def _store_chunks(ctx, ref: ArtifactRef, header: ArtifactHeader, chunks: Any) -> Dict[str, Any]:
+    # write each chunk as its own immutable part as it arrives, then return the manifest payload
+    header_dump = header.model_dump()
+    parts: List[Dict[str, Any]] = []
+    for i, chunk in enumerate(chunks):
+        pref = part_ref(ref, i)
+        checksum = compute_envelope_checksum(header_dump, chunk)
+        ctx.artifacts.put(pref, ArtifactEnvelope(header=header, payload=chunk, integrity=IntegrityRecord(checksum=checksum)))
+        parts.append(pref.model_dump())
+    summary = chunks.summary if isinstance(chunks, ChunkStream) else {"chunks": len(parts)}
+    return {"format": CHUNKED_FORMAT, "parts": parts, "chunk_count": len(parts), "summary": summary}
+
+def _step_set_pointer(ctx, agent_desc, step: CompiledStep, state: Dict[str, Any]) -> None:
+    pointer_key = step.raw["pointer_key"]
+    aref = render(step.args["artifact_ref"], state)
+    ref = ArtifactRef.model_validate(aref)
+    # governance gate for approved/active pointers is handled by GovernanceGateway
+    ctx.governance.before_pointer_set(ctx, pointer_key, ref)
+    ctx.pointers.set_active(ctx.tenant.tenant_id, ctx.decision_context.decision_context_id, pointer_key, ref, utc_now_iso())
+    ctx.tracker.append(TrackEvent(
+        event_id=new_id("ev"),
+        tenant_id=ctx.tenant.tenant_id,
+        decision_context_id=ctx.decision_context.decision_context_id,
+        session_id=ctx.session.session_id,
+        epoch_id=ctx.epoch.epoch_id,
+        run_id=ctx.run.run_id,
+        zone_id=ctx.run.zone_id,
+        actor_type="agent",
+        actor_id=agent_desc.agent_type_id,
+        event_type=ET.POINTER_SET,
+        message=f"pointer set {pointer_key} -> {ref.key()}",
+        refs={"pointer_key": pointer_key, "artifact_ref": ref.model_dump()},
+        metadata={},
+    ))
+    state["vars"][step.raw.get("save_as","pointer_set")] = {"pointer_key": pointer_key, "artifact_ref": ref.model_dump()}
+
+def _step_memory_write(ctx, agent_desc, step: CompiledStep, state: Dict[str, Any]) -> None:
+    ns = step.raw["namespace"]
+    key = step.raw["key"]
+    val = render(step.args["value"], state)
+    ctx.memory.write(ns, key, val, ttl=step.raw.get("ttl"))
+    state["vars"][step.raw.get("save_as","memory_write")] = {"namespace": ns, "key": key}
+
+def _step_memory_read(ctx, agent_desc, step: CompiledStep, state: Dict[str, Any]) -> None:
+    ns = step.raw["namespace"]
+    key = step.raw["key"]
+    val = ctx.memory.read(ns, key)
+    state["vars"][step.raw.get("save_as","memory_read")] = val
+
+STEP_HANDLERS = {
+    "algorithm": _step_algorithm,
+    "store_artifact": _step_store_artifact,
+    "set_pointer": _step_set_pointer,
+    "memory_write": _step_memory_write,
+    "memory_read": _step_memory_read,
+}
@@ -0,0 +1,92 @@
+from __future__ import annotations
+import os, sqlite3, threading, weakref
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+@dataclass
+class SQLiteSettings:
+    journal_mode: str = "WAL"       # readers no longer block on writers
+    synchronous: str = "NORMAL"     # safe with WAL; fsync at checkpoints instead of every commit
+    cache_size_kib: int = 16384
+    busy_timeout_ms: int = 5000
+    cached_statements: int = 256    # per-connection prepared statement cache
+
+class _ThreadConnections:
+    """One thread's connections; closed by a finalizer once the thread (and its local) is gone."""
+    __slots__ = ("conns", "pid", "__weakref__")
+
+    def __init__(self):
+        self.conns: Dict[str, sqlite3.Connection] = {}
+        self.pid = os.getpid()
+
+def _close_conns(conns: Dict[str, sqlite3.Connection]) -> None:
+    for c in list(conns.values()):
+        try:
+            c.close()
+        except sqlite3.Error:
+            pass
+    conns.clear()
+
+class SQLiteConnectionManager:
+    """Hands out one long-lived connection per (thread, db_path).
+
+    Stores keep their `with self._conn() as c:` pattern; the context manager only
+    commits/rolls back, so returning a persistent connection is transparent.
+    Pragmas are applied once per connection. Connections inherited across fork()
+    are discarded and reopened in the child. A thread's connections are closed
+    when the thread exits (short-lived pools do not leak handles); close_all()
+    closes every thread's connections, so it must only run once the stores are
+    no longer in use.
+    """
+
+    def __init__(self, settings: Optional[SQLiteSettings] = None):
+        self.settings = settings or SQLiteSettings()
+        self._local = threading.local()
+        self._threads: "weakref.WeakSet[_ThreadConnections]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def connect(self, db_path: str) -> sqlite3.Connection:
+        held: Optional[_ThreadConnections] = getattr(self._local, "held", None)
+        if held is None or held.pid != os.getpid():
+            held = self._local.held = _ThreadConnections()
+            weakref.finalize(held, _close_conns, held.conns)
+            with self._lock:
+                self._threads.add(held)
+        c = held.conns.get(db_path)
+        if c is None:
+            c = self._open(db_path)
+            held.conns[db_path] = c
+        return c
+
+    def _open(self, db_path: str) -> sqlite3.Connection:
+        s = self.settings
+        # check_same_thread=False only so the exit finalizer / close_all may close it; each connection serves one thread
+        c = sqlite3.connect(db_path, timeout=s.busy_timeout_ms / 1000.0, cached_statements=s.cached_statements,
+                            check_same_thread=False)
+        c.execute(f"PRAGMA journal_mode={s.journal_mode}")
+        c.execute(f"PRAGMA synchronous={s.synchronous}")
+        c.execute(f"PRAGMA cache_size=-{int(s.cache_size_kib)}")
+        c.execute(f"PRAGMA busy_timeout={int(s.busy_timeout_ms)}")
+        c.execute("PRAGMA temp_store=MEMORY")
+        return c
+
+    def open_count(self) -> int:
+        with self._lock:
+            return sum(len(t.conns) for t in self._threads)
+
+    def close_all(self) -> None:
+        with self._lock:
+            threads, self._threads = list(self._threads), weakref.WeakSet()
+        for t in threads:
+            _close_conns(t.conns)
+        self._local = threading.local()
+
+_default: Optional[SQLiteConnectionManager] = None
+_default_lock = threading.Lock()
+
+def default_connection_manager() -> SQLiteConnectionManager:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SQLiteConnectionManager()
+        return _default
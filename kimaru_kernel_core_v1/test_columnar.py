@@ -0,0 +1,64 @@
+"""Row/columnar representations: BasicCleaner round trips and executor pass-through/conversion."""
+
+from array import array
+
+from kimaru_core.algorithms import columnar as C
+from kimaru_core.algorithms.base import BaseAlgorithm
+from kimaru_core.algorithms.descriptor import AlgorithmDescriptor
+from kimaru_core.algorithms.execution import AlgorithmExecutor, ProcessPoolAlgorithmExecutor
+from kimaru_core.algorithms.generic.data_cleaning import BasicCleaner
+
+ROWS = [{"a": 1, "b": None, "c": None}, None, {"a": 2, "b": "x", "c": None}, {"a": None, "b": "y"}, None]
+
+
+class _RowCounter(BaseAlgorithm):
+    """Rows-only algorithm: records what it was called with."""
+
+    def __init__(self):
+        self.seen = None
+
+    def describe(self):
+        return AlgorithmDescriptor(algorithm_id="test.rows_only")
+
+    def run(self, ctx, inputs):
+        self.seen = inputs
+        return {"rows": [dict(r, n=i) for i, r in enumerate(inputs["rows"]) if r is not None], "stats": {"n": len(inputs["rows"])}}
+
+
+class _Spy(BasicCleaner):
+    def run(self, ctx, inputs):
+        self.seen = inputs
+        return super().run(ctx, inputs)
+
+
+def test_cleaner_rows_and_columns_agree():
+    alg = BasicCleaner()
+    by_rows = alg.run(None, {"rows": ROWS})
+    columns, valid = C.rows_to_columns(ROWS)
+    by_columns = alg.run(None, {"columns": columns, "valid": valid})
+    assert by_columns["stats"] == by_rows["stats"] == {"dropped": 2, "kept": 3}
+    assert C.columns_to_rows(by_columns["columns"], length=by_columns["stats"]["kept"]) == by_rows["rows"]
+    assert alg.run(None, {"columns": columns, "valid": valid, "output": C.ROWS}) == by_rows
+    assert "c" not in by_columns["columns"]  # null in every kept row
+
+
+def test_executors_pass_accepted_columns_through():
+    cols = {"a": array("q", [1, 2, 3]), "b": ["x", None, "z"]}
+    for executor in (AlgorithmExecutor(), ProcessPoolAlgorithmExecutor(max_workers=1)):
+        alg = _Spy()
+        out = executor.execute(None, alg, {"columns": cols})
+        assert alg.seen["columns"] is cols  # no conversion on the way in
+        assert out["columns"]["a"] is cols["a"] and out["stats"] == {"dropped": 0, "kept": 3}
+        executor.shutdown()
+
+
+def test_executor_converts_for_rows_only_algorithms_and_back():
+    columns, valid = C.rows_to_columns(ROWS)
+    alg = _RowCounter()
+    out = AlgorithmExecutor().execute(None, alg, {"columns": columns, "valid": valid})
+    assert alg.seen["rows"] == [{"a": 1}, None, {"a": 2, "b": "x"}, {"b": "y"}, None]
+    assert "columns" not in alg.seen and "valid" not in alg.seen
+    assert out["stats"] == {"n": 5}
+    assert C.columns_to_rows(out["columns"], out.get("valid")) == [{"a": 1, "n": 0}, {"a": 2, "b": "x", "n": 2}, {"b": "y", "n": 3}]
+    rows_in = AlgorithmExecutor().execute(None, _RowCounter(), {"rows": [{"a": 1}]})
+    assert rows_in == {"rows": [{"a": 1, "n": 0}], "stats": {"n": 1}}
@@ -0,0 +1,69 @@
+"""ContentAddressedArtifactStore: immutability, dedup, concurrent puts of identical envelopes."""
+
+import threading
+
+import pytest
+
+from kimaru_core.artifacts.artifact_models import ArtifactEnvelope, ArtifactHeader, IntegrityRecord, ProducerRef
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.content_addressed_store import ContentAddressedArtifactStore
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager
+
+
+def _env(payload):
+    header = ArtifactHeader(tenant_id="t", decision_context_id="d", session_id="s", epoch_id="e", run_id="r",
+                            zone_id="core", producer=ProducerRef(name="p", version="1"), created_at="2026-01-01T00:00:00Z")
+    return ArtifactEnvelope(header=header, payload=payload, integrity=IntegrityRecord(checksum="x"))
+
+
+def _store(tmp_path):
+    return ContentAddressedArtifactStore(str(tmp_path / "cas"), connections=SQLiteConnectionManager())
+
+
+def _blobs(tmp_path):
+    return [p for p in (tmp_path / "cas" / "blobs").rglob("*") if p.is_file()]
+
+
+def test_overwrite_with_different_bytes_is_rejected(tmp_path):
+    store = _store(tmp_path)
+    ref = ArtifactRef(kind="k", artifact_id="a")
+    store.put(ref, _env({"v": 1}))
+    store.put(ref, _env({"v": 1}))  # same bytes: idempotent
+    with pytest.raises(ValueError, match="overwrite rejected"):
+        store.put(ref, _env({"v": 2}))
+    assert store.get(ref).payload == {"v": 1}
+
+
+def test_identical_envelopes_share_one_blob(tmp_path):
+    store = _store(tmp_path)
+    for i in range(3):
+        store.put(ArtifactRef(kind="k", artifact_id=f"a{i}"), _env({"v": 1}))
+    store.put(ArtifactRef(kind="k", artifact_id="other"), _env({"v": 2}))
+    assert len(_blobs(tmp_path)) == 2
+    assert [r.artifact_id for r in store.list("k")] == ["other", "a2", "a1", "a0"]
+
+
+def test_concurrent_puts_of_the_same_envelope(tmp_path):
+    store = _store(tmp_path)
+    env = _env({"blob": "x" * (2 * 1024 * 1024)})
+    errors = []
+    barrier = threading.Barrier(8)
+
+    def put(round_no, i):
+        barrier.wait()
+        try:
+            store.put(ArtifactRef(kind="k", artifact_id=f"r{round_no}-{i}"), env)
+        except Exception as e:  # noqa: BLE001 - collected for the assertion below
+            errors.append(e)
+
+    for round_no in range(10):
+        for blob in _blobs(tmp_path):
+            blob.unlink()  # every round races on writing the blob, not on the dedup check
+        threads = [threading.Thread(target=put, args=(round_no, i)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert errors == []
+    assert len(_blobs(tmp_path)) == 1  # no leftover temp files either
+    assert store.get(ArtifactRef(kind="k", artifact_id="r9-7")).payload == env.payload
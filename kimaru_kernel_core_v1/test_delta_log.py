@@ -0,0 +1,112 @@
+"""SQLiteDeltaLogStore: hash-chain verification, rebase, compaction under concurrency."""
+
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from kimaru_core.artifacts.artifact_models import ArtifactEnvelope, ArtifactHeader, IntegrityRecord, ProducerRef
+from kimaru_core.artifacts.artifact_ref import ArtifactRef
+from kimaru_core.artifacts.content_addressed_store import ContentAddressedArtifactStore
+from kimaru_core.artifacts.delta.delta_envelope import DeltaEnvelope, DeltaOperation
+from kimaru_core.artifacts.delta.delta_log import SQLiteDeltaLogStore
+from kimaru_core.decision_tracker import SQLiteDecisionTracker
+from kimaru_core.utils.sqlite_pool import SQLiteConnectionManager
+
+BASE = ArtifactRef(kind="state", artifact_id="b1")
+
+
+def _ctx(tmp_path, run_id):
+    return SimpleNamespace(
+        tenant=SimpleNamespace(tenant_id="t"), decision_context=SimpleNamespace(decision_context_id="d"),
+        session=SimpleNamespace(session_id=f"s-{run_id}"), epoch=SimpleNamespace(epoch_id="e"),
+        run=SimpleNamespace(run_id=run_id, zone_id="core"), actor=SimpleNamespace(actor_type="system", actor_id="test"),
+        tracker=SQLiteDecisionTracker(str(tmp_path / f"tracker-{run_id}.sqlite")))
+
+
+def _stores(tmp_path, n=1, **kw):
+    connections = SQLiteConnectionManager()
+    artifacts = ContentAddressedArtifactStore(str(tmp_path / "cas"), connections=connections)
+    if not artifacts.exists(BASE):
+        header = ArtifactHeader(tenant_id="t", decision_context_id="d", session_id="s", epoch_id="e", run_id="r0",
+                                zone_id="core", producer=ProducerRef(name="p", version="1"))
+        artifacts.put(BASE, ArtifactEnvelope(header=header, payload={"events": [], "params": {}},
+                                             integrity=IntegrityRecord(checksum="x")))
+    # separate instances share nothing in process, like separate workers on one var dir
+    return artifacts, [SQLiteDeltaLogStore(str(tmp_path / "deltas.sqlite"), artifacts, connections=SQLiteConnectionManager(), **kw)
+                       for _ in range(n)]
+
+
+def _delta(i, apply_order=0, prev=None, policy="lww"):
+    return DeltaEnvelope(delta_id=f"d{i}", delta_type="event_log", base_ref=BASE, target_kind="state",
+                         apply_order=apply_order, hash_chain_prev=prev, conflict_policy=policy,
+                         operations=[DeltaOperation(op_type="append_events", data=[{"i": i}])])
+
+
+def test_chain_verifies_and_detects_tampering(tmp_path):
+    _, (log,) = _stores(tmp_path, compact_every=0)
+    ctx = _ctx(tmp_path, "r1")
+    prev = None
+    for i in range(1, 6):
+        prev = log.append(ctx, _delta(i, apply_order=i, prev=prev, policy="reject")).hash
+    assert log.verify(BASE) == 5
+    assert log.materialize(BASE).state["events"] == [{"i": i} for i in range(1, 6)]
+    with sqlite3.connect(str(tmp_path / "deltas.sqlite")) as c:
+        c.execute("UPDATE deltas SET delta_json=replace(delta_json, '\"i\":3', '\"i\":99') WHERE apply_order=3")
+    with pytest.raises(ValueError, match="broken at apply_order 3"):
+        log.verify(BASE)
+
+
+def test_stale_deltas_rebase_or_reject_by_policy(tmp_path):
+    _, (log,) = _stores(tmp_path, compact_every=0)
+    ctx = _ctx(tmp_path, "r1")
+    first = log.append(ctx, _delta(1, apply_order=1))
+    stale = log.append(ctx, _delta(2, apply_order=1))  # written against the base, not the head
+    assert (stale.apply_order, stale.delta.hash_chain_prev) == (2, first.hash)
+    assert stale.delta.extra["rebased_from"] == {"apply_order": 1, "hash_chain_prev": None}
+    with pytest.raises(ValueError, match="conflicts with the head"):
+        log.append(ctx, _delta(3, apply_order=1, policy="reject"))
+    with pytest.raises(ValueError, match="conflicts with the head"):
+        log.append(ctx, _delta(4, apply_order=1), rebase=False)
+    assert log.append(ctx, _delta(2, apply_order=1)) == stale  # re-append by delta_id is a no-op
+    assert log.verify(BASE) == 2
+
+
+def test_concurrent_compaction_writes_one_snapshot_per_order(tmp_path):
+    artifacts, logs = _stores(tmp_path, n=4, compact_every=2, cache_states=0)
+    errors = []
+    appended = []
+    lock = threading.Lock()
+
+    def work(w):
+        ctx = _ctx(tmp_path, f"r{w}")
+        log = logs[w % len(logs)]
+        try:
+            for i in range(10):
+                while True:
+                    try:
+                        rec = log.append(ctx, _delta(w * 100 + i))
+                        break
+                    except ValueError as e:  # lost a cross-instance race on the same apply_order
+                        if "retry" not in str(e):
+                            raise
+                with lock:
+                    appended.append(rec.apply_order)
+                log.compact(ctx, BASE)
+        except Exception as e:  # noqa: BLE001 - collected for the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert sorted(appended) == list(range(1, 81))
+    assert logs[0].verify(BASE) == 80
+    m = logs[0].materialize(BASE)
+    assert m.snapshot_ref is not None and len(m.state["events"]) == 80
+    snapshots = [r for r in artifacts.list("state") if r.artifact_id.startswith("b1--s")]
+    # the snapshot header depends on the chain only, not on whichever run compacted
+    assert all(artifacts.get(r).header.run_id == "r0" for r in snapshots)
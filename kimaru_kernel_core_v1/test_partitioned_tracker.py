@@ -0,0 +1,88 @@
+"""PartitionedDecisionTracker: roll/archive/expire, cross-segment paging, legacy import."""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from kimaru_core.decision_tracker import PartitionedDecisionTracker, SQLiteDecisionTracker, TrackEvent, EventQuery
+
+
+def _event(i, when, run_id="r1"):
+    return TrackEvent(event_id=f"e{i}", created_at=when.isoformat(), tenant_id="t", decision_context_id="d",
+                      session_id="s", epoch_id="ep", run_id=run_id, zone_id="z", event_type="A")
+
+
+def _tracker(tmp_path, now, **kw):
+    return PartitionedDecisionTracker(str(tmp_path / "tracker"), roll_interval_s=0, seal_grace_s=0,
+                                      clock=lambda: now[0], **kw)
+
+
+def _fill(t, now, days, per_day):
+    i = 0
+    for _ in range(days):
+        t.append_many([_event(i + k, now[0]) for k in range(per_day)])
+        i += per_day
+        now[0] += timedelta(days=1)
+        t.roll()
+
+
+def _page_all(t, order):
+    cursor, seqs = None, []
+    while True:
+        page = t.query_page(EventQuery(run_id="r1"), limit=7, cursor=cursor, fields=["event_id"], order=order)
+        seqs += [item["seq"] for item in page.items]
+        cursor = page.next_cursor
+        if not cursor:
+            return seqs
+
+
+def test_roll_archives_sealed_segments_read_only(tmp_path):
+    now = [datetime(2026, 10, 1, 12, tzinfo=timezone.utc)]
+    t = _tracker(tmp_path, now)
+    _fill(t, now, days=3, per_day=10)
+    segs = t.segments()
+    assert [s.state for s in segs] == ["archived"] * 3
+    assert all(s.event_count == 10 and s.checksum for s in segs)
+    assert oct(os.stat(segs[0].path).st_mode)[-3:] == "444"
+    t.roll()  # reaps the retired live files
+    assert os.listdir(tmp_path / "tracker" / "live") == []
+    t.close()
+
+
+def test_retention_expires_old_archives(tmp_path):
+    now = [datetime(2026, 10, 1, 12, tzinfo=timezone.utc)]
+    t = _tracker(tmp_path, now, retention_days=2)
+    _fill(t, now, days=5, per_day=3)
+    states = [s.state for s in t.segments()]
+    assert states == ["expired"] * 3 + ["archived"] * 2
+    assert len(os.listdir(tmp_path / "tracker" / "archive")) == states.count("archived")
+    assert len(t.query_page(EventQuery(), limit=100).items) == 3 * states.count("archived")
+    t.close()
+
+
+def test_cursor_paging_spans_live_and_archived_segments(tmp_path):
+    now = [datetime(2026, 10, 1, 12, tzinfo=timezone.utc)]
+    t = _tracker(tmp_path, now)
+    _fill(t, now, days=3, per_day=10)
+    t.append_many([_event(100 + k, now[0]) for k in range(5)])  # live segment
+    desc = _page_all(t, "desc")
+    assert len(desc) == 35 and desc == sorted(desc, reverse=True)
+    assert _page_all(t, "asc") == sorted(desc)
+    t.close()
+
+
+def test_legacy_tracker_is_imported_as_oldest_segment(tmp_path):
+    legacy_path = tmp_path / "tracker.sqlite"
+    legacy = SQLiteDecisionTracker(str(legacy_path))
+    now = [datetime(2026, 10, 1, 12, tzinfo=timezone.utc)]
+    legacy.append_many([_event(1000 + k, now[0] - timedelta(days=30)) for k in range(4)])
+    legacy.connections.close_all()
+
+    t = _tracker(tmp_path, now)
+    key = t.import_legacy(str(legacy_path))
+    assert key == "00000000" and not legacy_path.exists()
+    assert t.import_legacy(str(legacy_path)) is None
+    t.append_many([_event(k, now[0]) for k in range(3)])
+    seqs = _page_all(t, "asc")
+    assert len(seqs) == 7 and seqs[:4] == [1, 2, 3, 4]
+    assert t.aggregates("run", "r1").total == 7
+    t.close()